@@ -0,0 +1,68 @@
+"""
+Microbenchmark for the instruction dispatch of the base `Executor`.
+
+Executes a long, classical-heavy subroutine (a loop of arithmetic, branching and
+array instructions) and reports the number of executed instructions per second.
+
+Usage::
+
+    python benchmarks/executor_dispatch.py [--iterations N] [--repeat R]
+"""
+
+import argparse
+import time
+
+from netqasm.backend.executor import Executor
+from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.sdk.shared_memory import SharedMemoryManager
+
+SUBROUTINE = """
+# NETQASM 1.0
+# APPID 0
+# DEFINE ms @0
+set R0 0
+set R1 0
+set R2 1
+set R3 {iterations}
+array {iterations} $ms
+LOOP:
+beq R0 R3 EXIT
+add R1 R1 R2
+sub R1 R1 R2
+add R1 R1 R0
+store R1 $ms[R0]
+load R1 $ms[R0]
+add R0 R0 R2
+jmp LOOP
+EXIT:
+ret_reg R1
+"""
+
+# Number of instructions executed per loop iteration (beq up to jmp)
+INSTRS_PER_ITERATION = 8
+
+
+def run(iterations: int, repeat: int) -> None:
+    subroutine = parse_text_subroutine(SUBROUTINE.format(iterations=iterations))
+    num_instrs = 5 + iterations * INSTRS_PER_ITERATION + 2
+
+    best = float("inf")
+    for _ in range(repeat):
+        SharedMemoryManager.reset_memories()
+        executor = Executor()
+        executor.init_new_application(app_id=0, max_qubits=1)
+        start = time.perf_counter()
+        executor.consume_execute_subroutine(subroutine=subroutine)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"instructions executed: {num_instrs}")
+    print(f"best time: {best:.4f} s")
+    print(f"instructions per second: {num_instrs / best:,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(iterations=args.iterations, repeat=args.repeat)
@@ -0,0 +1,93 @@
+"""
+Microbenchmark for building subroutines with the SDK.
+
+Runs builder-heavy application code (qubits, measurements, array entry futures,
+if-contexts and loops) on a `DebugConnection`, which compiles and serializes the
+subroutines but does not execute them. Reports the time per round of SDK code
+(including the flush) and the time of the register and qubit allocations of the
+`MemoryManager` on their own.
+
+Usage::
+
+    python benchmarks/sdk_builder.py [--rounds N] [--repeat R]
+"""
+
+import argparse
+import time
+
+from netqasm.sdk.connection import DebugConnection
+from netqasm.sdk.memmgr import MemoryManager
+from netqasm.sdk.qubit import Qubit
+
+DebugConnection.node_ids = {"Alice": 0}
+
+# Number of qubits and array entry futures used in a single round
+QUBITS_PER_ROUND = 4
+FUTURES_PER_ROUND = 8
+
+
+def sdk_round(conn: DebugConnection) -> None:
+    """Application code of a single round, which is flushed at the end."""
+    array = conn.new_array(FUTURES_PER_ROUND, init_values=[0] * FUTURES_PER_ROUND)
+    counters = [array.get_future_index(i) for i in range(FUTURES_PER_ROUND)]
+    qubits = [Qubit(conn) for _ in range(QUBITS_PER_ROUND)]
+    for q in qubits:
+        q.H()
+    outcomes = [q.measure(store_array=False) for q in qubits]
+    for outcome, counter in zip(outcomes, counters):
+        with outcome.if_eq(1):
+            counter.add(1)
+    with conn.loop(4):
+        for counter in counters:
+            counter.add(2)
+    conn.flush()
+
+
+def time_sdk(rounds: int, repeat: int) -> float:
+    """Get the best time out of `repeat` to run `rounds` rounds."""
+    best = float("inf")
+    for _ in range(repeat):
+        with DebugConnection("Alice") as alice:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                sdk_round(alice)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_allocation(num: int, repeat: int) -> float:
+    """Get the best time out of `repeat` to allocate and free all R registers,
+    M registers and qubit IDs `num` times."""
+    best = float("inf")
+    for _ in range(repeat):
+        mem_mgr = MemoryManager()
+        start = time.perf_counter()
+        for _ in range(num):
+            registers = [
+                mem_mgr.get_inactive_register(activate=True) for _ in range(16)
+            ]
+            for register in registers:
+                mem_mgr.remove_active_register(register)
+            for _ in range(16):
+                mem_mgr.get_new_meas_outcome_register()
+            mem_mgr.reset_used_meas_registers()
+            for _ in range(QUBITS_PER_ROUND):
+                mem_mgr.get_new_qubit_address()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rounds: int, repeat: int) -> None:
+    sdk = time_sdk(rounds, repeat)
+    print(f"sdk rounds: {rounds}, {sdk / rounds * 1e6:.1f} us per round")
+
+    allocation = time_allocation(rounds, repeat)
+    print(f"memory manager: {allocation / rounds * 1e6:.1f} us per round")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(rounds=args.rounds, repeat=args.repeat)
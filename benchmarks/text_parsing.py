@@ -0,0 +1,117 @@
+"""
+Benchmark for parsing and assembling NetQASM text subroutines.
+
+Parses the subroutines in `netqasm/examples/netqasm_files` and a synthetic
+subroutine with (by default) 10,000 body lines, covering registers, immediates,
+array entries and slices, arguments, macros and branch labels.
+Reports the time to only tokenize the text into a `ProtoSubroutine` and the time
+to fully parse and assemble it into a `Subroutine`.
+
+Usage::
+
+    python benchmarks/text_parsing.py [--lines N] [--repeat R]
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, List, Tuple
+
+from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.lang.parsing.text import parse_text_protosubroutine
+from netqasm.util.error import NetQASMInstrError, NetQASMSyntaxError
+
+EXAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "netqasm",
+    "examples",
+    "netqasm_files",
+)
+
+PREAMBLE = """# NETQASM 1.0
+# APPID 0
+# DEFINE ms @0
+# DEFINE q Q0
+"""
+
+# Block of body lines, repeated to get a subroutine of the requested size
+BLOCK = """LOOP{i}:
+beq R0 R3 EXIT{i}
+qalloc $q
+init $q
+h $q
+rot_x $q 1 4 // rotate by pi / 4
+meas $q M0
+store M0 $ms[R0]
+load R1 $ms[R0]
+add R0 R0 R2
+wait_all $ms[0:4]
+jmp LOOP{i}
+EXIT{i}:
+"""
+
+LINES_PER_BLOCK = BLOCK.count("\n")
+
+
+def get_examples() -> List[Tuple[str, str]]:
+    """Get the name and text of all example subroutines that can be parsed."""
+    examples = []
+    for name in sorted(os.listdir(EXAMPLES_DIR)):
+        with open(os.path.join(EXAMPLES_DIR, name)) as f:
+            text = f.read()
+        try:
+            parse_text_subroutine(text)
+        except (NetQASMInstrError, NetQASMSyntaxError):
+            continue
+        examples.append((name, text))
+    return examples
+
+
+def get_synthetic(num_lines: int) -> str:
+    """Get a synthetic subroutine with approximately `num_lines` body lines."""
+    body = "".join(
+        BLOCK.format(i=i) for i in range(max(1, num_lines // LINES_PER_BLOCK))
+    )
+    return (
+        PREAMBLE
+        + "set R0 0\nset R2 1\nset R3 10\narray(10) $ms\n"
+        + body
+        + "ret_reg R0\n"
+    )
+
+
+def time_parsing(
+    parse: Callable[[str], object], text: str, repeat: int, number: int = 1
+) -> float:
+    """Get the best time out of `repeat` to parse `text` `number` times."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            parse(text)
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def run(num_lines: int, repeat: int) -> None:
+    for name, text in get_examples():
+        tokenize = time_parsing(parse_text_protosubroutine, text, repeat, number=1000)
+        parse = time_parsing(parse_text_subroutine, text, repeat, number=1000)
+        print(f"{name}: tokenize {tokenize * 1e6:.1f} us, parse {parse * 1e6:.1f} us")
+
+    text = get_synthetic(num_lines)
+    lines = text.count("\n")
+    tokenize = time_parsing(parse_text_protosubroutine, text, repeat)
+    parse = time_parsing(parse_text_subroutine, text, repeat)
+    print(f"synthetic ({lines} lines): tokenize {tokenize:.4f} s, parse {parse:.4f} s")
+    print(
+        f"lines per second: tokenize {lines / tokenize:,.0f}, parse {lines / parse:,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(num_lines=args.lines, repeat=args.repeat)
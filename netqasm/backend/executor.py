@@ -10,7 +10,7 @@ from __future__ import annotations
 import logging
 import os
 import traceback
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from enum import Enum
 from itertools import count
@@ -19,12 +19,15 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
     Dict,
     Generator,
+    Iterable,
     List,
     Optional,
     Set,
     Tuple,
+    Type,
     Union,
 )
 
@@ -40,7 +43,7 @@ from netqasm.lang.instr.base import NetQASMInstruction
 from netqasm.lang.operand import Address, ArrayEntry, ArraySlice
 from netqasm.lang.parsing import parse_address
 from netqasm.logging.glob import get_netqasm_logger
-from netqasm.logging.output import InstrLogger
+from netqasm.logging.output import InstrLogFilter, InstrLogger
 from netqasm.qlink_compat import (
     LinkLayerCreate,
     LinkLayerErr,
@@ -49,11 +52,20 @@ from netqasm.qlink_compat import (
     LinkLayerOKTypeR,
     RequestType,
     ReturnType,
+    T_LinkLayer_1_0_Response,
     get_creator_node_id,
     response_from_qlink_1_0,
 )
 from netqasm.sdk import shared_memory
-from netqasm.sdk.shared_memory import Arrays, SharedMemory, SharedMemoryManager
+from netqasm.sdk.config import LogConfig
+from netqasm.sdk.shared_memory import (
+    Arrays,
+    CompactArray,
+    CompactArrays,
+    RegisterGroup,
+    SharedMemory,
+    SharedMemoryManager,
+)
 from netqasm.util.error import NotAllocatedError
 
 # Imports that are only needed for type checking
@@ -69,6 +81,15 @@ T_LinkLayerResponseOK = Union[LinkLayerOKTypeK, LinkLayerOKTypeM, LinkLayerOKTyp
 
 T_RequestKey = Tuple[int, int]
 
+# Whether this node is the creator of the request, and the request key
+T_ResponseKey = Tuple[bool, T_RequestKey]
+
+_QLINK_1_0_RESPONSE_TYPES = (
+    qlink_1_0.ResCreateAndKeep,
+    qlink_1_0.ResMeasureDirectly,
+    qlink_1_0.ResError,
+)
+
 
 @dataclass
 class EprCmdData:
@@ -119,16 +140,26 @@ class Executor:
     # Class used for instruction loggers. May be different for subclasses of `Executor`.
     instr_logger_class = InstrLogger
 
+    # Classes used for the classical memory of applications. May be different for
+    # subclasses of `Executor`, e.g. to use the compact memory backend
+    # (`CompactRegisterGroup`, `CompactArrays` and `CompactSharedMemory`).
+    register_group_class: Type[RegisterGroup] = RegisterGroup
+    arrays_class: Type[Arrays] = Arrays
+    shared_memory_class: Type[SharedMemory] = SharedMemory
+
     def __init__(
         self,
         name: Optional[str] = None,
         instr_log_dir: Optional[str] = None,
+        log_config: Optional[LogConfig] = None,
         **kwargs,
     ) -> None:
         """Executor constructor.
 
         :param name: name of the executor for logging purposes, defaults to None
         :param instr_log_dir: directory to log instructions to, defaults to None
+        :param log_config: logging configuration, used to filter which instructions
+            are logged, defaults to None
         """
         self._name: str  # declare type
 
@@ -141,6 +172,9 @@ class Executor:
             str, Callable
         ] = self._get_instruction_handlers()
 
+        # Handlers per instruction class, resolved on first use
+        self._instr_handler_table: Dict[Type[NetQASMInstruction], Callable] = {}
+
         # Registers for different apps
         self._registers: Dict[int, Dict[RegisterName, shared_memory.RegisterGroup]] = {}
 
@@ -179,14 +213,26 @@ class Executor:
             ReturnType, Callable
         ] = self._get_epr_response_handlers()
 
-        # Keep track of pending epr responses to handle
-        self._pending_epr_responses: List[T_LinkLayerResponse] = []
+        # Keep track of pending epr responses to handle, in order of arrival per
+        # response key (i.e. per list of requests in `_epr_create_requests` or
+        # `_epr_recv_requests` they correspond to).
+        # NOTE this used to be a single list of all pending responses, subclasses
+        # accessing it directly should expect a dict of deques per `T_ResponseKey`.
+        self._pending_epr_responses: Dict[
+            T_ResponseKey, Deque[T_LinkLayerResponseOK]
+        ] = defaultdict(deque)
 
         # Network stack
         self._network_stack: Optional[BaseNetworkStack] = None
 
         self._instr_logger: Optional[InstrLogger]  # declare type
 
+        # Filter for the instructions logged by this executor, None to use the filter
+        # of the logger (which may be shared with other executors of the same node)
+        self._instr_log_filter: Optional[InstrLogFilter] = None
+        if log_config is not None:
+            self._instr_log_filter = InstrLogFilter.from_log_config(log_config)
+
         # Logger for instructions
         if instr_log_dir is None:
             self._instr_logger = None
@@ -283,16 +329,18 @@ class Executor:
 
     def _setup_registers(self, app_id: int) -> None:
         """Setup registers for application"""
-        self._registers[app_id] = shared_memory.setup_registers()
+        self._registers[app_id] = shared_memory.setup_registers(
+            self.register_group_class
+        )
 
     def _setup_arrays(self, app_id: int) -> None:
         """Setup memory for storing arrays for application"""
-        self._app_arrays[app_id] = Arrays()
+        self._app_arrays[app_id] = self.arrays_class()
 
     def _new_shared_memory(self, app_id: int) -> None:
         """Instantiate a new shared memory with an application"""
         self._shared_memories[app_id] = SharedMemoryManager.create_shared_memory(
-            node_name=self._name, key=app_id
+            node_name=self._name, key=app_id, memory_class=self.shared_memory_class
         )
 
     def setup_epr_socket(
@@ -467,42 +515,13 @@ class Executor:
         instruction
         :yield: [description]
         """
-        if not isinstance(command, NetQASMInstruction):
-            raise TypeError(f"Expected a NetQASMInstruction, not {type(command)}")
+        handler = self._instr_handler_table.get(type(command))
+        if handler is None:
+            handler = self._resolve_instr_handler(type(command))
 
         prog_counter = self._program_counters[subroutine_id]
 
-        output = None
-        if command.mnemonic in self._instruction_handlers:
-            output = self._instruction_handlers[command.mnemonic](
-                subroutine_id, command
-            )
-        else:
-            if (
-                isinstance(command, ins.core.SingleQubitInstruction)
-                or isinstance(command, ins.core.InitInstruction)
-                or isinstance(command, ins.core.QAllocInstruction)
-                or isinstance(command, ins.core.QFreeInstruction)
-            ):
-                output = self._handle_single_qubit_instr(subroutine_id, command)
-            elif isinstance(command, ins.core.TwoQubitInstruction):
-                output = self._handle_two_qubit_instr(subroutine_id, command)
-            elif isinstance(command, ins.core.RotationInstruction):
-                output = self._handle_single_qubit_rotation(subroutine_id, command)
-            elif isinstance(command, ins.core.ControlledRotationInstruction):
-                output = self._handle_controlled_qubit_rotation(subroutine_id, command)
-            elif (
-                isinstance(command, ins.core.JmpInstruction)
-                or isinstance(command, ins.core.BranchUnaryInstruction)
-                or isinstance(command, ins.core.BranchBinaryInstruction)
-            ):
-                self._handle_branch_instr(subroutine_id, command)
-            elif isinstance(command, ins.core.ClassicalOpInstruction) or isinstance(
-                command, ins.core.ClassicalOpModInstruction
-            ):
-                output = self._handle_binary_classical_instr(subroutine_id, command)
-            else:
-                raise RuntimeError(f"unknown instr type: {type(command)}")
+        output = handler(subroutine_id, command)
 
         if isinstance(output, GeneratorType):
             output = yield from output
@@ -513,8 +532,63 @@ class Executor:
                 command=command,
                 output=output,
                 program_counter=prog_counter,
+                log_filter=self._instr_log_filter,
             )
 
+    def _resolve_instr_handler(self, instr_cls: Type[NetQASMInstruction]) -> Callable:
+        """Find the handler for a NetQASM instruction class and cache it.
+
+        The lookup (by mnemonic, and otherwise by instruction base class) is only
+        done the first time an instruction of this class is executed.
+
+        :raises TypeError: if `instr_cls` is not a NetQASMInstruction
+        :raises RuntimeError: if there is no handler for `instr_cls`
+        :return: handler taking a subroutine ID and an instruction
+        """
+        if not (
+            isinstance(instr_cls, type) and issubclass(instr_cls, NetQASMInstruction)
+        ):
+            raise TypeError(f"Expected a NetQASMInstruction, not {instr_cls}")
+
+        handler: Callable
+        if instr_cls.mnemonic in self._instruction_handlers:
+            handler = self._instruction_handlers[instr_cls.mnemonic]
+        elif issubclass(
+            instr_cls,
+            (
+                ins.core.SingleQubitInstruction,
+                ins.core.InitInstruction,
+                ins.core.QAllocInstruction,
+                ins.core.QFreeInstruction,
+            ),
+        ):
+            handler = self._handle_single_qubit_instr
+        elif issubclass(instr_cls, ins.core.TwoQubitInstruction):
+            handler = self._handle_two_qubit_instr
+        elif issubclass(instr_cls, ins.core.RotationInstruction):
+            handler = self._handle_single_qubit_rotation
+        elif issubclass(instr_cls, ins.core.ControlledRotationInstruction):
+            handler = self._handle_controlled_qubit_rotation
+        elif issubclass(
+            instr_cls,
+            (
+                ins.core.JmpInstruction,
+                ins.core.BranchUnaryInstruction,
+                ins.core.BranchBinaryInstruction,
+            ),
+        ):
+            handler = self._handle_branch_instr
+        elif issubclass(
+            instr_cls,
+            (ins.core.ClassicalOpInstruction, ins.core.ClassicalOpModInstruction),
+        ):
+            handler = self._handle_binary_classical_instr
+        else:
+            raise RuntimeError(f"unknown instr type: {instr_cls}")
+
+        self._instr_handler_table[instr_cls] = handler
+        return handler
+
     @inc_program_counter
     def _instr_set(self, subroutine_id: int, instr: ins.core.SetInstruction) -> None:
         """Handle a NetQASM 'set' instruction."""
@@ -978,6 +1052,9 @@ class Executor:
         if isinstance(output, GeneratorType):
             yield from output
 
+        # Responses for this request might have arrived already
+        self._handle_pending_epr_responses()
+
     def _do_create_epr(
         self,
         subroutine_id: int,
@@ -1111,6 +1188,9 @@ class Executor:
         if isinstance(output, GeneratorType):
             yield from output
 
+        # Responses for this request might have arrived already
+        self._handle_pending_epr_responses()
+
     def _do_recv_epr(
         self,
         subroutine_id: int,
@@ -1245,7 +1325,8 @@ class Executor:
         address = instr.address
         app_id = self._get_app_id(subroutine_id=subroutine_id)
 
-        array = self._get_array(app_id=app_id, address=address)
+        # Pass the array as stored, to avoid converting it element by element
+        array = self._app_arrays[app_id]._get_array_storage(address.address)
 
         # Not all values need to be defined.
 
@@ -1262,7 +1343,7 @@ class Executor:
         self,
         app_id: int,
         entry: Union[operand.Register, Address, ArrayEntry, ArraySlice],
-        value: Union[int, List[int]],
+        value: Union[int, List[int], CompactArray],
     ):
         shared_memory = self._shared_memories[app_id]
         if isinstance(entry, operand.Register):
@@ -1278,7 +1359,10 @@ class Executor:
             address, index = self._expand_array_part(app_id=app_id, array_part=entry)
             shared_memory.set_array_part(address=address, index=index, value=value)  # type: ignore
         elif isinstance(entry, Address):
-            self._logger.debug(f"Updating host about array {entry} with value {value}")
+            # Lazy formatting, since `value` may be a large array
+            self._logger.debug(
+                "Updating host about array %s with value %s", entry, value
+            )
             address = entry.address
             shared_memory.init_new_array(address=address, new_array=value)  # type: ignore
         else:
@@ -1448,6 +1532,10 @@ class Executor:
             if isinstance(output, GeneratorType):
                 yield from output
 
+            # Pending EPR responses may have waited for this virtual address
+            if len(self._pending_epr_responses) > 0:
+                self._handle_pending_epr_responses()
+
     def _reserve_physical_qubit(
         self, physical_address: int
     ) -> Generator[Any, None, None]:
@@ -1478,66 +1566,122 @@ class Executor:
         return subroutine.app_id
 
     def _handle_epr_response(self, response: T_LinkLayerResponse) -> None:
+        self.handle_epr_responses([response])
 
-        if (
-            isinstance(response, qlink_1_0.ResCreateAndKeep)
-            or isinstance(response, qlink_1_0.ResMeasureDirectly)
-            or isinstance(response, qlink_1_0.ResError)
-        ):
-            # Convert from qlink-layer 1.0
-            response = response_from_qlink_1_0(response)
+    def handle_epr_responses(
+        self,
+        responses: Iterable[Union[T_LinkLayerResponse, T_LinkLayer_1_0_Response]],
+    ) -> None:
+        """Handle a batch of EPR responses from the network stack.
+
+        Handling a whole burst of responses (e.g. the results of a measure-directly
+        request for many pairs) at once is cheaper than handling them one by one,
+        since the entanglement information of consecutive pairs of the same request
+        is written to the results array with a single slice assignment.
+
+        :param responses: responses in the order they were produced, qlink-layer 1.0
+            responses are converted first
+        """
+        responses = [
+            response_from_qlink_1_0(response)  # type: ignore
+            if isinstance(response, _QLINK_1_0_RESPONSE_TYPES)
+            else response
+            for response in responses
+        ]
+
+        for response in responses:
+            if response.type == ReturnType.ERR:
+                self._handle_epr_err_response(response)  # type: ignore
+            else:
+                key = self._get_epr_response_key(response)  # type: ignore
+                self._pending_epr_responses[key].append(response)  # type: ignore
 
-        self._pending_epr_responses.append(response)
         self._handle_pending_epr_responses()
 
+    def _get_epr_response_key(self, response: T_LinkLayerResponseOK) -> T_ResponseKey:
+        creator_node_id: int = get_creator_node_id(self.node_id, response)  # type: ignore
+        return creator_node_id == self.node_id, (
+            response.remote_node_id,
+            response.purpose_id,
+        )
+
     def _handle_pending_epr_responses(self) -> None:
+        """Handle all pending EPR responses that can currently be handled.
+
+        The pending responses with the same key are matched, in order of arrival,
+        to the next pairs of the oldest request with that key. If the first of them
+        cannot be handled yet (e.g. since there is no request yet, or since the
+        virtual address for the pair is still in use), neither can the others.
+        So, each response is only tried when it is the first pending one for its key.
+        """
         # NOTE this will probably be handled differently in an actual implementation
         # but is done in a simple way for now to allow for simulation
-        if len(self._pending_epr_responses) == 0:
-            return
+        for key in list(self._pending_epr_responses.keys()):
+            responses = self._pending_epr_responses[key]
+            self._handle_epr_responses_for_key(responses)
+            if len(responses) == 0:
+                del self._pending_epr_responses[key]
 
-        # Try to handle one of the pending EPR responses
-        handled = False
-        for i, response in enumerate(self._pending_epr_responses):
+        if len(self._pending_epr_responses) > 0:
+            self._wait_to_handle_epr_responses()
 
-            if response.type == ReturnType.ERR:
-                self._handle_epr_err_response(response)  # type: ignore
-            else:
+    def _handle_epr_responses_for_key(
+        self, responses: Deque[T_LinkLayerResponseOK]
+    ) -> None:
+        """Handle as many of the pending EPR OK responses with the same key as
+        possible, removing the handled ones.
+
+        :param responses: pending responses with the same key, in order of arrival
+        """
+        while len(responses) > 0:
+            info = self._extract_epr_info(response=responses[0])
+            if info is None:
+                return
+            epr_cmd_data, pair_index, is_creator, request_key = info
+
+            handled: List[T_LinkLayerResponseOK] = []
+            while len(responses) > 0 and len(handled) < epr_cmd_data.pairs_left:
+                response = responses[0]
                 self._logger.debug(
                     f"Try to handle EPR OK ({response.type}) response from network stack"
                 )
-                info = self._extract_epr_info(response=response)  # type: ignore
-                if info is not None:
-                    epr_cmd_data, pair_index, is_creator, request_key = info
-                    handled = self._epr_response_handlers[response.type](
-                        epr_cmd_data=epr_cmd_data,
-                        response=response,
-                        pair_index=pair_index,
-                    )
-                if handled:
-                    epr_cmd_data.pairs_left -= 1
+                if not self._epr_response_handlers[response.type](
+                    epr_cmd_data=epr_cmd_data,
+                    response=response,
+                    pair_index=pair_index + len(handled),
+                ):
+                    break
+                handled.append(responses.popleft())
+            if len(handled) == 0:
+                return
 
-                    self._handle_last_epr_pair(
-                        epr_cmd_data=epr_cmd_data,
-                        is_creator=is_creator,
-                        request_key=request_key,
-                    )
+            epr_cmd_data.pairs_left -= len(handled)
 
-                    self._store_ent_info(
-                        epr_cmd_data=epr_cmd_data,
-                        response=response,  # type: ignore
-                        pair_index=pair_index,
-                    )
-                    self._pending_epr_responses.pop(i)
-                    break
-        if not handled:
-            self._wait_to_handle_epr_responses()
-        else:
-            self._handle_pending_epr_responses()
+            self._handle_last_epr_pair(
+                epr_cmd_data=epr_cmd_data,
+                is_creator=is_creator,
+                request_key=request_key,
+            )
+
+            self._store_ent_infos(
+                epr_cmd_data=epr_cmd_data,
+                responses=handled,
+                first_pair_index=pair_index,
+            )
+
+            # Either all responses are handled or the next one cannot be handled yet
+            if epr_cmd_data.pairs_left > 0:
+                return
 
     def _wait_to_handle_epr_responses(self) -> None:
-        # This can be subclassed to sleep a little before handling again
-        self._handle_pending_epr_responses()
+        """Called when there are pending EPR responses that cannot be handled yet.
+
+        This can be subclassed to e.g. sleep a little and call
+        `_handle_pending_epr_responses` again. By default, the pending responses are
+        tried again when a new response arrives, when a new EPR request is made or
+        when a qubit is freed (since the virtual address of a pair may be in use).
+        """
+        pass
 
     def _handle_epr_err_response(self, response: LinkLayerErr) -> None:
         raise RuntimeError(
@@ -1586,18 +1730,49 @@ class Executor:
     def _store_ent_info(
         self, epr_cmd_data: EprCmdData, response: T_LinkLayerResponseOK, pair_index: int
     ) -> None:
-        # Store the entanglement information
-        ent_info = [
-            entry.value if isinstance(entry, Enum) else entry for entry in response
+        """Store the entanglement information of a single pair.
+
+        Deprecated, this is not called by the Executor anymore. Override
+        `_store_ent_infos` instead.
+        """
+        self._logger.warning(
+            "Executor._store_ent_info() is deprecated. Use _store_ent_infos instead."
+        )
+        self._store_ent_infos(
+            epr_cmd_data=epr_cmd_data,
+            responses=[response],
+            first_pair_index=pair_index,
+        )
+
+    def _store_ent_infos(
+        self,
+        epr_cmd_data: EprCmdData,
+        responses: List[T_LinkLayerResponseOK],
+        first_pair_index: int,
+    ) -> None:
+        """Store the entanglement information of consecutive pairs of a request.
+
+        The information of all pairs is written into the results array as a single
+        slice. With the compact memory backend, the records of all pairs are packed
+        into one typed buffer. Subclasses can override this to change how the
+        entanglement information is stored.
+        """
+        ent_info: Union[List[Any], CompactArray] = [
+            entry.value if isinstance(entry, Enum) else entry
+            for response in responses
+            for entry in response
         ]
+        if issubclass(self.arrays_class, CompactArrays):
+            ent_info = CompactArray.from_values(ent_info)
         ent_results_array_address = epr_cmd_data.ent_results_array_address
         self._logger.debug(
-            f"Storing entanglement information for pair {pair_index} "
+            f"Storing entanglement information for pairs {first_pair_index} to "
+            f"{first_pair_index + len(responses) - 1} "
             f"in array at address {ent_results_array_address}"
         )
         # Start and stop of slice
-        arr_start = pair_index * OK_FIELDS
-        arr_stop = (pair_index + 1) * OK_FIELDS
+        arr_start = first_pair_index * OK_FIELDS
+        arr_stop = (first_pair_index + len(responses)) * OK_FIELDS
         subroutine_id = epr_cmd_data.subroutine_id
         app_id = self._get_app_id(subroutine_id=subroutine_id)
         if app_id not in self._app_arrays:
@@ -6,7 +6,9 @@ as a base class for modeling the quantum node controller.
 """
 
 import abc
+import hashlib
 import logging
+from collections import OrderedDict, namedtuple
 from types import GeneratorType
 from typing import Any, Callable, Dict, Generator, List, Optional, Set, Type
 
@@ -22,10 +24,97 @@ from netqasm.backend.messages import (
     SubroutineMessage,
 )
 from netqasm.backend.network_stack import BaseNetworkStack
+from netqasm.lang import encoding
 from netqasm.lang.instr import Flavour
 from netqasm.lang.parsing import deserialize
 from netqasm.lang.subroutine import Subroutine
 from netqasm.logging.glob import get_netqasm_logger
+from netqasm.sdk.config import LogConfig
+
+# Default maximum number of decoded subroutines kept by a `QNodeController`
+DEFAULT_SUBROUTINE_CACHE_SIZE = 128
+
+SubroutineCacheInfo = namedtuple(
+    "SubroutineCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+class SubroutineCache:
+    """LRU cache of decoded subroutines, keyed by their binary encoding.
+
+    The app ID in the metadata of the encoding is not part of the key, so that
+    the same subroutine sent by different applications (or by the same
+    application repeatedly) is only deserialized once.
+    Cached subroutines are returned as a shallow copy with the app ID of the
+    message: the copy has its own list of instructions, so changing it (e.g. by
+    instantiating the subroutine) does not affect the cached subroutine.
+    """
+
+    _APP_ID_START = encoding.Metadata.app_id.offset  # type: ignore
+    _APP_ID_STOP = _APP_ID_START + encoding.Metadata.app_id.size  # type: ignore
+
+    def __init__(self, maxsize: int = DEFAULT_SUBROUTINE_CACHE_SIZE) -> None:
+        """SubroutineCache constructor.
+
+        :param maxsize: maximum number of subroutines kept in the cache.
+            A value of 0 disables the cache.
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize should be non-negative, not {maxsize}")
+        self._maxsize: int = maxsize
+        self._subroutines: OrderedDict[bytes, Subroutine] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @classmethod
+    def get_key(cls, raw: bytes) -> bytes:
+        """Get the cache key of an encoded subroutine, ignoring its app ID."""
+        view = memoryview(raw)
+        digest = hashlib.sha256(view[: cls._APP_ID_START])
+        digest.update(view[cls._APP_ID_STOP :])
+        return digest.digest()
+
+    def deserialize(self, raw: bytes, flavour: Optional[Flavour] = None) -> Subroutine:
+        """Deserialize an encoded subroutine, reusing a cached result if possible.
+
+        :param raw: binary encoding of the subroutine
+        :param flavour: flavour used for deserializing (on a cache miss)
+        :return: subroutine with the app ID specified in `raw`
+        """
+        if self._maxsize == 0:
+            self._misses += 1
+            return deserialize(raw, flavour=flavour)
+
+        key = self.get_key(raw)
+        cached = self._subroutines.get(key)
+        if cached is None:
+            self._misses += 1
+            subroutine = deserialize(raw, flavour=flavour)
+            self._subroutines[key] = subroutine
+            if len(self._subroutines) > self._maxsize:
+                self._subroutines.popitem(last=False)
+            return subroutine._with_app_id(subroutine.app_id)
+
+        self._hits += 1
+        self._subroutines.move_to_end(key)
+        metadata = encoding.Metadata.from_buffer_copy(raw)
+        return cached._with_app_id(metadata.app_id)  # type: ignore
+
+    def clear(self) -> None:
+        """Remove all cached subroutines and reset the statistics."""
+        self._subroutines.clear()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def info(self) -> SubroutineCacheInfo:
+        """Hit and miss counters, maximum size and current size of the cache."""
+        return SubroutineCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            maxsize=self._maxsize,
+            currsize=len(self._subroutines),
+        )
 
 
 class QNodeController:
@@ -41,6 +130,8 @@ class QNodeController:
         name: str,
         instr_log_dir: Optional[str] = None,
         flavour: Optional[Flavour] = None,
+        subroutine_cache_size: int = DEFAULT_SUBROUTINE_CACHE_SIZE,
+        log_config: Optional[LogConfig] = None,
         **kwargs,
     ) -> None:
         """QNodeController constructor.
@@ -49,6 +140,10 @@ class QNodeController:
         :param instr_log_dir: directory used to write log files to
         :param flavour: which NetQASM flavour this quantum node controller should
             expect and be able to interpret
+        :param subroutine_cache_size: maximum number of decoded subroutines to keep
+            for reuse when the same subroutine is received again. 0 disables caching.
+        :param log_config: logging configuration passed to the executor, used to
+            filter which instructions are logged
         """
         self.name: str = name
 
@@ -57,6 +152,7 @@ class QNodeController:
         self._executor: Executor = self._get_executor_class(flavour=flavour)(
             name=name,
             instr_log_dir=instr_log_dir,
+            log_config=log_config,
             **kwargs,
         )
 
@@ -72,6 +168,11 @@ class QNodeController:
 
         self._finished: bool = False
 
+        # Decoded subroutines, to avoid deserializing repeated subroutines
+        self._subroutine_cache: SubroutineCache = SubroutineCache(
+            maxsize=subroutine_cache_size
+        )
+
         self._logger: logging.Logger = get_netqasm_logger(
             f"{self.__class__.__name__}({self.name})"
         )
@@ -103,6 +204,11 @@ class QNodeController:
         if self.finished:
             self.stop()
 
+    @property
+    def subroutine_cache_info(self) -> SubroutineCacheInfo:
+        """Statistics (hits, misses, maxsize, currsize) of the subroutine cache."""
+        return self._subroutine_cache.info
+
     @property
     def has_active_apps(self) -> bool:
         return len(self._active_app_ids) > 0
@@ -132,7 +238,9 @@ class QNodeController:
         pass
 
     def _handle_subroutine(self, msg: SubroutineMessage) -> Generator[Any, None, None]:
-        subroutine = deserialize(msg.subroutine, flavour=self.flavour)
+        subroutine = self._subroutine_cache.deserialize(
+            msg.subroutine, flavour=self.flavour
+        )
         self._logger.debug(
             f"Executing next subroutine " f"from app ID {subroutine.app_id}"
         )
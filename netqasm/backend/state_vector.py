@@ -0,0 +1,209 @@
+"""
+NumPy state-vector implementation of the NetQASM executor.
+
+This module provides the `StateVectorExecutor` class, an `Executor` that keeps the
+pure state of all its qubits as a NumPy array and applies quantum instructions to it.
+It does not depend on any external quantum simulator and can be used to run
+subroutines locally, e.g. for testing and for benchmarking the classical control path.
+"""
+
+from typing import Any, Dict, Generator, List, Optional, Type
+
+import numpy as np
+
+from netqasm.backend.executor import Executor
+from netqasm.lang import instr as ins
+from netqasm.lang.ir import string_to_instruction
+from netqasm.util.quantum_gates import X, gate_to_matrix
+
+
+class StateVectorExecutor(Executor):
+    """Executor that simulates its qubits as a single state vector using NumPy.
+
+    The state of the `n` physical qubits in use is stored as a complex array of
+    shape `(2,) * n`, where each physical qubit corresponds to one axis.
+    Gates are applied as tensor contractions over the axes they act on, so the
+    state never has to be reshaped into a `2**n` vector or matrices expanded
+    to the full space.
+
+    Measurements collapse the state, using a random number generator that can be
+    seeded for reproducible results.
+    Freeing (or re-initializing) a qubit is done by measuring it, which on average
+    has the same effect on the remaining qubits as tracing it out.
+
+    Entanglement generation is not simulated by this executor.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        instr_log_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """StateVectorExecutor constructor.
+
+        :param name: name of the executor for logging purposes, defaults to None
+        :param instr_log_dir: directory to log instructions to, defaults to None
+        :param seed: seed for the random number generator used for measurements
+        """
+        super().__init__(name=name, instr_log_dir=instr_log_dir, **kwargs)
+
+        # State of all qubits in use, with one axis per qubit
+        self._state: np.ndarray = np.ones((), dtype=np.complex128)
+
+        # Axis in `_state` of each physical qubit in use
+        self._qubit_axes: Dict[int, int] = {}
+
+        # Matrices of parameterless gates, per instruction class
+        self._gate_matrices: Dict[Type[ins.NetQASMInstruction], np.ndarray] = {}
+
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+
+    @property
+    def num_qubits(self) -> int:
+        """Get the number of physical qubits currently in the state.
+
+        :return: number of qubits
+        """
+        return len(self._qubit_axes)
+
+    def get_density_matrix(self, physical_addresses: List[int]) -> np.ndarray:
+        """Get the reduced density matrix of some of the physical qubits.
+
+        :param physical_addresses: physical qubits to get the state of, in the order
+            used for the tensor product
+        :return: density matrix of shape `(2**k, 2**k)` for `k` qubits
+        """
+        axes = [self._qubit_axes[address] for address in physical_addresses]
+        num = len(axes)
+        state = np.moveaxis(self._state, axes, range(num)).reshape(2**num, -1)
+        return state @ state.conj().T
+
+    def _get_qubit_state(self, app_id: int, virtual_address: int) -> np.ndarray:
+        position = self._get_position(app_id=app_id, address=virtual_address)
+        return self.get_density_matrix([position])
+
+    def _allocate_physical_qubit(
+        self,
+        subroutine_id: int,
+        virtual_address: int,
+        physical_address: Optional[int] = None,
+    ) -> int:
+        physical_address = super()._allocate_physical_qubit(
+            subroutine_id=subroutine_id,
+            virtual_address=virtual_address,
+            physical_address=physical_address,
+        )
+        if physical_address not in self._qubit_axes:
+            self._add_qubit(physical_address)
+        return physical_address
+
+    def _clear_phys_qubit_in_memory(
+        self, physical_address: int
+    ) -> Generator[Any, None, None]:
+        if physical_address in self._qubit_axes:
+            self._remove_qubit(physical_address)
+        yield None
+
+    def _add_qubit(self, physical_address: int) -> None:
+        """Add a qubit in the state |0> as the last axis of the state."""
+        self._qubit_axes[physical_address] = self._state.ndim
+        self._state = np.multiply.outer(self._state, np.array([1, 0], dtype=complex))
+
+    def _remove_qubit(self, physical_address: int) -> None:
+        """Measure a qubit and remove its axis from the state."""
+        outcome = self._measure(physical_address)
+        axis = self._qubit_axes.pop(physical_address)
+        self._state = np.take(self._state, outcome, axis=axis)
+        for address, other_axis in self._qubit_axes.items():
+            if other_axis > axis:
+                self._qubit_axes[address] = other_axis - 1
+
+    def _measure(self, physical_address: int) -> int:
+        """Measure a qubit in the computational basis and collapse the state."""
+        axis = self._qubit_axes[physical_address]
+        prob_one = float(np.sum(np.abs(np.take(self._state, 1, axis=axis)) ** 2))
+        outcome = int(self._rng.random() < prob_one)
+        prob = prob_one if outcome == 1 else 1 - prob_one
+
+        index: List[Any] = [slice(None)] * self._state.ndim
+        index[axis] = 1 - outcome
+        self._state[tuple(index)] = 0
+        self._state /= np.sqrt(prob)
+        return outcome
+
+    def _apply_matrix(self, matrix: np.ndarray, physical_addresses: List[int]) -> None:
+        """Apply a gate on the given qubits, the first being most significant."""
+        axes = [self._qubit_axes[address] for address in physical_addresses]
+        num = len(axes)
+        tensor = np.reshape(matrix, (2,) * (2 * num))
+        state = np.tensordot(tensor, self._state, axes=(range(num, 2 * num), axes))
+        self._state = np.moveaxis(state, range(num), axes)
+
+    def _get_gate_matrix(self, instr: ins.NetQASMInstruction) -> np.ndarray:
+        """Get the matrix of a parameterless gate, using the generic gate matrices
+        from `netqasm.util.quantum_gates` if available."""
+        instr_cls = type(instr)
+        matrix = self._gate_matrices.get(instr_cls)
+        if matrix is None:
+            try:
+                matrix = gate_to_matrix(string_to_instruction(instr.mnemonic))
+            except ValueError:
+                matrix = instr.to_matrix()  # type: ignore
+            self._gate_matrices[instr_cls] = matrix
+        return matrix
+
+    def _get_rotation_matrix(self, instr: ins.NetQASMInstruction) -> np.ndarray:
+        """Get the matrix of a (controlled) rotation gate."""
+        angle = (instr.angle_num.value, instr.angle_denom.value)  # type: ignore
+        try:
+            return gate_to_matrix(string_to_instruction(instr.mnemonic), angle=angle)
+        except ValueError:
+            return instr.to_matrix()  # type: ignore
+
+    def _do_single_qubit_instr(
+        self, instr: ins.core.SingleQubitInstruction, subroutine_id: int, address: int
+    ) -> None:
+        position = self._get_position(subroutine_id=subroutine_id, address=address)
+        if isinstance(instr, ins.core.InitInstruction):
+            # Reset the qubit to |0>
+            if self._measure(position) == 1:
+                self._apply_matrix(X, [position])
+        else:
+            self._apply_matrix(self._get_gate_matrix(instr), [position])
+
+    def _do_single_qubit_rotation(
+        self,
+        instr: ins.core.RotationInstruction,
+        subroutine_id: int,
+        address: int,
+        angle: float,
+    ) -> None:
+        position = self._get_position(subroutine_id=subroutine_id, address=address)
+        self._apply_matrix(self._get_rotation_matrix(instr), [position])
+
+    def _do_controlled_qubit_rotation(
+        self,
+        instr: ins.core.ControlledRotationInstruction,
+        subroutine_id: int,
+        address1: int,
+        address2: int,
+        angle: float,
+    ) -> None:
+        positions = self._get_positions(subroutine_id, [address1, address2])
+        self._apply_matrix(self._get_rotation_matrix(instr), positions)
+
+    def _do_two_qubit_instr(
+        self,
+        instr: ins.core.TwoQubitInstruction,
+        subroutine_id: int,
+        address1: int,
+        address2: int,
+    ) -> None:
+        positions = self._get_positions(subroutine_id, [address1, address2])
+        self._apply_matrix(self._get_gate_matrix(instr), positions)
+
+    def _do_meas(self, subroutine_id: int, q_address: int) -> int:
+        position = self._get_position(subroutine_id=subroutine_id, address=q_address)
+        return self._measure(position)
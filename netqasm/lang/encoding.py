@@ -1,5 +1,8 @@
 import ctypes
+import struct
 from enum import Enum
+from functools import lru_cache
+from typing import Type
 
 ############
 # METADATA #
@@ -31,6 +34,11 @@ ADDRESS_BITS: int = len(bytes(ADDRESS())) * 8  # type: ignore
 
 INSTR_ID = ctypes.c_uint8
 
+# Masks to truncate values to the size of the fields they are packed into, in the
+# same way as when they are assigned to the fields of a ctypes structure
+IMMEDIATE_MASK = (1 << IMMEDIATE_BITS) - 1
+INTEGER_MASK = (1 << INTEGER_BITS) - 1
+
 REG_TYPE = ctypes.c_uint8
 REG_BITS = len(bytes(REG_TYPE())) * 8  # type: ignore
 # Num bits in register name
@@ -344,6 +352,53 @@ class RecvEPRCommand(Command):
     )
 
 
+@lru_cache(maxsize=None)
+def pack_register(register_name: int, register_index: int) -> int:
+    """Get the value of the single byte encoding a register."""
+    return bytes(Register(register_name, register_index))[0]
+
+
+# Struct formats of the basic field types of commands
+_FIELD_FORMATS = {
+    ctypes.c_uint8: "B",
+    ctypes.c_uint16: "H",
+    ctypes.c_int32: "I",
+}
+
+
+def _get_field_format(field_type) -> str:
+    if issubclass(field_type, Register):
+        return "B"
+    if issubclass(field_type, ctypes.Structure):
+        return "".join(_get_field_format(field[1]) for field in field_type._fields_)
+    if issubclass(field_type, ctypes.Array):
+        assert field_type._type_ is ctypes.c_uint8, "only padding arrays are expected"
+        return f"{field_type._length_}x"
+    field_format = _FIELD_FORMATS.get(field_type)
+    if field_format is None:
+        raise TypeError(f"Unsupported field type {field_type}")
+    return field_format
+
+
+def get_command_struct(command_class: Type[Command]) -> struct.Struct:
+    """Get a `struct.Struct` with the same binary layout as a command.
+
+    The values to pack are the fields of the command, flattened in order and without
+    padding. Registers are packed as the value given by `pack_register` and all other
+    values as unsigned integers, so they should first be truncated using
+    `IMMEDIATE_MASK` or `INTEGER_MASK`.
+    """
+    field_formats = [
+        _get_field_format(field[1])
+        for cls in reversed(command_class.__mro__)
+        if "_fields_" in cls.__dict__
+        for field in cls.__dict__["_fields_"]
+    ]
+    command_struct = struct.Struct("=" + "".join(field_formats))
+    assert command_struct.size == ctypes.sizeof(command_class)
+    return command_struct
+
+
 COMMANDS = [
     RegCommand,
     RegRegCommand,
@@ -1,6 +1,7 @@
+import struct
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import ClassVar, List, Optional, Union
 
 from netqasm.lang import encoding
 from netqasm.lang.operand import (
@@ -17,6 +18,10 @@ from netqasm.util.string import rspaces
 # Abstract base instruction types. Should not be instantiated directly.
 
 
+def _pack_reg(register: Register) -> int:
+    return encoding.pack_register(register.name.value, register.index)
+
+
 @dataclass  # type: ignore
 class NetQASMInstruction(ABC):
     """
@@ -41,6 +46,27 @@ class NetQASMInstruction(ABC):
     def serialize(self) -> bytes:
         pass
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        """Serialize the instruction into `buffer`, starting at `offset`.
+
+        Gives the same bytes as `serialize`. This default implementation copies
+        the result of `serialize`. The base instruction classes override it to pack
+        the instruction in place using their `_STRUCT`, without building
+        intermediate objects. A subclass that overrides `serialize` but not
+        `pack_into` gets this default implementation back.
+
+        :return: the number of bytes written
+        """
+        raw = self.serialize()
+        buffer[offset : offset + len(raw)] = raw
+        return len(raw)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A subclass changing `serialize` should not use `pack_into` of its parent
+        if "serialize" in cls.__dict__ and "pack_into" not in cls.__dict__:
+            cls.pack_into = NetQASMInstruction.pack_into  # type: ignore
+
     @classmethod
     @abstractmethod
     def from_operands(cls, operands: List[Union[Operand, int]]) -> "NetQASMInstruction":
@@ -81,6 +107,10 @@ class NoOperandInstruction(NetQASMInstruction):
     An instruction with no operands.
     """
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.NoOperandCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return []
@@ -95,6 +125,10 @@ class NoOperandInstruction(NetQASMInstruction):
         c_struct = encoding.NoOperandCommand(id=self.id)
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(buffer, offset, self.id)
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 0
@@ -112,6 +146,8 @@ class RegInstruction(NetQASMInstruction):
 
     reg: Register = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(encoding.RegCommand)
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg]
@@ -127,6 +163,10 @@ class RegInstruction(NetQASMInstruction):
         c_struct = encoding.RegCommand(id=self.id, reg=self.reg.cstruct)
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(buffer, offset, self.id, _pack_reg(self.reg))
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 1
@@ -147,6 +187,10 @@ class RegRegInstruction(NetQASMInstruction):
     reg0: Register = None  # type: ignore
     reg1: Register = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegRegCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1]
@@ -165,6 +209,12 @@ class RegRegInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer, offset, self.id, _pack_reg(self.reg0), _pack_reg(self.reg1)
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 2
@@ -187,6 +237,10 @@ class RegImmImmInstruction(NetQASMInstruction):
     imm0: Immediate = None  # type: ignore
     imm1: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegImmImmCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg, self.imm0, self.imm1]
@@ -206,6 +260,17 @@ class RegImmImmInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg),
+            self.imm0.value & encoding.IMMEDIATE_MASK,
+            self.imm1.value & encoding.IMMEDIATE_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 3
@@ -243,6 +308,10 @@ class RegRegImmImmInstruction(NetQASMInstruction):
     imm0: Immediate = None  # type: ignore
     imm1: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegRegImmImmCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1, self.imm0, self.imm1]
@@ -267,6 +336,18 @@ class RegRegImmImmInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg0),
+            _pack_reg(self.reg1),
+            self.imm0.value & encoding.IMMEDIATE_MASK,
+            self.imm1.value & encoding.IMMEDIATE_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 4
@@ -298,6 +379,10 @@ class RegRegImm4Instruction(NetQASMInstruction):
     imm2: Immediate = None  # type: ignore
     imm3: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegRegImm4Command
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1, self.imm0, self.imm1, self.imm2, self.imm3]
@@ -326,6 +411,20 @@ class RegRegImm4Instruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg0),
+            _pack_reg(self.reg1),
+            self.imm0.value & encoding.IMMEDIATE_MASK,
+            self.imm1.value & encoding.IMMEDIATE_MASK,
+            self.imm2.value & encoding.IMMEDIATE_MASK,
+            self.imm3.value & encoding.IMMEDIATE_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 6
@@ -363,6 +462,10 @@ class RegRegRegInstruction(NetQASMInstruction):
     reg1: Register = None  # type: ignore
     reg2: Register = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegRegRegCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1, self.reg2]
@@ -385,6 +488,17 @@ class RegRegRegInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg0),
+            _pack_reg(self.reg1),
+            _pack_reg(self.reg2),
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 3
@@ -409,6 +523,10 @@ class RegRegRegRegInstruction(NetQASMInstruction):
     reg2: Register = None  # type: ignore
     reg3: Register = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegRegRegRegCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1, self.reg2, self.reg3]
@@ -433,6 +551,18 @@ class RegRegRegRegInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg0),
+            _pack_reg(self.reg1),
+            _pack_reg(self.reg2),
+            _pack_reg(self.reg3),
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 4
@@ -460,6 +590,8 @@ class ImmInstruction(NetQASMInstruction):
 
     imm: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(encoding.ImmCommand)
+
     @property
     def operands(self) -> List[Operand]:
         return [self.imm]
@@ -475,6 +607,12 @@ class ImmInstruction(NetQASMInstruction):
         c_struct = encoding.ImmCommand(id=self.id, imm=self.imm.value)
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer, offset, self.id, self.imm.value & encoding.INTEGER_MASK
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 1
@@ -498,6 +636,10 @@ class ImmImmInstruction(NetQASMInstruction):
     imm0: Immediate = None  # type: ignore
     imm1: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.ImmImmCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.imm0, self.imm1]
@@ -516,6 +658,16 @@ class ImmImmInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            self.imm0.value & encoding.IMMEDIATE_MASK,
+            self.imm1.value & encoding.IMMEDIATE_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 2
@@ -543,6 +695,10 @@ class RegRegImmInstruction(NetQASMInstruction):
     reg1: Register = None  # type: ignore
     imm: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegRegImmCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1, self.imm]
@@ -565,6 +721,17 @@ class RegRegImmInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg0),
+            _pack_reg(self.reg1),
+            self.imm.value & encoding.INTEGER_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 3
@@ -589,6 +756,10 @@ class RegImmInstruction(NetQASMInstruction):
     reg: Register = None  # type: ignore
     imm: Immediate = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegImmCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg, self.imm]
@@ -607,6 +778,16 @@ class RegImmInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg),
+            self.imm.value & encoding.INTEGER_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 2
@@ -630,6 +811,10 @@ class RegEntryInstruction(NetQASMInstruction):
     reg: Register = None  # type: ignore
     entry: ArrayEntry = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegEntryCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg, self.entry]
@@ -648,6 +833,17 @@ class RegEntryInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg),
+            self.entry.address.address & encoding.INTEGER_MASK,
+            _pack_reg(self.entry.index),
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 2
@@ -669,6 +865,10 @@ class RegAddrInstruction(NetQASMInstruction):
     reg: Register = None  # type: ignore
     address: Address = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.RegAddrCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg, self.address]
@@ -687,6 +887,16 @@ class RegAddrInstruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg),
+            self.address.address & encoding.INTEGER_MASK,
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 2
@@ -707,6 +917,10 @@ class ArrayEntryInstruction(NetQASMInstruction):
 
     entry: ArrayEntry = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.ArrayEntryCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.entry]
@@ -722,6 +936,16 @@ class ArrayEntryInstruction(NetQASMInstruction):
         c_struct = encoding.ArrayEntryCommand(id=self.id, entry=self.entry.cstruct)
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            self.entry.address.address & encoding.INTEGER_MASK,
+            _pack_reg(self.entry.index),
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 1
@@ -741,6 +965,10 @@ class ArraySliceInstruction(NetQASMInstruction):
 
     slice: ArraySlice = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(
+        encoding.ArraySliceCommand
+    )
+
     @property
     def operands(self) -> List[Operand]:
         return [self.slice]
@@ -756,6 +984,17 @@ class ArraySliceInstruction(NetQASMInstruction):
         c_struct = encoding.ArraySliceCommand(id=self.id, slice=self.slice.cstruct)
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            self.slice.address.address & encoding.INTEGER_MASK,
+            _pack_reg(self.slice.start),
+            _pack_reg(self.slice.stop),
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 1
@@ -775,6 +1014,8 @@ class AddrInstruction(NetQASMInstruction):
 
     address: Address = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(encoding.AddrCommand)
+
     @property
     def operands(self) -> List[Operand]:
         return [self.address]
@@ -790,6 +1031,12 @@ class AddrInstruction(NetQASMInstruction):
         c_struct = encoding.AddrCommand(id=self.id, addr=self.address.cstruct)
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer, offset, self.id, self.address.address & encoding.INTEGER_MASK
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 1
@@ -813,6 +1060,8 @@ class Reg5Instruction(NetQASMInstruction):
     reg3: Register = None  # type: ignore
     reg4: Register = None  # type: ignore
 
+    _STRUCT: ClassVar[struct.Struct] = encoding.get_command_struct(encoding.Reg5Command)
+
     @property
     def operands(self) -> List[Operand]:
         return [self.reg0, self.reg1, self.reg2, self.reg3, self.reg4]
@@ -840,6 +1089,19 @@ class Reg5Instruction(NetQASMInstruction):
         )
         return bytes(c_struct)
 
+    def pack_into(self, buffer: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(
+            buffer,
+            offset,
+            self.id,
+            _pack_reg(self.reg0),
+            _pack_reg(self.reg1),
+            _pack_reg(self.reg2),
+            _pack_reg(self.reg3),
+            _pack_reg(self.reg4),
+        )
+        return self._STRUCT.size
+
     @classmethod
     def from_operands(cls, operands: List[Union[Operand, int]]):
         assert len(operands) == 5
@@ -3,8 +3,8 @@ from dataclasses import dataclass
 import numpy as np
 
 from netqasm.util.quantum_gates import (
-    get_controlled_rotation_matrix,
-    get_rotation_matrix,
+    get_controlled_rotation_matrix_from_fraction,
+    get_rotation_matrix_from_fraction,
 )
 
 from . import core
@@ -56,9 +56,10 @@ class RotXInstruction(core.RotationInstruction):
     mnemonic: str = "rot_x"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [1, 0, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (1, 0, 0)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -67,9 +68,10 @@ class RotYInstruction(core.RotationInstruction):
     mnemonic: str = "rot_y"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [0, 1, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (0, 1, 0)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -78,9 +80,10 @@ class RotZInstruction(core.RotationInstruction):
     mnemonic: str = "rot_z"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [0, 0, 1]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (0, 0, 1)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -89,14 +92,16 @@ class ControlledRotXInstruction(core.ControlledRotationInstruction):
     mnemonic: str = "crot_x"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [1, 0, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_controlled_rotation_matrix(axis, angle)
+        axis = (1, 0, 0)
+        return get_controlled_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
     def to_matrix_target_only(self) -> np.ndarray:
-        axis = [1, 0, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (1, 0, 0)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -105,11 +110,13 @@ class ControlledRotYInstruction(core.ControlledRotationInstruction):
     mnemonic: str = "crot_y"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [1, 0, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_controlled_rotation_matrix(axis, angle)
+        axis = (1, 0, 0)
+        return get_controlled_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
     def to_matrix_target_only(self) -> np.ndarray:
-        axis = [1, 0, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (1, 0, 0)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 import numpy as np
 
-from netqasm.util.quantum_gates import get_rotation_matrix
+from netqasm.util.quantum_gates import get_rotation_matrix_from_fraction
 
 from . import core
 
@@ -82,9 +82,10 @@ class RotXInstruction(core.RotationInstruction):
     mnemonic: str = "rot_x"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [1, 0, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (1, 0, 0)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -93,9 +94,10 @@ class RotYInstruction(core.RotationInstruction):
     mnemonic: str = "rot_y"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [0, 1, 0]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (0, 1, 0)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -104,9 +106,10 @@ class RotZInstruction(core.RotationInstruction):
     mnemonic: str = "rot_z"
 
     def to_matrix(self) -> np.ndarray:
-        axis = [0, 0, 1]
-        angle = self.angle_num.value * np.pi / 2**self.angle_denom.value
-        return get_rotation_matrix(axis, angle)
+        axis = (0, 0, 1)
+        return get_rotation_matrix_from_fraction(
+            axis, self.angle_num.value, self.angle_denom.value
+        )
 
 
 @dataclass
@@ -1,28 +1,67 @@
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, fields
+from typing import Dict, Tuple, Union
 
 from netqasm.lang import encoding
-from netqasm.lang.encoding import RegisterName
+from netqasm.lang.encoding import REG_INDEX_BITS, RegisterName
 from netqasm.lang.symbols import Symbols
 
+# Immediates with a value in this range are interned, i.e. constructing one returns
+# a shared instance
+_INTERNED_IMMEDIATES = range(-128, 256)
+
 
 class Operand:
-    pass
+    # Operands are created for every instruction, so they do not get a `__dict__`.
+    # Subclasses define the `__slots__` for their fields.
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Frozen operands with slots cannot be unpickled or copied by setting their
+        # attributes, so they are re-created from their fields instead.
+        # This also returns the interned instance, if any.
+        return type(self), tuple(getattr(self, f.name) for f in fields(self))
 
 
 @dataclass(eq=True, frozen=True)
 class Immediate(Operand):
+    __slots__ = ("value",)
+
     value: int
 
+    def __new__(cls, value: int):
+        # Only exact ints, since the interned instance is re-initialized with
+        # the given value
+        if cls is Immediate and type(value) is int and value in _INTERNED_IMMEDIATES:
+            return _IMMEDIATES[value - _INTERNED_IMMEDIATES.start]
+        return super().__new__(cls)
+
     def __str__(self):
         return str(self.value)
 
 
 @dataclass(eq=True, frozen=True)
 class Register(Operand):
+    """A register operand.
+
+    Since there are only `len(RegisterName) * 2**REG_INDEX_BITS` valid registers,
+    these are interned: constructing a valid register returns a shared instance,
+    such that registers can also be compared by identity.
+    """
+
+    __slots__ = ("name", "index")
+
     name: RegisterName
     index: int
 
+    def __new__(cls, name: RegisterName, index: int):
+        # Only exact ints, since the interned instance is re-initialized with
+        # the given arguments
+        if cls is Register and type(index) is int:
+            register = _REGISTERS.get((name, index))
+            if register is not None:
+                return register
+        return super().__new__(cls)
+
     def _assert_types(self):
         assert isinstance(self.name, RegisterName)
         assert isinstance(self.index, int)
@@ -43,9 +82,19 @@ class Register(Operand):
         reg_name = RegisterName(raw.register_name)
         return cls(name=reg_name, index=raw.register_index)
 
+    @classmethod
+    def from_str(cls, register: str) -> "Register":
+        """Get the interned register from its string representation, e.g. "R0".
+
+        :raises KeyError: if `register` is not a valid register
+        """
+        return _REGISTERS_BY_STR[register]
+
 
 @dataclass(eq=True, frozen=True)
 class Address(Operand):
+    __slots__ = ("address",)
+
     address: int
 
     def _assert_types(self):
@@ -69,6 +118,8 @@ class Address(Operand):
 
 @dataclass
 class ArrayEntry(Operand):
+    __slots__ = ("address", "index")
+
     address: Address
     index: Union[Register, int]  # Can ONLY be int when in a "ProtoSubroutine"
 
@@ -105,6 +156,8 @@ class ArrayEntry(Operand):
 
 @dataclass
 class ArraySlice(Operand):
+    __slots__ = ("address", "start", "stop")
+
     address: Address
     start: Union[Register, int]  # Can ONLY be int when in a "ProtoSubroutine"
     stop: Union[Register, int]  # Can ONLY be int when in a "ProtoSubroutine"
@@ -144,8 +197,13 @@ class ArraySlice(Operand):
 
 @dataclass(eq=True, frozen=True)
 class Label:
+    __slots__ = ("name",)
+
     name: str
 
+    def __reduce__(self):
+        return Label, (self.name,)
+
     def _assert_types(self):
         assert isinstance(self.name, str)
 
@@ -157,6 +215,8 @@ class Label:
 class Template(Operand):
     """An operand that does not have a concrete value (it can be filled in later)."""
 
+    __slots__ = ("name",)
+
     name: str
 
     def _assert_types(self):
@@ -164,3 +224,22 @@ class Template(Operand):
 
     def __str__(self):
         return self.name
+
+
+def _new_interned(cls, *args):
+    operand = object.__new__(cls)
+    operand.__init__(*args)
+    return operand
+
+
+_IMMEDIATES = tuple(_new_interned(Immediate, value) for value in _INTERNED_IMMEDIATES)
+
+_REGISTERS: Dict[Tuple[RegisterName, int], Register] = {
+    (name, index): _new_interned(Register, name, index)
+    for name in RegisterName
+    for index in range(2**REG_INDEX_BITS)
+}
+
+_REGISTERS_BY_STR: Dict[str, Register] = {
+    str(register): register for register in _REGISTERS.values()
+}
@@ -1,5 +1,7 @@
 import ctypes
-from typing import Optional
+from typing import List, Optional, Union
+
+import numpy as np
 
 from netqasm.lang import encoding
 from netqasm.lang.instr import Flavour, NetQASMInstruction, VanillaFlavour
@@ -7,6 +9,17 @@ from netqasm.lang.subroutine import Subroutine
 
 INSTR_ID = ctypes.c_uint8
 
+# Layout of a single encoded command, used to read the ID column of a whole
+# subroutine at once.
+COMMAND_DTYPE = np.dtype(
+    [
+        ("id", np.uint8),
+        ("operands", np.uint8, (encoding.COMMAND_BYTES - 1,)),
+    ]
+)
+
+T_Buffer = Union[bytes, bytearray, memoryview]
+
 
 class Deserializer:
     """
@@ -16,29 +29,27 @@ class Deserializer:
     (This is in contrast with the parsing.text module, which first converts the input
     to a :class:`~.ProtoSubroutine`, consisting of :class:`~.subroutine.ICmd` s, before transforming it into
     a :class:`~.Subroutine` containing :class:`~.NetQASMInstruction` s.)
+
+    The raw data is accessed through a `memoryview`, so commands are decoded
+    directly from the input buffer without slicing it into intermediate `bytes`
+    objects.
     """
 
     def __init__(self, flavour: Flavour):
         self.flavour = flavour
 
-    def _parse_metadata(self, raw):
-        metadata = raw[: encoding.METADATA_BYTES]
-        metadata = encoding.Metadata.from_buffer_copy(metadata)
-        data = raw[encoding.METADATA_BYTES :]
+    def _parse_metadata(self, raw: T_Buffer):
+        view = memoryview(raw)
+        metadata = encoding.Metadata.from_buffer_copy(view[: encoding.METADATA_BYTES])
+        data = view[encoding.METADATA_BYTES :]
         return metadata, data
 
-    def deserialize_subroutine(self, raw: bytes) -> Subroutine:
-        metadata, raw = self._parse_metadata(raw)
-        if (len(raw) % encoding.COMMAND_BYTES) != 0:
+    def deserialize_subroutine(self, raw: T_Buffer) -> Subroutine:
+        metadata, data = self._parse_metadata(raw)
+        if (len(data) % encoding.COMMAND_BYTES) != 0:
             raise ValueError("Length of data not a multiple of command length")
-        num_commands = int(len(raw) / encoding.COMMAND_BYTES)
 
-        instructions = [
-            self.deserialize_command(
-                raw[i * encoding.COMMAND_BYTES : (i + 1) * encoding.COMMAND_BYTES]
-            )
-            for i in range(num_commands)
-        ]
+        instructions = self.deserialize_commands(data)
 
         return Subroutine(
             netqasm_version=tuple(metadata.netqasm_version),  # type: ignore
@@ -46,7 +57,24 @@ class Deserializer:
             instructions=instructions,
         )
 
-    def deserialize_command(self, raw: bytes) -> NetQASMInstruction:
+    def deserialize_commands(self, data: memoryview) -> List[NetQASMInstruction]:
+        """Deserialize a contiguous block of encoded commands.
+
+        The instruction IDs of all commands are read in a single pass, after which
+        each instruction is created from its (zero-copy) slice of `data`.
+        """
+        ids = np.frombuffer(data, dtype=COMMAND_DTYPE)["id"].tolist()
+
+        # Resolve each distinct ID to its instruction class only once
+        id_map = {id: self.flavour.get_instr_by_id(id) for id in set(ids)}
+
+        size = encoding.COMMAND_BYTES
+        return [
+            id_map[id].deserialize_from(data[i * size : (i + 1) * size])
+            for i, id in enumerate(ids)
+        ]
+
+    def deserialize_command(self, raw: T_Buffer) -> NetQASMInstruction:
         # peek next byte to check instruction type
         id = INSTR_ID.from_buffer_copy(raw[:1]).value
 
@@ -56,7 +84,7 @@ class Deserializer:
         return instr
 
 
-def deserialize(data: bytes, flavour: Optional[Flavour] = None) -> Subroutine:
+def deserialize(data: T_Buffer, flavour: Optional[Flavour] = None) -> Subroutine:
     """
     Convert a binary encoding into a Subroutine object.
     The Vanilla flavour is used by default.
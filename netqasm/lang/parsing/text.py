@@ -1,3 +1,4 @@
+import re
 from collections import defaultdict
 from itertools import count
 from typing import Dict, List, Optional, Set, Tuple, Union
@@ -122,17 +123,7 @@ def _create_subroutine(
                 )
             commands.append(BranchLabel(branch_label))
         else:
-            words: List[str] = group_by_word(line, brackets=Symbols.ARGS_BRACKETS)
-            instr_name, args = _split_instr_and_args(words[0])
-            instr = string_to_instruction(instr_name)
-            args = _parse_args(args)
-            operands = _parse_operands(words[1:])
-            command = ICmd(
-                instruction=instr,
-                args=args,
-                operands=operands,
-            )
-            commands.append(command)
+            commands.append(_parse_command(line))
 
     if Symbols.PREAMBLE_NETQASM in preamble_data:
         netqasm_version = _parse_netqasm_version(
@@ -154,6 +145,28 @@ def _create_subroutine(
     )
 
 
+def _parse_command(line: str) -> ICmd:
+    """Parse a body line (which is not a branch label) into an `ICmd`.
+
+    The line is tokenized using the precompiled regexes below, which cover the
+    common forms of instructions and operands. Anything else is handled by the
+    general (slower) parsing functions, which also raise the appropriate errors.
+    """
+    match = _INSTR_RE.match(line)
+    if match is None:
+        words: List[str] = group_by_word(line, brackets=Symbols.ARGS_BRACKETS)
+        instr_name, args = _split_instr_and_args(words[0])
+        operand_words = words[1:]
+    else:
+        instr_name, args = match.group(1, 2)
+        operand_words = line[match.end() :].split()
+    return ICmd(
+        instruction=string_to_instruction(instr_name),
+        args=_parse_args(args) if args else [],
+        operands=[_parse_operand_token(word) for word in operand_words],
+    )
+
+
 def _parse_netqasm_version(netqasm_version):
     try:
         major, minor = netqasm_version.strip().split(".")
@@ -194,6 +207,37 @@ def _parse_operands(words: List[str]):
     return operands
 
 
+def _parse_operand_token(word: str):
+    match = _OPERAND_RE.fullmatch(word)
+    if match is None:
+        return _parse_operand(word)
+    kind = match.lastgroup
+    if kind == "imm":
+        return int(word)
+    if kind == "reg":
+        return parse_register(word)
+    if kind == "label":
+        return Label(word)
+    if kind == "template":
+        return Template(match.group("template_name").strip())
+    address = Address(int(match.group("base")))
+    start = match.group("start")
+    if start is None:
+        return address
+    stop = match.group("stop")
+    if stop is None:
+        return ArrayEntry(address, _parse_index_token(start))
+    return ArraySlice(
+        address, start=_parse_index_token(start), stop=_parse_index_token(stop)
+    )
+
+
+def _parse_index_token(token: str) -> Union[int, Register]:
+    if token[0] not in _REGISTER_NAMES:
+        return int(token)
+    return parse_register(token)
+
+
 def _parse_operand(word: str):
     if word.startswith(Symbols.ADDRESS_START):
         return parse_address(word)
@@ -256,8 +300,29 @@ def _parse_template(template: str) -> Template:
 
 _REGISTER_NAMES = {reg.name: reg for reg in RegisterName}
 
+_INT_PATTERN = r"-?[0-9]+"
+_REGISTER_PATTERN = rf"[{''.join(_REGISTER_NAMES)}]{_INT_PATTERN}"
+_INDEX_PATTERN = rf"{_INT_PATTERN}|{_REGISTER_PATTERN}"
+
+# Instruction name, optionally directly followed by arguments, e.g. `array(10)`
+_INSTR_RE = re.compile(r"([^\s()]+)(\([^()]*\))?(?:\s+|$)")
+
+# Operands, the name of the outermost matching group gives the kind of operand
+_OPERAND_RE = re.compile(
+    rf"(?P<imm>{_INT_PATTERN})"
+    rf"|(?P<reg>{_REGISTER_PATTERN})"
+    r"|(?P<label>[A-Za-z][A-Za-z0-9_]*)"
+    r"|(?P<template>\{(?P<template_name>[^{}]*)\})"
+    rf"|(?P<address>{Symbols.ADDRESS_START}(?P<base>{_INT_PATTERN})"
+    rf"(?:\[(?P<start>{_INDEX_PATTERN})(?:{Symbols.SLICE_DELIM}(?P<stop>{_INDEX_PATTERN}))?\])?)"
+)
+
 
 def parse_register(register: str) -> Register:
+    try:
+        return Register.from_str(register)
+    except KeyError:
+        pass
     try:
         register_name = _REGISTER_NAMES[register[0]]
     except KeyError:
@@ -454,23 +519,19 @@ def _assert_single_preamble_arg(list_of_operands, instr):
 
 def _assign_branch_labels(subroutine):
     """Finds assigns the branch labels in a subroutine (inplace)"""
-    branch_labels = {}
-    command_number = 0
-    commands = subroutine.commands
-    while command_number < len(commands):
-        command = commands[command_number]
+    branch_labels: Dict[str, int] = {}
+    commands = []
+    for command in subroutine.commands:
         if not isinstance(command, BranchLabel):
-            command_number += 1
+            commands.append(command)
             continue
         branch_label = command.name
         if branch_label in branch_labels:
             raise NetQASMSyntaxError(
                 f"branch labels need to be unique, name {branch_label} already used"
             )
-        # Assign the label to the line/command number
-        branch_labels[branch_label] = command_number
-        # Remove the line
-        commands = commands[:command_number] + commands[command_number + 1 :]
+        # Assign the label to the command number of the next command
+        branch_labels[branch_label] = len(commands)
     subroutine.commands = commands
     _update_labels(subroutine, branch_labels)
 
@@ -490,9 +551,7 @@ def _update_labels_in_command(command, variables: Dict[str, int]):
 
 def _update_labels_in_operand(operand, labels: Dict[str, int]):
     if isinstance(operand, Label):
-        for label, value in labels.items():
-            if operand.name == label:
-                return value
+        return labels.get(operand.name, operand)
     return operand
 
 
@@ -510,7 +569,7 @@ def _make_args_operands(subroutine):
         command.args = []
 
 
-_REPLACE_CONSTANTS_EXCEPTION = [
+_REPLACE_CONSTANTS_EXCEPTION = {
     (GenericInstr.SET, 1),
     (GenericInstr.JMP, 0),
     (GenericInstr.BEZ, 1),
@@ -521,11 +580,11 @@ _REPLACE_CONSTANTS_EXCEPTION = [
     (GenericInstr.BGE, 2),
     (GenericInstr.BREAKPOINT, 0),
     (GenericInstr.BREAKPOINT, 1),
-]
+}
 
 for instr in [GenericInstr.ROT_X, GenericInstr.ROT_Y, GenericInstr.ROT_Z]:
     for index in [1, 2]:
-        _REPLACE_CONSTANTS_EXCEPTION.append((instr, index))
+        _REPLACE_CONSTANTS_EXCEPTION.add((instr, index))
 
 for instr in [
     GenericInstr.CROT_X,
@@ -533,22 +592,29 @@ for instr in [
     GenericInstr.CROT_Z,
 ]:
     for index in [2, 3]:
-        _REPLACE_CONSTANTS_EXCEPTION.append((instr, index))
+        _REPLACE_CONSTANTS_EXCEPTION.add((instr, index))
 
 for index in [2, 3, 4, 5]:
-    _REPLACE_CONSTANTS_EXCEPTION.append((GenericInstr.MEAS_BASIS, index))
+    _REPLACE_CONSTANTS_EXCEPTION.add((GenericInstr.MEAS_BASIS, index))
 
 
 def _replace_constants(commands: List[Union[ICmd, BranchLabel]]):
+    """Replaces constant operands by registers, set by inserted `set` commands.
+
+    Returns the new list of commands. The temporary registers are the registers
+    not used anywhere in the commands, taken in order for each command.
+    """
     current_registers = get_current_registers(commands)
+    free_registers = [
+        register
+        for register in (Register(RegisterName.R, i) for i in range(2**REG_INDEX_BITS))
+        if str(register) not in current_registers
+    ]
 
     def reg_and_set_cmd(value, tmp_registers: List[Register], lineno=None):
-        for i in range(2**REG_INDEX_BITS):
-            register = Register(RegisterName.R, i)
-            if str(register) not in current_registers and register not in tmp_registers:
-                break
-        else:
+        if len(tmp_registers) >= len(free_registers):
             raise RuntimeError("Could not replace constant since no registers left")
+        register = free_registers[len(tmp_registers)]
         set_command = ICmd(
             instruction=GenericInstr.SET,
             args=[],
@@ -559,11 +625,10 @@ def _replace_constants(commands: List[Union[ICmd, BranchLabel]]):
 
         return register, set_command
 
-    i = 0
-    while i < len(commands):
-        command = commands[i]
+    new_commands: List[Union[ICmd, BranchLabel]] = []
+    for command in commands:
         if not isinstance(command, ICmd):
-            i += 1
+            new_commands.append(command)
             continue
         tmp_registers: List[Register] = []
         for j, operand in enumerate(command.operands):
@@ -574,10 +639,8 @@ def _replace_constants(commands: List[Union[ICmd, BranchLabel]]):
                 register, set_command = reg_and_set_cmd(
                     operand, tmp_registers, lineno=command.lineno
                 )
-                commands.insert(i, set_command)
+                new_commands.append(set_command)
                 command.operands[j] = register
-
-                i += 1
             else:
                 if isinstance(operand, ArrayEntry):
                     attrs = ["index"]
@@ -591,12 +654,10 @@ def _replace_constants(commands: List[Union[ICmd, BranchLabel]]):
                         register, set_command = reg_and_set_cmd(
                             value, tmp_registers, lineno=command.lineno
                         )
-                        commands.insert(i, set_command)
+                        new_commands.append(set_command)
                         setattr(operand, attr, register)
-
-                        i += 1
-        i += 1
-    return commands
+        new_commands.append(command)
+    return new_commands
 
 
 def get_current_registers(commands: List[T_Cmd]) -> Set[str]:
@@ -2,12 +2,13 @@
 NetQASM subroutine definitions.
 
 This module contains the `Subroutine` class which represents a static (not being
-executed) NetQASM subroutine.
+executed) NetQASM subroutine, and the `CompiledTemplate` class which represents a
+subroutine with arguments compiled to its binary encoding.
 """
 
-
 from __future__ import annotations
 
+import sys
 from typing import Dict, List, Optional, Tuple, Union
 
 from netqasm.lang import encoding
@@ -42,6 +43,8 @@ class Subroutine:
         self._app_id: Optional[int] = app_id
 
         self._instructions: List[NetQASMInstruction] = []
+        # Indices of the instructions that have `Template` operands
+        self._template_indices: List[int] = []
         if instructions is not None:
             self.instructions = instructions
 
@@ -49,9 +52,9 @@ class Subroutine:
         if arguments is not None:
             self._arguments = arguments
         else:
-            # figure out argument by inspecting all commands
-            for instr in self.instructions:
-                for op in instr.operands:
+            # figure out argument by inspecting all commands containing templates
+            for index in self._template_indices:
+                for op in self.instructions[index].operands:
                     if isinstance(op, Template):
                         self._arguments.append(op.name)
 
@@ -74,16 +77,49 @@ class Subroutine:
     @instructions.setter
     def instructions(self, new_instructions: List[NetQASMInstruction]) -> None:
         self._instructions = new_instructions
+        self._template_indices = [
+            index
+            for index, instr in enumerate(new_instructions)
+            if any(isinstance(op, Template) for op in instr.operands)
+        ]
 
     @property
     def arguments(self) -> List[str]:
         return self._arguments
 
+    def _with_app_id(self, app_id: Optional[int]) -> Subroutine:
+        """Get a shallow copy of this subroutine with a different app ID.
+
+        The copy has its own list of instructions (sharing the instruction objects)
+        and reuses the template indices of this subroutine without rescanning the
+        operands.
+        """
+        copy = Subroutine(
+            arguments=list(self._arguments),
+            netqasm_version=self._netqasm_version,
+            app_id=app_id,
+        )
+        copy._instructions = list(self._instructions)
+        copy._template_indices = list(self._template_indices)
+        return copy
+
     def instantiate(
         self, app_id: int, arguments: Optional[Dict[str, int]] = None
     ) -> None:
-        instrs: List[NetQASMInstruction] = []
-        for instr in self.instructions:
+        """Set the app ID and give concrete values to the arguments (inplace).
+
+        Only the instructions containing templates are replaced, using the
+        indices found when the `instructions` property was set. So, when
+        modifying the list of instructions in place, set the property again.
+        The replaced instructions are put in a new list, so lists obtained before
+        from the `instructions` property are not changed.
+
+        :param app_id: app ID of the subroutine
+        :param arguments: values of the arguments, by name
+        """
+        instrs = list(self._instructions)
+        for index in self._template_indices:
+            instr = instrs[index]
             ops: List[Union[Operand, int]] = []
             for op in instr.operands:
                 if isinstance(op, Template):
@@ -91,9 +127,12 @@ class Subroutine:
                     ops.append(arguments[op.name])
                 else:
                     ops.append(op)
-            instrs.append(instr.from_operands(ops))
+            new_instr = instr.from_operands(ops)
+            new_instr.lineno = instr.lineno
+            instrs[index] = new_instr
 
-        self.instructions = instrs
+        self._instructions = instrs
+        self._template_indices = []
         self._app_id = app_id
 
     def __str__(self):
@@ -126,4 +165,140 @@ class Subroutine:
         return [metadata] + [instr.serialize() for instr in self.instructions]
 
     def __bytes__(self):
-        return b"".join(bytes(cstruct) for cstruct in self.cstructs)
+        assert self.app_id is not None
+
+        metadata = encoding.Metadata(
+            netqasm_version=self.netqasm_version,
+            app_id=self.app_id,
+        )
+        buffer = bytearray(
+            encoding.METADATA_BYTES + len(self.instructions) * encoding.COMMAND_BYTES
+        )
+        buffer[: encoding.METADATA_BYTES] = bytes(metadata)
+        offset = encoding.METADATA_BYTES
+        for instr in self.instructions:
+            offset += instr.pack_into(buffer, offset)
+        # Instructions like `DebugInstruction` do not take up any bytes
+        del buffer[offset:]
+        return bytes(buffer)
+
+
+class CompiledTemplate:
+    """
+    A `CompiledTemplate` is a subroutine with arguments that is compiled to its
+    binary encoding, such that it can be efficiently instantiated many times with
+    different values for its arguments.
+
+    The encoding of the subroutine is computed once, together with the locations
+    (byte offsets and sizes) of the values of the arguments (the *slots*) in it.
+    Instantiating the template copies the encoding and writes the app ID and the
+    argument values into the slots. This gives the same bytes as instantiating
+    the `Subroutine` and then serializing it.
+    """
+
+    # Location of the app ID in the encoded subroutine
+    _APP_ID_OFFSET: int = encoding.Metadata.app_id.offset
+    _APP_ID_SIZE: int = encoding.Metadata.app_id.size
+
+    def __init__(self, subroutine: Subroutine) -> None:
+        """CompiledTemplate constructor.
+
+        The subroutine itself is not changed.
+
+        :param subroutine: subroutine to compile, which can contain `Template`
+            operands
+        """
+        self._netqasm_version: Tuple[int, int] = subroutine.netqasm_version
+        self._arguments: List[str] = list(subroutine.arguments)
+
+        metadata = encoding.Metadata(netqasm_version=self._netqasm_version, app_id=0)
+        data = bytearray(bytes(metadata))
+        # Offset and size of each slot, per argument name
+        self._slots: Dict[str, List[Tuple[int, int]]] = {}
+        for instr in subroutine.instructions:
+            raw, slots = self._compile_instruction(instr)
+            for name, offset, size in slots:
+                self._slots.setdefault(name, []).append((len(data) + offset, size))
+            data += raw
+        self._data: bytes = bytes(data)
+
+    @property
+    def netqasm_version(self) -> Tuple[int, int]:
+        return self._netqasm_version
+
+    @property
+    def arguments(self) -> List[str]:
+        return self._arguments
+
+    @property
+    def slots(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Offsets and sizes (in bytes) of the slots of each argument."""
+        return self._slots
+
+    @staticmethod
+    def _compile_instruction(
+        instr: NetQASMInstruction,
+    ) -> Tuple[bytes, List[Tuple[str, int, int]]]:
+        """Serialize an instruction, and find the slots of its `Template` operands.
+
+        The slot of an operand is found by serializing the instruction with two
+        values for it that differ in all bits and comparing the results.
+        Returns the serialized instruction (with 0 for all templates) and the
+        argument name, offset and size of each slot.
+        """
+        operands: List[Union[Operand, int]] = list(instr.operands)
+        positions = [i for i, op in enumerate(operands) if isinstance(op, Template)]
+        if len(positions) == 0:
+            return instr.serialize(), []
+
+        def serialize_with(probe_position: Optional[int] = None) -> bytes:
+            ops = list(operands)
+            for position in positions:
+                ops[position] = -1 if position == probe_position else 0
+            return instr.from_operands(ops).serialize()
+
+        raw = serialize_with()
+        slots = []
+        for position in positions:
+            probe = serialize_with(position)
+            changed = [i for i, (a, b) in enumerate(zip(raw, probe)) if a != b]
+            if len(changed) == 0:
+                raise ValueError(
+                    f"Could not find the encoding of the template in {instr}"
+                )
+            template = operands[position]
+            assert isinstance(template, Template)
+            slots.append((template.name, changed[0], changed[-1] - changed[0] + 1))
+        return raw, slots
+
+    def instantiate(
+        self, app_id: int, arguments: Optional[Dict[str, int]] = None
+    ) -> bytes:
+        """Get the encoded subroutine for an app ID and concrete argument values.
+
+        As for the encoding of a `Subroutine`, values that do not fit in their slot
+        are truncated.
+
+        :param app_id: app ID of the subroutine
+        :param arguments: values of the arguments, by name
+        :return: the encoded subroutine
+        """
+        data = bytearray(self._data)
+        self._write(data, self._APP_ID_OFFSET, self._APP_ID_SIZE, app_id)
+        for name, slots in self._slots.items():
+            assert arguments is not None
+            value = arguments[name]
+            for offset, size in slots:
+                self._write(data, offset, size, value)
+        return bytes(data)
+
+    @staticmethod
+    def _write(data: bytearray, offset: int, size: int, value: int) -> None:
+        mask = (1 << (8 * size)) - 1
+        data[offset : offset + size] = (value & mask).to_bytes(size, sys.byteorder)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __str__(self):
+        return f"CompiledTemplate({','.join(self._arguments)}) of {len(self)} bytes"
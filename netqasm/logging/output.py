@@ -1,9 +1,28 @@
 import abc
+import atexit
+import json
 import os
 from dataclasses import asdict
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Set, Tuple
+from queue import Queue
+from threading import Thread
+from time import time
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 from netqasm.lang import instr as instructions
 from netqasm.lang.encoding import RegisterName
@@ -22,15 +41,120 @@ from netqasm.util.error import NotAllocatedError
 from netqasm.util.log import LineTracker
 from netqasm.util.yaml import dump_yaml
 
+if TYPE_CHECKING:
+    from netqasm.sdk.config import LogConfig
+
+# Instructions that are never logged by an `InstrLogger`
+_IGNORED_INSTRS = (
+    instructions.core.SetInstruction,
+    instructions.core.QAllocInstruction,
+    instructions.core.QFreeInstruction,
+    instructions.core.CreateEPRInstruction,
+    instructions.core.RecvEPRInstruction,
+)
+
+# Instructions acting on qubits
+_QUANTUM_INSTRS = (
+    instructions.core.SingleQubitInstruction,
+    instructions.core.TwoQubitInstruction,
+    instructions.core.RotationInstruction,
+    instructions.core.ControlledRotationInstruction,
+    instructions.core.InitInstruction,
+    instructions.core.MeasInstruction,
+    instructions.core.MeasBasisInstruction,
+    instructions.core.QAllocInstruction,
+    instructions.core.QFreeInstruction,
+    instructions.core.CreateEPRInstruction,
+    instructions.core.RecvEPRInstruction,
+)
+
+# Instructions that add or remove qubits tracked by an `InstrLogger`
+_ADD_QUBIT_INSTRS = (
+    instructions.core.InitInstruction,
+    instructions.core.CreateEPRInstruction,
+    instructions.core.RecvEPRInstruction,
+)
+_REMOVE_QUBIT_INSTRS = (
+    instructions.core.QFreeInstruction,
+    instructions.core.MeasInstruction,
+)
+
 
 def should_ignore_instr(instr):
-    return (
-        isinstance(instr, instructions.core.SetInstruction)
-        or isinstance(instr, instructions.core.QAllocInstruction)
-        or isinstance(instr, instructions.core.QFreeInstruction)
-        or isinstance(instr, instructions.core.CreateEPRInstruction)
-        or isinstance(instr, instructions.core.RecvEPRInstruction)
-    )
+    return isinstance(instr, _IGNORED_INSTRS)
+
+
+class InstrLogFilter:
+    """Filter deciding which executed instructions are logged by an `InstrLogger`.
+
+    The parts of the decision that only depend on the class of an instruction are
+    computed once per class.
+    """
+
+    def __init__(
+        self,
+        subroutine_interval: int = 1,
+        quantum_only: bool = False,
+        app_ids: Optional[Iterable[int]] = None,
+        mnemonics: Optional[Iterable[str]] = None,
+    ):
+        """InstrLogFilter constructor.
+
+        :param subroutine_interval: only log instructions of every Nth subroutine
+            (those with an ID divisible by N)
+        :param quantum_only: only log quantum instructions. Otherwise, classical
+            instructions are also logged if they have qubit (Q) registers as operands
+        :param app_ids: only log instructions of these applications, all if None
+        :param mnemonics: only log instructions with these mnemonics, all if None
+        """
+        if subroutine_interval < 1:
+            raise ValueError(
+                f"subroutine_interval should be positive, not {subroutine_interval}"
+            )
+        self._subroutine_interval: int = subroutine_interval
+        self._quantum_only: bool = quantum_only
+        self._app_ids: Optional[FrozenSet[int]] = (
+            None if app_ids is None else frozenset(app_ids)
+        )
+        self._mnemonics: Optional[FrozenSet[str]] = (
+            None if mnemonics is None else frozenset(mnemonics)
+        )
+        self._instr_classes: Dict[Type[instructions.NetQASMInstruction], bool] = {}
+
+    @classmethod
+    def from_log_config(cls, log_config: "LogConfig") -> "InstrLogFilter":
+        return cls(
+            subroutine_interval=log_config.instr_log_subroutine_interval,
+            quantum_only=log_config.instr_log_quantum_only,
+            app_ids=log_config.instr_log_app_ids,
+            mnemonics=log_config.instr_log_mnemonics,
+        )
+
+    def should_log(
+        self, app_id: int, subroutine_id: int, instr: instructions.NetQASMInstruction
+    ) -> bool:
+        """Whether to log the given instruction."""
+        instr_cls = type(instr)
+        log_instr_cls = self._instr_classes.get(instr_cls)
+        if log_instr_cls is None:
+            log_instr_cls = self._should_log_instr_class(instr_cls)
+            self._instr_classes[instr_cls] = log_instr_cls
+        if not log_instr_cls:
+            return False
+        if self._app_ids is not None and app_id not in self._app_ids:
+            return False
+        return subroutine_id % self._subroutine_interval == 0
+
+    def _should_log_instr_class(
+        self, instr_cls: Type[instructions.NetQASMInstruction]
+    ) -> bool:
+        if issubclass(instr_cls, _IGNORED_INSTRS):
+            return False
+        if self._quantum_only and not issubclass(instr_cls, _QUANTUM_INSTRS):
+            return False
+        if self._mnemonics is not None and instr_cls.mnemonic not in self._mnemonics:
+            return False
+        return True
 
 
 # Keep track of all structured loggers
@@ -40,32 +164,217 @@ _STRUCT_LOGGERS: List["StructuredLogger"] = []
 
 def reset_struct_loggers():
     while len(_STRUCT_LOGGERS) > 0:
-        _STRUCT_LOGGERS.pop()
+        struct_logger = _STRUCT_LOGGERS.pop()
+        if struct_logger.streaming:
+            # Write the entries streamed so far and stop the writer thread
+            struct_logger.close()
 
 
 def save_all_struct_loggers():
     while len(_STRUCT_LOGGERS) > 0:
         struct_logger = _STRUCT_LOGGERS.pop()
-        struct_logger.save()
+        if struct_logger.streaming:
+            # Streaming loggers are finished, so also stop their writer
+            struct_logger.close()
+        else:
+            struct_logger.save()
+
+
+@atexit.register
+def _close_streaming_struct_loggers():
+    """Write the buffered entries of streaming loggers that were not closed
+    when the process exits."""
+    for struct_logger in list(_STRUCT_LOGGERS):
+        if struct_logger.streaming:
+            struct_logger.close()
+
+
+class StreamFormat(Enum):
+    """File formats for streaming log entries (see `StructuredLogger`).
+
+    The value of each format is the extension used for the log file.
+    """
+
+    # One JSON object per line
+    JSONL = "jsonl"
+
+
+# Default maximum number of entries waiting to be written by a streaming logger
+DEFAULT_STREAM_BUFFER_SIZE = 1024
+
+
+class _StreamWriter:
+    """Writes log entries to a file from a background thread.
+
+    At most `buffer_size` entries wait to be written, `write` blocks when
+    the buffer is full. Entries are passed through `materialize` (in the
+    background thread) before being written.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        stream_format: StreamFormat,
+        buffer_size: int,
+        materialize: Callable[[Any], Dict[str, Any]],
+    ):
+        self._stream_format: StreamFormat = stream_format
+        self._materialize: Callable[[Any], Dict[str, Any]] = materialize
+        self._file: IO = open(filepath, "w")
+        self._queue: Queue = Queue(maxsize=buffer_size)
+        self._error: Optional[Exception] = None
+        self._thread: Thread = Thread(
+            target=self._run, name=f"{self.__class__.__name__}({filepath})", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, entry: Any) -> None:
+        self._queue.put(entry)
+
+    def flush(self) -> None:
+        """Wait until all entries are written and flushed to the file."""
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("Failed to write log entries") from self._error
+
+    def close(self) -> None:
+        """Write all entries, stop the writer thread and close the file."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise RuntimeError("Failed to write log entries") from self._error
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            try:
+                if entry is None:
+                    self._file.flush()
+                    return
+                if self._error is None:
+                    self._write_entry(self._materialize(entry))
+                    if self._queue.empty():
+                        self._file.flush()
+            except Exception as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _write_entry(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, default=str))
+        self._file.write("\n")
+
+
+def load_streamed_log(filepath: str) -> List[Dict[str, Any]]:
+    """Load the entries of a log file written by a streaming `StructuredLogger`.
+
+    :param filepath: path to a `.jsonl` log file
+    :return: list of log entries
+    """
+    if not filepath.endswith(f".{StreamFormat.JSONL.value}"):
+        raise ValueError(f"Not a streamed log file: {filepath}")
+    with open(filepath, "r") as f:
+        return [json.loads(line) for line in f]
 
 
 class StructuredLogger(abc.ABC):
-    def __init__(self, filepath):
-        self._filepath = filepath
+    """Base class for loggers that write structured entries to a file.
+
+    By default entries are kept in memory and written to a YAML file on `save`.
+    If a `stream_format` is used, entries are instead written incrementally
+    by a background thread, while logging continues. In that case a `.yaml`
+    extension of the file path is replaced by the extension of the format.
+    Streaming loggers should be closed when done; loggers that are still open are
+    closed by `save_all_struct_loggers` or when the process exits.
+    """
+
+    # Format to stream entries with, None to keep them in memory until `save`.
+    # May be different for subclasses, or overridden per logger in the constructor.
+    stream_format: Optional[StreamFormat] = None
+
+    # Maximum number of entries waiting to be written when streaming
+    stream_buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE
+
+    def __init__(
+        self,
+        filepath,
+        stream_format: Optional[StreamFormat] = None,
+        stream_buffer_size: Optional[int] = None,
+    ):
+        """StructuredLogger constructor.
+
+        :param filepath: path of the log file
+        :param stream_format: format to stream entries with, defaults to the class
+            attribute `stream_format`
+        :param stream_buffer_size: maximum number of entries waiting to be written,
+            defaults to the class attribute `stream_buffer_size`
+        """
+        if stream_format is None:
+            stream_format = self.stream_format
+        if stream_buffer_size is None:
+            stream_buffer_size = self.stream_buffer_size
 
         self._storage = []
 
+        self._writer: Optional[_StreamWriter] = None
+        self._streaming: bool = stream_format is not None
+        self._closed: bool = False
+        if stream_format is None:
+            self._filepath = filepath
+        else:
+            root, ext = os.path.splitext(filepath)
+            if ext == ".yaml":
+                filepath = f"{root}.{stream_format.value}"
+            self._filepath = filepath
+            self._writer = _StreamWriter(
+                filepath=filepath,
+                stream_format=stream_format,
+                buffer_size=stream_buffer_size,
+                materialize=self._materialize_entry,
+            )
+
         _STRUCT_LOGGERS.append(self)
 
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    @property
+    def streaming(self) -> bool:
+        """Whether entries are streamed to the log file instead of kept in memory."""
+        return self._streaming
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
     def log(self, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError(f"Cannot log to closed logger of {self._filepath}")
         entry = self._construct_entry(*args, **kwargs)
         if entry is not None:
-            self._storage.append(entry)
+            if self._writer is None:
+                self._storage.append(entry)
+            else:
+                self._writer.write(entry)
 
     @abc.abstractmethod
     def _construct_entry(self, *args, **kwargs):
         pass
 
+    def _materialize_entry(self, entry) -> Dict[str, Any]:
+        """Convert a stored entry to the logged dictionary.
+
+        Subclasses can store a cheaper representation of an entry when logging,
+        which is then converted only when the log is saved or read.
+        """
+        return entry
+
+    def get_entries(self) -> List[Dict[str, Any]]:
+        """Get the entries logged so far (that are kept in memory)."""
+        return [self._materialize_entry(entry) for entry in self._storage]
+
     def _get_op_values(self, subroutine_id, operands):
         values = []
         for operand in operands:
@@ -88,32 +397,113 @@ class StructuredLogger(abc.ABC):
         return value
 
     def save(self):
-        dump_yaml(self._storage, self._filepath)
+        if not self._streaming:
+            dump_yaml(self.get_entries(), self._filepath)
+        elif self._writer is not None:
+            self._writer.flush()
+        # A closed streaming logger has already written all its entries
+
+    def close(self) -> None:
+        """Save the log and stop the background writer, if streaming.
+
+        No entries can be logged after closing. The logger is also removed from
+        the loggers saved by `save_all_struct_loggers`.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is None:
+            self.save()
+        else:
+            writer, self._writer = self._writer, None
+            writer.close()
+        if self in _STRUCT_LOGGERS:
+            _STRUCT_LOGGERS.remove(self)
+
+
+class _InstrRecord(NamedTuple):
+    """Raw values of an instruction log entry, see `InstrLogger`."""
+
+    wall_time: float
+    sim_time: Any
+    app_id: int
+    subroutine_id: int
+    program_counter: int
+    command: instructions.base.NetQASMInstruction
+    op_values: List[Any]
+    virtual_qubit_ids: List[int]
+    physical_qubit_ids: List[Optional[int]]
+    output: Any
 
 
 class InstrLogger(StructuredLogger):
+    """Logger for executed (quantum) instructions.
+
+    In deferred mode only the raw values of an instruction (such as the values of
+    its operands and the simulated time) are recorded when logging. The human-readable
+    fields of the entry are constructed only when the log is saved or read.
+    The qubit groups (`QGR`) are a snapshot of the simulation at the time of logging
+    and are therefore not included in deferred entries.
+    """
 
     # Absulute IDs of all qubits in the simulation
     # List of (node_name, subroutine_id, qubit_id)
     _qubits: Set[Tuple[str, int, int]] = set()
 
-    def __init__(self, filepath: str, executor):
-        super().__init__(filepath)
+    # Whether to defer constructing entries, may be overridden in the constructor.
+    deferred: bool = False
+
+    def __init__(
+        self,
+        filepath: str,
+        executor,
+        stream_format: Optional[StreamFormat] = None,
+        stream_buffer_size: Optional[int] = None,
+        deferred: Optional[bool] = None,
+        log_filter: Optional[InstrLogFilter] = None,
+    ):
+        if deferred is not None:
+            self.deferred = deferred
+        super().__init__(
+            filepath,
+            stream_format=stream_format,
+            stream_buffer_size=stream_buffer_size,
+        )
         self._executor = executor
+        if log_filter is None:
+            log_filter = InstrLogFilter()
+        self.log_filter: InstrLogFilter = log_filter
+
+    def log(self, *args, log_filter: Optional[InstrLogFilter] = None, **kwargs):
+        """Log an executed instruction.
+
+        :param log_filter: filter to use for this instruction (e.g. the one of the
+            executor logging it), defaults to the filter of this logger
+        """
+        if log_filter is None:
+            log_filter = self.log_filter
+        command = kwargs["command"]
+        subroutine_id = kwargs["subroutine_id"]
+        if not log_filter.should_log(
+            app_id=kwargs["app_id"], subroutine_id=subroutine_id, instr=command
+        ):
+            # Still keep track of the qubits in use
+            if isinstance(command, _ADD_QUBIT_INSTRS + _REMOVE_QUBIT_INSTRS):
+                virtual_qubit_ids, _ = self._get_qubit_ids(
+                    subroutine_id=subroutine_id,
+                    command=command,
+                )
+                self._update_qubits(
+                    subroutine_id=subroutine_id,
+                    instr=command,
+                    qubit_ids=virtual_qubit_ids,
+                )
+            return
+        super().log(*args, **kwargs)
 
     def _construct_entry(self, *args, **kwargs):
         command = kwargs["command"]
-        app_id = kwargs["app_id"]
         subroutine_id = kwargs["subroutine_id"]
-        output = kwargs["output"]
-        wall_time = str(datetime.now())
-        sim_time = self._executor._get_simulated_time()
-        program_counter = kwargs["program_counter"]
-        instr_name = command.mnemonic
-        operands = command.operands
-        op_values = self._get_op_values(subroutine_id=subroutine_id, operands=operands)
-        ops_str = [f"{op}={opv}" for op, opv in zip(operands, op_values)]
-        log = f"Doing instruction {instr_name} with operands {ops_str}"
         virtual_qubit_ids, physical_qubit_ids = self._get_qubit_ids(
             subroutine_id=subroutine_id,
             command=command,
@@ -128,8 +518,37 @@ class InstrLogger(StructuredLogger):
         if len(virtual_qubit_ids) == 0:
             # Not a qubit instruction
             return None
+        record = _InstrRecord(
+            wall_time=time(),
+            sim_time=self._executor._get_simulated_time(),
+            app_id=kwargs["app_id"],
+            subroutine_id=subroutine_id,
+            program_counter=kwargs["program_counter"],
+            command=command,
+            op_values=self._get_op_values(
+                subroutine_id=subroutine_id, operands=command.operands
+            ),
+            virtual_qubit_ids=virtual_qubit_ids,
+            physical_qubit_ids=physical_qubit_ids,
+            output=kwargs["output"],
+        )
+        if self.deferred:
+            return record
+        return self._materialize_entry(record, qubit_groups=self._get_qubit_groups())
+
+    def _materialize_entry(
+        self, entry, qubit_groups: Optional[QubitGroups] = None
+    ) -> Dict[str, Any]:
+        if not isinstance(entry, _InstrRecord):
+            # Already materialized
+            return entry
+        command = entry.command
+        instr_name = command.mnemonic
+        operands = command.operands
+        ops_str = [f"{op}={opv}" for op, opv in zip(operands, entry.op_values)]
+        log = f"Doing instruction {instr_name} with operands {ops_str}"
         if isinstance(command, instructions.core.MeasInstruction):
-            outcome = output
+            outcome = entry.output
         else:
             outcome = None
         if isinstance(command, instructions.core.RotationInstruction) or isinstance(
@@ -141,21 +560,20 @@ class InstrLogger(StructuredLogger):
         else:
             angle = None
 
-        qubit_groups = self._get_qubit_groups()
         return asdict(
             InstrLogEntry(
-                WCT=wall_time,
-                SIT=sim_time,
-                AID=app_id,
-                SID=subroutine_id,
-                PRC=program_counter,
+                WCT=str(datetime.fromtimestamp(entry.wall_time)),
+                SIT=entry.sim_time,
+                AID=entry.app_id,
+                SID=entry.subroutine_id,
+                PRC=entry.program_counter,
                 HLN=None,
                 HFL=None,
                 INS=instr_name,
                 OPR=ops_str,
                 ANG=angle,
-                QID=virtual_qubit_ids,
-                VID=physical_qubit_ids,
+                QID=entry.virtual_qubit_ids,
+                VID=entry.physical_qubit_ids,
                 OUT=outcome,
                 QGR=qubit_groups,
                 LOG=log,
@@ -169,12 +587,12 @@ class InstrLogger(StructuredLogger):
     ) -> Tuple[List[int], List[int]]:
         """Gets the qubit IDs involved in a command"""
         # If EPR then get the qubit IDs from the array
-        epr_instructions = [
+        epr_instructions = (
             instructions.core.CreateEPRInstruction,
             instructions.core.RecvEPRInstruction,
-        ]
+        )
         app_id = self._executor._get_app_id(subroutine_id=subroutine_id)
-        if any(isinstance(command, cmd_cls) for cmd_cls in epr_instructions):
+        if isinstance(command, epr_instructions):
             # Ignore a constant register since this indicates it's a measure directly request
             if command.qubit_addr_array.name == RegisterName.C:  # type: ignore
                 return [], []
@@ -226,22 +644,15 @@ class InstrLogger(StructuredLogger):
         instr: instructions.base.NetQASMInstruction,
         qubit_ids: List[int],
     ) -> None:
-        add_qubit_instrs = [
-            instructions.core.InitInstruction,
-            instructions.core.CreateEPRInstruction,
-            instructions.core.RecvEPRInstruction,
-        ]
-        remove_qubit_instrs = [
-            instructions.core.QFreeInstruction,
-            instructions.core.MeasInstruction,
-        ]
+        if not isinstance(instr, _ADD_QUBIT_INSTRS + _REMOVE_QUBIT_INSTRS):
+            return
         node_name = self._get_node_name()
         app_id = self._get_app_id(subroutine_id=subroutine_id)
-        if any(isinstance(instr, cmd_cls) for cmd_cls in add_qubit_instrs):
+        if isinstance(instr, _ADD_QUBIT_INSTRS):
             for qubit_id in qubit_ids:
                 abs_id = node_name, app_id, qubit_id
                 self.__class__._qubits.add(abs_id)
-        elif any(isinstance(instr, cmd_cls) for cmd_cls in remove_qubit_instrs):
+        else:
             for qubit_id in qubit_ids:
                 abs_id = node_name, app_id, qubit_id
                 if abs_id in self.__class__._qubits:
@@ -274,8 +685,17 @@ class InstrLogger(StructuredLogger):
 
 
 class NetworkLogger(StructuredLogger):
-    def __init__(self, filepath):
-        super().__init__(filepath)
+    def __init__(
+        self,
+        filepath,
+        stream_format: Optional[StreamFormat] = None,
+        stream_buffer_size: Optional[int] = None,
+    ):
+        super().__init__(
+            filepath,
+            stream_format=stream_format,
+            stream_buffer_size=stream_buffer_size,
+        )
 
     def _construct_entry(self, *args, **kwargs):
         wall_time = str(datetime.now())
@@ -2,11 +2,27 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Optional, Tuple
-
-from netqasm.qlink_compat import BellState, EPRRole, EPRType, RandomBasis, TimeUnit
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from netqasm.qlink_compat import (
+    BellState,
+    EPRRole,
+    EPRType,
+    LinkLayerOKTypeK,
+    LinkLayerOKTypeM,
+    RandomBasis,
+    TimeUnit,
+)
 from netqasm.sdk.build_types import T_PostRoutine
-from netqasm.sdk.futures import Array, Future, NoValueError
+from netqasm.sdk.futures import (
+    _ARRAY_NO_VALUES_MSG,
+    Array,
+    Future,
+    NonConstantIndexError,
+    NoValueError,
+)
 
 
 class EprMeasBasis(Enum):
@@ -92,6 +108,21 @@ SER_RESPONSE_MEASURE_IDX_BELL_STATE = 9
 SER_RESPONSE_MEASURE_LEN = SER_RESPONSE_MEASURE_IDX_BELL_STATE + 1
 
 
+def _get_response_field_type(field: str) -> type:
+    # The goodness (fidelity estimate) of a pair may be real-valued
+    return np.float64 if field == "goodness" else np.int64
+
+
+# NumPy structured types of a single EPR Keep or Measure result in a NetQASM array,
+# with one field per entry.
+RESPONSE_KEEP_DTYPE = np.dtype(
+    [(field, _get_response_field_type(field)) for field in LinkLayerOKTypeK._fields]
+)
+RESPONSE_MEASURE_DTYPE = np.dtype(
+    [(field, _get_response_field_type(field)) for field in LinkLayerOKTypeM._fields]
+)
+
+
 def serialize_request(tp: EPRType, params: EntRequestParams) -> List[Optional[int]]:
     """Convert an EntRequestParams object into a list of values that can be put
     in a NetQASM array."""
@@ -181,6 +212,42 @@ def deserialize_epr_measure_results(
     return results
 
 
+def epr_results_to_numpy(
+    results: Sequence[Union[EprKeepResult, EprMeasureResult]]
+) -> np.ndarray:
+    """Get the raw values of EPR results of one request as a structured NumPy array.
+
+    The array has one record per pair, with fields named as in `LinkLayerOKTypeK`
+    (for keep results) or `LinkLayerOKTypeM` (for measure results), e.g.
+    `epr_results_to_numpy(results)["measurement_outcome"]`.
+
+    :param results: consecutive results of a single request, e.g. as returned by the
+        EPR socket
+    :raises NoValueError: if the results are not available yet
+    :raises NonConstantIndexError: if the results are at a non-constant index in the
+        array, e.g. one in a register
+    :return: array of records
+    """
+    if isinstance(results[0], EprKeepResult):
+        dtype = RESPONSE_KEEP_DTYPE
+        field_index = SER_RESPONSE_KEEP_IDX_REMOTE_NODE_ID
+    else:
+        dtype = RESPONSE_MEASURE_DTYPE
+        field_index = SER_RESPONSE_MEASURE_IDX_REMOTE_NODE_ID
+    future = results[0].remote_node_id
+    if not isinstance(future.index, int):
+        raise NonConstantIndexError(
+            f"Cannot locate EPR results at index {future.index}, which is not constant"
+        )
+    shared_memory = future._connection.shared_memory
+    if not shared_memory.has_array(future.address):
+        raise NoValueError(_ARRAY_NO_VALUES_MSG.format(address=future.address))
+    # Record of the first result in the array
+    start = (future.index - field_index) // len(dtype.names)
+    records = shared_memory.get_array_records(address=future.address, dtype=dtype)
+    return records[start : start + len(results)]
+
+
 @dataclass
 class EprKeepResult:
     qubit_id: Future
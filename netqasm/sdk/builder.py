@@ -7,9 +7,11 @@ Python application script code into NetQASM subroutines.
 from __future__ import annotations
 
 from contextlib import contextmanager
+from dataclasses import dataclass
 from itertools import count
 from typing import (
     TYPE_CHECKING,
+    Any,
     Dict,
     Iterator,
     List,
@@ -91,6 +93,204 @@ class LabelManager:
             return name
 
 
+@dataclass
+class CompileCacheStats:
+    """Statistics of the subroutine compile cache of a `Builder`."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of compilations that used a cached subroutine."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+# Operand types that can be used as is in the fingerprint of a ProtoSubroutine.
+# Others (e.g. mutable array entries) are represented by their type and string.
+_HASHABLE_OPERAND_TYPES = (
+    int,
+    operand.Immediate,
+    operand.Register,
+    operand.Address,
+    operand.Template,
+)
+
+# Commands of which the integer operands are array addresses
+_ARRAY_ADDRESS_INSTRS = (GenericInstr.CREATE_EPR, GenericInstr.RECV_EPR)
+
+
+def _get_operand_address(command: ICmd, op: Any) -> Optional[int]:
+    """Get the array address in an operand of a command, if any."""
+    if isinstance(op, Address):
+        return op.address
+    if isinstance(op, (ArrayEntry, ArraySlice)):
+        return op.address.address
+    if type(op) is int and command.instruction in _ARRAY_ADDRESS_INSTRS:
+        return op
+    return None
+
+
+def _map_operand_address(command: ICmd, op: Any, mapping: Dict[int, int]) -> Any:
+    """Replace the array address in an operand of a command using `mapping`."""
+    if isinstance(op, Address):
+        return Address(mapping[op.address])
+    if isinstance(op, ArrayEntry):
+        return ArrayEntry(Address(mapping[op.address.address]), op.index)
+    if isinstance(op, ArraySlice):
+        return ArraySlice(Address(mapping[op.address.address]), op.start, op.stop)
+    if type(op) is int and command.instruction in _ARRAY_ADDRESS_INSTRS:
+        return mapping[op]
+    return op
+
+
+def _get_array_addresses(pre_subroutine: ProtoSubroutine) -> List[int]:
+    """Get the addresses of the arrays used in a ProtoSubroutine, in order of first
+    use."""
+    addresses: Dict[int, None] = {}
+    for command in pre_subroutine.commands:
+        if isinstance(command, ICmd):
+            for op in command.operands:
+                address = _get_operand_address(command, op)
+                if address is not None:
+                    addresses.setdefault(address, None)
+    return list(addresses)
+
+
+def _fingerprint_protosubroutine(
+    pre_subroutine: ProtoSubroutine,
+) -> Tuple[Tuple, List[int]]:
+    """Get a hashable value that is equal for ProtoSubroutines that compile to the
+    same subroutine up to the addresses of the arrays, including the host lines of
+    its commands.
+
+    Array addresses are replaced by their index in the list of addresses used by the
+    ProtoSubroutine, which is returned as well. Branch labels are replaced by their
+    index in order of first use, since they do not end up in the subroutine.
+    """
+    addresses = _get_array_addresses(pre_subroutine)
+    relative = {address: i for i, address in enumerate(addresses)}
+    labels: Dict[str, int] = {}
+    commands: List[Tuple] = []
+    for command in pre_subroutine.commands:
+        lineno = command.lineno
+        line = None if lineno is None else (lineno.filename, lineno.lineno)
+        if isinstance(command, BranchLabel):
+            label = labels.setdefault(command.name, len(labels))
+            commands.append((label, line))
+        else:
+            operands = []
+            for op in command.operands:
+                if isinstance(op, Label):
+                    op = (Label, labels.setdefault(op.name, len(labels)))
+                else:
+                    op = _map_operand_address(command, op, relative)
+                    if type(op) not in _HASHABLE_OPERAND_TYPES:
+                        op = (type(op), str(op))
+                operands.append(op)
+            commands.append(
+                (command.instruction, tuple(command.args), tuple(operands), line)
+            )
+    key = (
+        pre_subroutine.netqasm_version,
+        pre_subroutine.app_id,
+        tuple(commands),
+    )
+    return key, addresses
+
+
+def _get_instr_operand_address(op: operand.Operand) -> Optional[int]:
+    """Get the value in an operand of an instruction that can be an array address."""
+    if isinstance(op, operand.Immediate):
+        return op.value
+    if isinstance(op, Address):
+        return op.address
+    if isinstance(op, (ArrayEntry, ArraySlice)):
+        return op.address.address
+    return None
+
+
+def _map_instr_operand_address(
+    op: operand.Operand, mapping: Dict[int, int]
+) -> operand.Operand:
+    """Replace the array address in an operand of an instruction using `mapping`."""
+    if isinstance(op, operand.Immediate):
+        return operand.Immediate(mapping[op.value])
+    if isinstance(op, Address):
+        return Address(mapping[op.address])
+    if isinstance(op, ArrayEntry):
+        return ArrayEntry(Address(mapping[op.address.address]), op.index)
+    if isinstance(op, ArraySlice):
+        return ArraySlice(Address(mapping[op.address.address]), op.start, op.stop)
+    return op
+
+
+def _find_address_slots(
+    subroutine: Subroutine, other: Subroutine, mapping: Dict[int, int]
+) -> Optional[Dict[int, List[int]]]:
+    """Find the operands of a compiled subroutine that hold array addresses.
+
+    `other` is the same subroutine, compiled with the array addresses replaced
+    using `mapping`, which should change all addresses. Returns the positions of
+    the differing operands, per instruction index, or None if the subroutines
+    differ in another way.
+    """
+    if len(subroutine.instructions) != len(other.instructions):
+        return None
+    slots: Dict[int, List[int]] = {}
+    for index, (instr, other_instr) in enumerate(
+        zip(subroutine.instructions, other.instructions)
+    ):
+        if type(instr) is not type(other_instr):
+            return None
+        for position, (op, other_op) in enumerate(
+            zip(instr.operands, other_instr.operands)
+        ):
+            if op == other_op:
+                continue
+            if _get_instr_operand_address(op) not in mapping:
+                return None
+            if _map_instr_operand_address(op, mapping) != other_op:
+                return None
+            slots.setdefault(index, []).append(position)
+    return slots
+
+
+@dataclass
+class _CachedSubroutine:
+    """A compiled subroutine in the compile cache of a `Builder`."""
+
+    subroutine: Subroutine
+    # Array addresses used by the subroutine, in order of first use
+    addresses: List[int]
+    # Positions of the operands holding array addresses, per instruction index, or
+    # None if not known yet (i.e. the subroutine was only compiled for `addresses`)
+    slots: Optional[Dict[int, List[int]]] = None
+
+    def rebase(self, addresses: List[int]) -> Optional[Subroutine]:
+        """Get a copy of the subroutine using other array addresses (in the same
+        order), or None if the slots of the addresses are not known."""
+        if addresses == self.addresses:
+            return self.subroutine._with_app_id(self.subroutine.app_id)
+        if self.slots is None:
+            return None
+        mapping = dict(zip(self.addresses, addresses))
+        subroutine = self.subroutine._with_app_id(self.subroutine.app_id)
+        instrs = subroutine.instructions
+        for index, positions in self.slots.items():
+            instr = instrs[index]
+            ops: List[Union[operand.Operand, int]] = list(instr.operands)
+            for position in positions:
+                ops[position] = _map_instr_operand_address(
+                    ops[position], mapping  # type: ignore
+                )
+            new_instr = instr.from_operands(ops)
+            new_instr.lineno = instr.lineno
+            instrs[index] = new_instr
+        return subroutine
+
+
 class SdkIfContext:
     """Context object for if statements in SDK code such as `with conn.if_eq()`."""
 
@@ -196,6 +396,9 @@ class Builder:
     is compiled into a NetQASM subroutine.
     """
 
+    # Maximum number of compiled subroutines kept when caching is enabled
+    _COMPILE_CACHE_SIZE: int = 128
+
     def __init__(
         self,
         connection: BaseNetQASMConnection,
@@ -204,6 +407,7 @@ class Builder:
         log_config: Optional[LogConfig] = None,
         compiler: Optional[Type[SubroutineTranspiler]] = None,
         return_arrays: bool = True,
+        cache_subroutines: bool = False,
     ):
         """Builder constructor. Typically not used directly by the Host script.
 
@@ -219,6 +423,9 @@ class Builder:
             each subroutine (for all arrays that are used in the subroutine). May be
             set to False if the quantum node controller does not support returning
             arrays.
+        :param cache_subroutines: whether to reuse the compiled subroutine when the
+            same ProtoSubroutine is compiled again, e.g. when the same SDK code is
+            flushed in a loop
         """
         self._connection = connection
         self._app_id = app_id
@@ -259,6 +466,14 @@ class Builder:
         # What compiler (if any) to be used
         self._compiler: Optional[Type[SubroutineTranspiler]] = compiler
 
+        # Compiled subroutines by fingerprint of the ProtoSubroutine they were
+        # compiled from (up to array addresses), in order of last use.
+        # None if caching is disabled.
+        self._compile_cache: Optional[Dict[Any, _CachedSubroutine]] = (
+            {} if cache_subroutines else None
+        )
+        self._compile_cache_stats: CompileCacheStats = CompileCacheStats()
+
         # If an NV compiler is specified but not an NV hardware config,
         # make sure an NV config is used after all.
         if compiler == NVSubroutineTranspiler:
@@ -276,6 +491,9 @@ class Builder:
     def inactivate_qubits(self) -> None:
         self._mem_mgr.inactivate_qubits()
 
+    def resolve_qubit_ids(self) -> None:
+        self._mem_mgr.resolve_qubit_ids()
+
     def new_qubit_id(self) -> int:
         return self._mem_mgr.get_new_qubit_address()
 
@@ -333,14 +551,66 @@ class Builder:
             return None
 
     def subrt_compile_subroutine(self, pre_subroutine: ProtoSubroutine) -> Subroutine:
-        """Convert a ProtoSubroutine into a Subroutine."""
+        """Convert a ProtoSubroutine into a Subroutine.
+
+        If caching is enabled, the returned subroutine may be a copy of one compiled
+        before, possibly with other array addresses. Subroutines with arguments are
+        never cached, since they are modified when instantiated.
+        """
+        if self._compile_cache is None or len(pre_subroutine.arguments) > 0:
+            subroutine = self._compile(pre_subroutine)
+        else:
+            subroutine = self._compile_cached(pre_subroutine, self._compile_cache)
+        if self._track_lines:
+            self._log_subroutine(subroutine=subroutine)
+        return subroutine
+
+    def _compile(self, pre_subroutine: ProtoSubroutine) -> Subroutine:
         subroutine: Subroutine = assemble_subroutine(pre_subroutine)
         if self._compiler is not None:
             subroutine = self._compiler(subroutine=subroutine).transpile()
-        if self._track_lines:
-            self._log_subroutine(subroutine=subroutine)
         return subroutine
 
+    def _compile_cached(
+        self, pre_subroutine: ProtoSubroutine, cache: Dict[Any, _CachedSubroutine]
+    ) -> Subroutine:
+        key, addresses = _fingerprint_protosubroutine(pre_subroutine)
+        cached = cache.pop(key, None)
+        if cached is not None:
+            cache[key] = cached
+            subroutine = cached.rebase(addresses)
+            if subroutine is not None:
+                self._compile_cache_stats.hits += 1
+                return subroutine
+
+        self._compile_cache_stats.misses += 1
+        subroutine = self._compile(pre_subroutine)
+        if cached is not None:
+            # Compiled for other array addresses, so the operands holding them are
+            # found by comparing both. This requires all addresses to differ.
+            mapping = dict(zip(cached.addresses, addresses))
+            if all(old != new for old, new in mapping.items()):
+                cached.slots = _find_address_slots(
+                    subroutine=cached.subroutine, other=subroutine, mapping=mapping
+                )
+            return subroutine
+
+        if len(cache) >= self.__class__._COMPILE_CACHE_SIZE:
+            # Evict the least recently used subroutine
+            del cache[next(iter(cache))]
+        # Keep a copy, since the returned subroutine may be modified
+        cache[key] = _CachedSubroutine(
+            subroutine=subroutine._with_app_id(subroutine.app_id),
+            addresses=addresses,
+            slots={} if len(addresses) == 0 else None,
+        )
+        return subroutine
+
+    @property
+    def compile_cache_stats(self) -> CompileCacheStats:
+        """Hits and misses of the compile cache (zero if caching is disabled)."""
+        return self._compile_cache_stats
+
     def _log_subroutine(self, subroutine: Subroutine) -> None:
         self._committed_subroutines.append(subroutine)
 
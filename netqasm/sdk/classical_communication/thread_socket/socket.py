@@ -182,6 +182,87 @@ def log_recv_structured(method):
     return new_method
 
 
+def _log_many(direction: SocketOperation, structured: bool):
+    """Get a decorator that logs each message of a bulk send or receive method.
+
+    :param direction: `SocketOperation.SEND` for a method sending a list of messages
+        or `SocketOperation.RECV` for a method returning a list of messages
+    :param structured: whether the messages are `StructuredMessage`s (which are
+        encoded as JSON before being passed to a decorated send method)
+    """
+    sending = direction == SocketOperation.SEND
+
+    def log_msgs(self, msgs, raw_msgs, hln, hfl) -> None:
+        if sending:
+            sender, receiver = self._app_name, self._remote_app_name
+            prefix = f"Send classical message to {self.remote_app_name}"
+        else:
+            sender, receiver = self._remote_app_name, self._app_name
+            prefix = f"Message received from {self.remote_app_name}"
+        for msg, raw_msg in zip(msgs, raw_msgs):
+            if structured:
+                logged_msg = f"{msg.header}: {msg.payload}"
+                log = f"{prefix}: {raw_msg if sending else msg}"
+            else:
+                logged_msg = trim_msg(msg)
+                log = f"{prefix}: {logged_msg}"
+            self._comm_logger.log(
+                socket_op=direction,
+                msg=logged_msg,
+                sender=sender,
+                receiver=receiver,
+                socket_id=self._id,
+                hln=hln,
+                hfl=hfl,
+                log=log,
+            )
+
+    def get_line(self) -> Tuple[Optional[int], Optional[str]]:
+        if self._line_tracker is not None:
+            hostline = self._line_tracker.get_line()
+            if hostline is not None:
+                return hostline.lineno, hostline.filename
+        return None, None
+
+    def decorator(method):
+        def send_method(self, msgs: List) -> None:
+            hln, hfl = get_line(self)
+            if structured:
+                raw_msgs = [json.dumps(msg.__dict__) for msg in msgs]
+            else:
+                raw_msgs = msgs
+            if self._comm_logger is not None:
+                log_msgs(self, msgs, raw_msgs, hln, hfl)
+
+            method(self, raw_msgs)
+
+        def recv_method(self, *args, **kwargs) -> List:
+            hln, hfl = get_line(self)
+            if self._comm_logger is not None:
+                log = f"Waiting for classical messages from {self.remote_app_name}..."
+                self._comm_logger.log(
+                    socket_op=SocketOperation.WAIT_RECV,
+                    msg=None,
+                    sender=self._remote_app_name,
+                    receiver=self._app_name,
+                    socket_id=self._id,
+                    hln=hln,
+                    hfl=hfl,
+                    log=log,
+                )
+
+            msgs = method(self, *args, **kwargs)
+
+            if self._comm_logger is not None:
+                log_msgs(self, msgs, msgs, hln, hfl)
+
+            return msgs
+
+        return send_method if sending else recv_method
+
+    return decorator
+
+
 class ThreadSocket(Socket):
     """Classical socket implementation for multi-threaded simulations.
 
@@ -385,6 +466,109 @@ class ThreadSocket(Socket):
         # TODO fix return value type hints
         return msg  # type: ignore
 
+    @_log_many(SocketOperation.SEND, structured=False)
+    def send_many(self, msgs: List[str]) -> None:
+        """Sends multiple messages to the remote node at once.
+
+        The messages are received in the given order. This is equivalent to calling
+        `send` for each message, but the messages are handed over all together.
+
+        Parameters
+        ----------
+        msgs : List[str]
+            Messages to be sent.
+
+        Raises
+        ------
+        ConnectionError
+            If the remote connection is unresponsive.
+        """
+        for msg in msgs:
+            if not isinstance(msg, str):
+                raise TypeError(f"Messages needs to be a string, not {type(msg)}")
+        if not self.connected:
+            raise ConnectionError("Socket is not connected so cannot send")
+
+        self._SOCKET_HUB.send_many(self, msgs)
+
+    @_log_many(SocketOperation.RECV, structured=False)
+    def recv_many(
+        self,
+        num: int,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> List[str]:
+        """Receive multiple messages from the remote node at once.
+
+        If block is True the method will block until there are `num` messages or a
+        timeout is reached. Otherwise the method will raise a `RuntimeError` if there
+        are not `num` messages to receive directly.
+        No messages are consumed if the method raises.
+
+        Parameters
+        ----------
+        num : int
+            Number of messages to receive
+        block : bool
+            Whether to block for available messages
+        timeout : float, optional
+            Optionally use a timeout for trying to recv the messages. Only used if
+            `block=True`.
+
+        Returns
+        -------
+        List[str]
+            The messages received, in the order they were sent
+
+        Raises
+        ------
+        RuntimeError
+            If `block=False` and there are not `num` available messages
+        """
+        msgs = self._SOCKET_HUB.recv_many(self, num=num, block=block, timeout=timeout)
+        for msg in msgs:
+            if not isinstance(msg, str):
+                raise RuntimeError(
+                    f"Received message of type {type(msg)} instead of str"
+                )
+        return msgs  # type: ignore
+
+    @_log_many(SocketOperation.SEND, structured=True)
+    def send_structured_many(self, msgs: List[StructuredMessage]) -> None:
+        """Sends multiple structured messages to the remote node at once."""
+        if not self.connected:
+            raise ConnectionError("Socket is not connected so cannot send")
+
+        self._SOCKET_HUB.send_many(self, msgs)
+
+    @_log_many(SocketOperation.RECV, structured=True)
+    def recv_structured_many(
+        self,
+        num: int,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> List[StructuredMessage]:
+        """Receive multiple structured messages from the remote node at once.
+
+        See `recv_many` for the meaning of the arguments.
+        """
+        raw_msgs = self._SOCKET_HUB.recv_many(
+            self, num=num, block=block, timeout=timeout
+        )
+        msgs: List[StructuredMessage] = []
+        for raw_msg in raw_msgs:
+            if not isinstance(raw_msg, str):
+                raise RuntimeError(
+                    f"Received message of type {type(raw_msg)} instead of str"
+                )
+            msg_dict = json.loads(raw_msg)
+            msgs.append(
+                StructuredMessage(
+                    header=msg_dict["header"], payload=msg_dict["payload"]
+                )
+            )
+        return msgs
+
     def wait(self) -> None:
         """Waits until the connection gets lost"""
         while True:
@@ -6,11 +6,10 @@ and need to communicate with each other.
 
 from __future__ import annotations
 
-from collections import defaultdict
-from threading import Lock
-from time import sleep
+from collections import defaultdict, deque
+from threading import Condition, Lock
 from timeit import default_timer as timer
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional, Set, Union
 from weakref import WeakMethod
 
 from netqasm.logging.glob import get_netqasm_logger
@@ -25,6 +24,10 @@ class _SocketHub:
     """Global manager for classical sockets that live in separate threads.
 
     This class is used by ThreadSockets and is typically not used directly.
+
+    Threads waiting for a connection or a message block on a condition variable of
+    the relevant socket and are woken up as soon as the remote connects or sends a
+    message. The sleep times below are only the maximum time between re-checks.
     """
 
     _CONNECT_SLEEP_TIME: float = 0.1
@@ -40,10 +43,11 @@ class _SocketHub:
         self._open_sockets: Set[thread_socket.socket.T_ThreadSocketKey] = set()
         self._remote_sockets: Set[thread_socket.socket.T_ThreadSocketKey] = set()
 
+        # Pending messages per receiving socket, only accessed while holding `_lock`
         self._messages: Dict[
             thread_socket.socket.T_ThreadSocketKey,
-            List[Union[str, message.StructuredMessage]],
-        ] = defaultdict(list)
+            Deque[Union[str, message.StructuredMessage]],
+        ] = defaultdict(deque)
         self._recv_callbacks: Dict[
             thread_socket.socket.T_ThreadSocketKey, WeakMethod
         ] = {}
@@ -53,18 +57,32 @@ class _SocketHub:
 
         self._lock: Lock = Lock()
 
+        # Conditions (sharing `_lock`) that are notified when the socket with the
+        # given key connects or when a message is sent to it.
+        self._conditions: Dict[thread_socket.socket.T_ThreadSocketKey, Condition] = {}
+
         self._logger: logging.Logger = get_netqasm_logger(self.__class__.__name__)
 
     def connect(
         self, socket: thread_socket.ThreadSocket, timeout: Optional[float] = None
     ) -> None:
         """Connects a socket to another"""
-        self._open_sockets.add(socket.key)
-        self._remote_sockets.add(socket.key)
-        self._add_callbacks(socket)
+        with self._lock:
+            self._open_sockets.add(socket.key)
+            self._remote_sockets.add(socket.key)
+            self._add_callbacks(socket)
+            self._get_condition(socket.key).notify_all()
 
         self._wait_for_remote(socket, timeout=timeout)
 
+    def _get_condition(self, key: thread_socket.socket.T_ThreadSocketKey) -> Condition:
+        """Get the condition for a socket key. Should be called holding `_lock`."""
+        condition = self._conditions.get(key)
+        if condition is None:
+            condition = Condition(self._lock)
+            self._conditions[key] = condition
+        return condition
+
     def _add_callbacks(self, socket: thread_socket.ThreadSocket) -> None:
         if socket.use_callbacks:
             self._recv_callbacks[socket.key] = WeakMethod(socket.recv_callback)  # type: ignore
@@ -100,31 +118,33 @@ class _SocketHub:
     ) -> None:
         """Wait for a remote socket to become active"""
         t_start = timer()
-        while True:
-            if socket.remote_key in self._open_sockets:
-                self._logger.debug(f"Connection for socket {socket.key} successful")
-                return
-            if socket.remote_key in self._remote_sockets:
+        with self._lock:
+            condition = self._get_condition(socket.remote_key)
+            while True:
+                if socket.remote_key in self._open_sockets:
+                    self._logger.debug(f"Connection for socket {socket.key} successful")
+                    return
+                if socket.remote_key in self._remote_sockets:
+                    self._logger.debug(
+                        f"Connection for socket {socket.key} was successful but closed again"
+                    )
+                    return
+                wait_time = self.__class__._CONNECT_SLEEP_TIME
+                if timeout is not None:
+                    t_remaining = timeout - (timer() - t_start)
+                    if t_remaining < 0:
+                        app_name = socket.app_name
+                        remote_app_name = socket.remote_app_name
+                        socket_id = socket.id
+                        raise TimeoutError(
+                            f"Timeout while connection node ID {app_name} to "
+                            f"{remote_app_name} using socket {socket_id}"
+                        )
+                    wait_time = min(wait_time, t_remaining)
                 self._logger.debug(
-                    f"Connection for socket {socket.key} was successful but closed again"
+                    f"Connection for socket {socket.key} not yet established, waiting..."
                 )
-                return
-            t_now = timer()
-            t_elapsed = t_now - t_start
-            if timeout is not None:
-                if t_elapsed > timeout:
-                    app_name = socket.app_name
-                    remote_app_name = socket.remote_app_name
-                    socket_id = socket.id
-                    raise TimeoutError(
-                        f"Timeout while connection node ID {app_name} to "
-                        f"{remote_app_name} using socket {socket_id}"
-                    )
-            self._logger.debug(
-                f"Connection for socket {socket.key} failed, "
-                f"trying again in {self._CONNECT_SLEEP_TIME} s..."
-            )
-            sleep(self.__class__._CONNECT_SLEEP_TIME)
+                condition.wait(wait_time)
 
     def send(
         self,
@@ -152,6 +172,41 @@ class _SocketHub:
             )
             with self._lock:
                 self._messages[socket.remote_key].append(msg)
+                self._get_condition(socket.remote_key).notify_all()
+
+    def send_many(
+        self,
+        socket: thread_socket.ThreadSocket,
+        msgs: Iterable[Union[str, message.StructuredMessage]],
+    ) -> None:
+        """Send multiple messages using a given socket, in order.
+
+        The messages are added to the pending messages of the remote socket at once.
+        """
+        msgs = list(msgs)
+        recv_callback = self._recv_callbacks.get(socket.remote_key)
+        if recv_callback is not None:
+            method = recv_callback()
+            # This is a WeakMethod so check if it exists
+            if method is None:
+                self._logger.warning(
+                    f"Trying to call recv callback "
+                    f"for socket {socket.remote_key} but object is garbage collected"
+                )
+                return
+            self._logger.debug(
+                f"{len(msgs)} messages sent on socket {socket.key}, calling callback for recv"
+            )
+            for msg in msgs:
+                method(msg)
+        else:
+            self._logger.debug(
+                f"{len(msgs)} messages sent on socket {socket.key}, "
+                f"adding to pending received messages"
+            )
+            with self._lock:
+                self._messages[socket.remote_key].extend(msgs)
+                self._get_condition(socket.remote_key).notify_all()
 
     def recv(
         self,
@@ -160,30 +215,70 @@ class _SocketHub:
         timeout: Optional[float] = None,
     ) -> Union[str, message.StructuredMessage]:
         """Recv a message to a given socket"""
+        with self._lock:
+            messages = self._wait_for_messages(
+                socket, num=1, block=block, timeout=timeout
+            )
+            msg = messages.popleft()
+        self._logger.debug(f"Got message {msg} for socket {socket.key}")
+        return msg
+
+    def recv_many(
+        self,
+        socket: thread_socket.ThreadSocket,
+        num: int,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> List[Union[str, message.StructuredMessage]]:
+        """Recv `num` messages to a given socket, in the order they were sent.
+
+        No messages are consumed unless all `num` of them are available.
+        """
+        if num < 0:
+            raise ValueError(f"Number of messages should be non-negative, not {num}")
+        with self._lock:
+            messages = self._wait_for_messages(
+                socket, num=num, block=block, timeout=timeout
+            )
+            msgs = [messages.popleft() for _ in range(num)]
+        self._logger.debug(f"Got {num} messages for socket {socket.key}")
+        return msgs
+
+    def _wait_for_messages(
+        self,
+        socket: thread_socket.ThreadSocket,
+        num: int,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Deque[Union[str, message.StructuredMessage]]:
+        """Wait until at least `num` messages are pending for a given socket.
+
+        Should be called holding `_lock`.
+        Returns the pending messages of the socket.
+        """
         t_start = timer()
+        condition = self._get_condition(socket.key)
+        messages = self._messages[socket.key]
         while True:
-            with self._lock:
-                messages = self._messages[socket.key]
-            if len(messages) == 0:
-                if not block:
+            if len(messages) >= num:
+                return messages
+            if not block:
+                if num == 1:
                     raise RuntimeError(f"No message to receive on socket {socket.key}")
-            else:
-                with self._lock:
-                    msg = messages.pop(0)
-                self._logger.debug(f"Got message {msg} for socket {socket.key}")
-                return msg
+                raise RuntimeError(
+                    f"Only {len(messages)} of {num} messages to receive "
+                    f"on socket {socket.key}"
+                )
+            wait_time = self.__class__._RECV_SLEEP_TIME
             if timeout is not None:
-                t_now = timer()
-                t_elapsed = t_now - t_start
-                if t_elapsed > timeout:
+                t_remaining = timeout - (timer() - t_start)
+                if t_remaining < 0:
                     raise TimeoutError(
                         f"Timeout while trying to receive message for socket {socket.key}"
                     )
-            self._logger.debug(
-                f"No message yet for socket {socket.key}, "
-                f"trying again in {self._RECV_SLEEP_TIME} s..."
-            )
-            sleep(self.__class__._RECV_SLEEP_TIME)
+                wait_time = min(wait_time, t_remaining)
+            self._logger.debug(f"No message yet for socket {socket.key}, waiting...")
+            condition.wait(wait_time)
 
 
 _socket_hub: _SocketHub = _SocketHub()
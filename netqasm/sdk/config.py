@@ -11,3 +11,10 @@ class LogConfig:
     lib_dirs: Optional[List[str]] = None
     log_dir: Optional[str] = None
     split_runs: bool = True
+
+    # Filters for the instructions logged by executors,
+    # see `netqasm.logging.output.InstrLogFilter`.
+    instr_log_subroutine_interval: int = 1
+    instr_log_quantum_only: bool = False
+    instr_log_app_ids: Optional[List[int]] = None
+    instr_log_mnemonics: Optional[List[str]] = None
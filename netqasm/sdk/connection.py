@@ -12,14 +12,18 @@ import logging
 import math
 import os
 import pickle
+from contextlib import contextmanager
 from itertools import count
 from typing import (
     TYPE_CHECKING,
+    Any,
     Callable,
     ContextManager,
     Dict,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
@@ -36,7 +40,7 @@ from netqasm.backend.messages import (
 )
 from netqasm.lang import operand
 from netqasm.lang.ir import BreakpointAction, BreakpointRole, ProtoSubroutine
-from netqasm.lang.subroutine import Subroutine
+from netqasm.lang.subroutine import CompiledTemplate, Subroutine
 from netqasm.logging.glob import get_netqasm_logger
 from netqasm.sdk.build_types import (
     GenericHardwareConfig,
@@ -45,7 +49,7 @@ from netqasm.sdk.build_types import (
     T_LoopRoutine,
 )
 from netqasm.sdk.config import LogConfig
-from netqasm.sdk.futures import Array, Future, RegFuture, T_CValue
+from netqasm.sdk.futures import Array, BaseFuture, Future, RegFuture, T_CValue
 from netqasm.sdk.network import NetworkInfo
 from netqasm.sdk.progress_bar import ProgressBar
 from netqasm.sdk.qubit import Qubit
@@ -53,7 +57,7 @@ from netqasm.sdk.shared_memory import SharedMemory, SharedMemoryManager
 from netqasm.sdk.transpile import SubroutineTranspiler
 from netqasm.util.log import LineTracker
 
-from .builder import Builder, SdkLoopUntilContext
+from .builder import Builder, CompileCacheStats, SdkLoopUntilContext
 
 # Generic type for messages sent to the quantum node controller.
 # Note that `SubroutineMessage` does not derive from `Message` so it has to be
@@ -65,6 +69,49 @@ if TYPE_CHECKING:
     from netqasm.sdk import epr_socket as esck
 
 
+class Recording:
+    """Subroutines that were flushed by a connection within its `record()` context.
+
+    The subroutines are kept as `CompiledTemplate` s, such that they can be sent
+    again (see `BaseNetQASMConnection.replay`) without going through the SDK.
+    The futures created within the context are kept as well, since they refer to
+    the values written by the recorded subroutines.
+    """
+
+    def __init__(self) -> None:
+        self._templates: List[CompiledTemplate] = []
+        self._futures: List[BaseFuture] = []
+
+    @property
+    def templates(self) -> List[CompiledTemplate]:
+        """The recorded subroutines, in the order they were flushed."""
+        return self._templates
+
+    @property
+    def futures(self) -> List[BaseFuture]:
+        """The futures created while recording, in the order they were created."""
+        return self._futures
+
+    def _reset_futures(self) -> None:
+        """Forget the values the futures got when the recording was last replayed."""
+        for future in self._futures:
+            future._reset()
+
+    @property
+    def arguments(self) -> List[str]:
+        """Names of the arguments of all recorded subroutines."""
+        arguments: Dict[str, None] = {}
+        for template in self._templates:
+            arguments.update(dict.fromkeys(template.arguments))
+        return list(arguments)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __str__(self) -> str:
+        return f"Recording of {len(self)} subroutines"
+
+
 class BaseNetQASMConnection(abc.ABC):
     """Base class for representing connections to a quantum node controller.
 
@@ -100,6 +147,7 @@ class BaseNetQASMConnection(abc.ABC):
         epr_sockets: Optional[List[esck.EPRSocket]] = None,
         compiler: Optional[Type[SubroutineTranspiler]] = None,
         return_arrays: bool = True,
+        cache_subroutines: bool = False,
         _init_app: bool = True,
         _setup_epr_sockets: bool = True,
     ):
@@ -150,6 +198,10 @@ class BaseNetQASMConnection(abc.ABC):
             of subroutines. A reason to set this to False could be that a quantum
             node controller does not support returning arrays back to the Host.
 
+        :param cache_subroutines: whether the Builder should reuse compiled
+            subroutines when the same SDK code is flushed again, e.g. in a loop.
+            See `compile_cache_stats` for how often this happens.
+
         :param _init_app: whether to immediately send a "register application" message
             to the quantum node controller upon construction of this connection.
 
@@ -207,6 +259,7 @@ class BaseNetQASMConnection(abc.ABC):
             hardware_config=hardware_config,
             compiler=compiler,
             return_arrays=return_arrays,
+            cache_subroutines=cache_subroutines,
         )
 
         # What compiler (if any) to be used.
@@ -221,6 +274,13 @@ class BaseNetQASMConnection(abc.ABC):
             f"{self.__class__.__name__}({self.app_name})"
         )
 
+        # Recording that flushed subroutines are added to (instead of being sent),
+        # when inside the `record()` context
+        self._recording: Optional[Recording] = None
+
+        # The last finished recording, which is used by `replay` by default
+        self._last_recording: Optional[Recording] = None
+
         if _init_app:
             self._init_new_app(max_qubits=max_qubits)
 
@@ -259,6 +319,14 @@ class BaseNetQASMConnection(abc.ABC):
     def builder(self) -> Builder:
         return self._builder
 
+    @property
+    def compile_cache_stats(self) -> CompileCacheStats:
+        """Get the hits and misses of the subroutine compile cache.
+
+        Only counted if the connection was created with `cache_subroutines=True`.
+        """
+        return self._builder.compile_cache_stats
+
     @classmethod
     def get_app_ids(cls) -> Dict[str, List[int]]:
         return cls._app_ids
@@ -525,6 +593,19 @@ class BaseNetQASMConnection(abc.ABC):
 
         return subroutine
 
+    def compile_template(self) -> Optional[CompiledTemplate]:
+        """Compile the previous SDK commands into a `CompiledTemplate`.
+
+        This does the same as `compile()`, but additionally compiles the subroutine
+        to its binary encoding. The result can be sent many times, with different
+        values for its templates, using `commit_compiled_template`, without having
+        to instantiate and serialize the subroutine again.
+        """
+        subroutine = self.compile()
+        if subroutine is None:
+            return None
+        return CompiledTemplate(subroutine)
+
     def commit_protosubroutine(
         self,
         protosubroutine: ProtoSubroutine,
@@ -543,13 +624,36 @@ class BaseNetQASMConnection(abc.ABC):
         subroutine = self._builder.subrt_compile_subroutine(protosubroutine)
         self._logger.debug(f"Flushing compiled subroutine:\n{subroutine}")
 
+        if self._recording is not None:
+            self._recording.templates.append(CompiledTemplate(subroutine))
+            self._builder._reset()
+            return
+
         subroutine.instantiate(self.app_id)
 
         # Commit the subroutine to the quantum device
-        self.commit_subroutine(subroutine, block, callback)
+        if block:
+            self.commit_subroutine(subroutine, block, callback)
+            # The results have arrived, so FutureQubits may have an ID now
+            self._builder.resolve_qubit_ids()
+        else:
+            self.commit_subroutine(
+                subroutine, block, self._resolve_qubit_ids_callback(callback)
+            )
 
         self._builder._reset()
 
+    def _resolve_qubit_ids_callback(self, callback: Optional[Callable]) -> Callable:
+        """Wrap a callback of a non-blocking commit such that the IDs of FutureQubits
+        are resolved when the results arrive."""
+
+        def resolve_callback(*args, **kwargs):
+            self._builder.resolve_qubit_ids()
+            if callback is not None:
+                return callback(*args, **kwargs)
+
+        return resolve_callback
+
     def commit_subroutine(
         self,
         subroutine: Subroutine,
@@ -564,6 +668,130 @@ class BaseNetQASMConnection(abc.ABC):
             callback=callback,
         )
 
+    def commit_compiled_template(
+        self,
+        template: CompiledTemplate,
+        arguments: Optional[Dict[str, int]] = None,
+        block: bool = True,
+        callback: Optional[Callable] = None,
+    ) -> None:
+        """Send an instance of a compiled template to the quantum node controller.
+
+        :param template: the template, e.g. obtained by `compile_template()`
+        :param arguments: values for the templates in the subroutine, by name
+        :param block: block on receiving the result of executing the subroutine
+        :param callback: if `block` is False, this callback is called when the quantum
+            node controller sends the subroutine results.
+        """
+        self._logger.debug(f"Commiting {template} with arguments {arguments}")
+
+        self._commit_message(
+            msg=SubroutineMessage(
+                subroutine=template.instantiate(self.app_id, arguments)
+            ),
+            block=block,
+            callback=callback,
+        )
+
+    @contextmanager
+    def record(self) -> Iterator[Recording]:
+        """Context in which flushed subroutines are recorded instead of sent.
+
+        The SDK code in this context is compiled as usual, but the resulting
+        subroutines are only stored (as `CompiledTemplate` s) in the yielded
+        `Recording`. Pending operations are flushed when the context exits.
+        The recorded subroutines can then be sent any number of times with
+        `replay`, which skips the SDK (creating qubits, futures, allocating
+        registers, compiling) altogether.
+
+        Futures created in this context are kept in the `Recording`. They refer to
+        the registers and arrays that the recorded subroutines write, so they get
+        values when replaying, and these values are those of the last replay.
+        Hence, recorded code should not use these values in Python control flow.
+        Use `Template` operands for values that should differ per replay.
+
+        Qubits created in this context should be freed (or measured) in it. The
+        recorded subroutines allocate them on each replay and only free them if the
+        recorded code does, so qubits that are still active when the context exits
+        are allocated again by the next replay, without ever being freed.
+
+        If the context exits with an exception, the operations that were not flushed
+        yet are discarded and the recording is not kept.
+
+        :yield: the recording, which is filled when the context exits
+        """
+        if self._recording is not None:
+            raise RuntimeError("Already recording")
+        recording = Recording()
+        self._recording = recording
+        try:
+            yield recording
+            self.flush()
+        except BaseException:
+            # Discard the code that was not flushed yet
+            self._builder.subrt_pop_all_pending_commands()
+            raise
+        finally:
+            self._recording = None
+            self._builder._reset()
+        self._last_recording = recording
+
+    def replay(
+        self,
+        n: int = 1,
+        arguments: Union[None, Dict[str, int], Sequence[Dict[str, int]]] = None,
+        recording: Optional[Recording] = None,
+        block: bool = True,
+        round_callback: Optional[Callable[[int], Any]] = None,
+    ) -> List[Any]:
+        """Send the subroutines of a recording `n` times, in order.
+
+        The futures of the recording are reset before each time, so they get the
+        values of that time only. Use `round_callback` to read them each time.
+
+        :param n: number of times to send all recorded subroutines
+        :param arguments: values for the arguments of the recorded subroutines,
+            either the same for each time or a sequence with values for each of
+            the `n` times
+        :param recording: recording to replay, defaults to the last one made using
+            `record()`
+        :param block: block on receiving the result of each subroutine
+        :param round_callback: called with the index of the time after sending all
+            recorded subroutines that time, e.g. to read the values of futures
+        :return: the values returned by `round_callback` for each of the `n` times,
+            or `None` s if no callback is given
+        """
+        if recording is None:
+            recording = self._last_recording
+            if recording is None:
+                raise RuntimeError("Nothing has been recorded")
+        if isinstance(arguments, Sequence) and len(arguments) != n:
+            raise ValueError(
+                f"Got {len(arguments)} sets of arguments for replaying {n} times"
+            )
+
+        results: List[Any] = []
+        for i in range(n):
+            round_arguments = (
+                arguments[i] if isinstance(arguments, Sequence) else arguments
+            )
+            recording._reset_futures()
+            for template in recording.templates:
+                self.commit_compiled_template(
+                    template, arguments=round_arguments, block=block
+                )
+            results.append(None if round_callback is None else round_callback(i))
+        return results
+
+    def _register_future(self, future: BaseFuture) -> None:
+        """Called for each future created for this connection.
+
+        Futures created while recording are kept in the recording, such that they
+        can be reset when the recording is replayed.
+        """
+        if self._recording is not None:
+            self._recording.futures.append(future)
+
     def block(self) -> None:
         """Block until a flushed subroutines finishes.
 
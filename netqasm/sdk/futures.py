@@ -9,6 +9,8 @@ from __future__ import annotations
 import abc
 from typing import TYPE_CHECKING, List, Optional, Union
 
+import numpy as np
+
 from netqasm.lang import operand
 from netqasm.lang.ir import GenericInstr, ICmd, Symbols
 from netqasm.lang.operand import Address, ArrayEntry
@@ -34,6 +36,13 @@ class NonConstantIndexError(RuntimeError):
     pass
 
 
+# Message of the NoValueError for reading an array that is not in shared memory yet.
+_ARRAY_NO_VALUES_MSG = (
+    "The array with address {address} has no values yet, "
+    "consider flushing the current subroutine"
+)
+
+
 def as_int_when_value(cls):
     """A decorator for the `BaseFuture` class which makes is behave like an `int`
     when the property `value` is not `None`.
@@ -49,7 +58,7 @@ def as_int_when_value(cls):
             if value is None:
                 raise NoValueError(
                     f"The object '{repr(self)}' has no value yet, "
-                    "consider flusing the current subroutine"
+                    "consider flushing the current subroutine"
                 )
             try:
                 if isinstance(*args, Future):
@@ -151,6 +160,7 @@ class BaseFuture(int):
     def __init__(self, connection: sdkconn.BaseNetQASMConnection):
         self._value: Optional[int] = None
         self._connection: sdkconn.BaseNetQASMConnection = connection
+        connection._register_future(self)
 
     def __repr__(self):
         return f"{self.__class__} with value={self.value}"
@@ -172,6 +182,10 @@ class BaseFuture(int):
     def _try_get_value(self) -> Optional[int]:
         raise NotImplementedError
 
+    def _reset(self) -> None:
+        """Forget the value, such that it is read again when it is needed."""
+        self._value = None
+
     def add(
         self,
         other: Union[int, str, operand.Register, BaseFuture],
@@ -252,6 +266,16 @@ class Future(BaseFuture):
         self._address: int = address
         self._index: Union[int, Future, operand.Register, RegFuture] = index
 
+    @property
+    def address(self) -> int:
+        """Address of the array."""
+        return self._address
+
+    @property
+    def index(self) -> Union[int, Future, operand.Register, RegFuture]:
+        """Index in the array."""
+        return self._index
+
     def __str__(self) -> str:
         value = self.value
         if value is None:
@@ -561,6 +585,42 @@ class Array:
             address=self._address, index=index
         )
 
+    def to_numpy(self) -> np.ma.MaskedArray:
+        """Get all values of the array at once, as a NumPy integer array.
+
+        Entries that are undefined (`None`) in shared memory are masked.
+        Use e.g. `arr.to_numpy().filled(-1)` to get a plain array and
+        `np.ma.getmaskarray(arr.to_numpy())` to get the mask of undefined entries.
+
+        This reads the whole array from shared memory in one call, which is much
+        faster than getting the value of each element (e.g. through Futures)
+        separately.
+
+        :raises NoValueError: if the array does not exist in shared memory (yet),
+            e.g. since the subroutine returning it has not been flushed yet
+        :return: masked array containing a copy of the values
+        """
+        shared_memory = self._connection.shared_memory
+        if not shared_memory.has_array(self._address):
+            raise NoValueError(_ARRAY_NO_VALUES_MSG.format(address=self._address))
+        return shared_memory.get_array_numpy(address=self._address)
+
+    def to_records(self, dtype: np.dtype) -> np.ndarray:
+        """Get all values of the array at once, as a NumPy array of records.
+
+        This is useful for arrays that consist of consecutive records of the same
+        layout, like EPR results (see e.g. `RESPONSE_MEASURE_DTYPE` in
+        `netqasm.sdk.build_epr`). Undefined entries should not be relied upon.
+
+        :param dtype: structured type with numeric fields
+        :raises NoValueError: if the array does not exist in shared memory (yet)
+        :return: array of records, which is a copy
+        """
+        shared_memory = self._connection.shared_memory
+        if not shared_memory.has_array(self._address):
+            raise NoValueError(_ARRAY_NO_VALUES_MSG.format(address=self._address))
+        return shared_memory.get_array_records(address=self._address, dtype=dtype)
+
     @property
     def address(self) -> int:
         return self._address
@@ -1,14 +1,38 @@
 from __future__ import annotations
 
-from itertools import count
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 from netqasm.lang import operand
 from netqasm.lang.encoding import REG_INDEX_BITS, RegisterName
-from netqasm.lang.parsing.text import parse_register
-from netqasm.sdk.futures import Array
+from netqasm.sdk.futures import Array, Future, NonConstantIndexError, NoValueError
 from netqasm.sdk.qubit import Qubit
 
+# All R and M registers, by index
+_R_REGISTERS: List[operand.Register] = [
+    operand.Register(RegisterName.R, i) for i in range(2**REG_INDEX_BITS)
+]
+_M_REGISTERS: List[operand.Register] = [
+    operand.Register(RegisterName.M, i) for i in range(2**REG_INDEX_BITS)
+]
+
+
+def _lowest_unset_bit(mask: int) -> int:
+    """Get the index of the lowest bit that is 0 in `mask`."""
+    return (~mask & (mask + 1)).bit_length() - 1
+
+
+def _get_qubit_id_value(q: Qubit) -> Optional[int]:
+    """Get the ID of a qubit, or None if it is the ID of a FutureQubit that has no
+    value yet."""
+    id = q.qubit_id
+    if not isinstance(id, Future):
+        return id
+    try:
+        return id.value
+    except NonConstantIndexError:
+        # The ID is stored at an index only known while executing
+        return None
+
 
 class MemoryManager:
     """Container for managing application memory during building.
@@ -19,16 +43,26 @@ class MemoryManager:
     """
 
     def __init__(self) -> None:
-        # All qubits active for this connection
-        self._active_qubits: List[Qubit] = []
+        # All qubits active for this connection, in order of activation, with the
+        # qubit ID recorded for them. This ID is None for a FutureQubit of which
+        # the ID has no value yet.
+        self._active_qubits: Dict[Qubit, Optional[int]] = {}
+
+        # Active qubits of which the ID has no value yet, recorded when it does.
+        self._unresolved_qubits: Set[Qubit] = set()
+
+        # Number of active qubits per qubit ID (multiple qubits may share an ID),
+        # and a bitmask of the IDs with at least one active qubit.
+        self._qubit_id_counts: Dict[int, int] = {}
+        self._used_qubit_ids: int = 0
 
         # Registers that are in use for holding classical data.
         self._active_registers: Set[operand.Register] = set()
+        # Bitmask of the active R registers, by index.
+        self._active_r_registers: int = 0
 
-        # Register in use for holding measurement outcomes.
-        self._used_meas_registers: Dict[operand.Register, bool] = {
-            operand.Register(RegisterName.M, i): False for i in range(16)
-        }
+        # Bitmask of the M registers in use for holding measurement outcomes.
+        self._used_meas_registers: int = 0
 
         # Registers that need to be returned at the end of the subroutine.
         self._registers_to_return: List[operand.Register] = []
@@ -42,36 +76,99 @@ class MemoryManager:
     def inactivate_qubits(self) -> None:
         """Mark all registers as inactive (i.e. not in use)."""
         while len(self._active_qubits) > 0:
-            q = self._active_qubits.pop()
+            q, id = self._active_qubits.popitem()
+            if id is not None:
+                self._unuse_qubit_id(id)
             q.active = False
+        self._unresolved_qubits.clear()
 
     def get_active_qubits(self) -> List[Qubit]:
         """Get all qubit locations that are in use."""
-        return self._active_qubits
+        return list(self._active_qubits)
 
     def is_qubit_active(self, q: Qubit) -> bool:
         """Check if a qubit location is in use."""
         return q in self._active_qubits
 
     def is_qubit_id_used(self, id: int) -> bool:
-        """Check if a qubit ID is in use."""
-        return any(q.qubit_id == id for q in self._active_qubits)
+        """Check if a qubit ID is in use.
+
+        :raises NoValueError: if the ID of an active FutureQubit has no value yet
+        :raises NonConstantIndexError: if the ID of an active FutureQubit is stored at
+            an index only known while executing
+        """
+        self._check_qubit_ids_resolved()
+        return id in self._qubit_id_counts
 
     def activate_qubit(self, q: Qubit) -> None:
         """Mark a qubit location as 'in use'."""
-        self._active_qubits.append(q)
+        self._record_qubit_id(q)
 
     def deactivate_qubit(self, q: Qubit) -> None:
         """Mark a qubit location as 'not in use'."""
-        self._active_qubits.remove(q)
+        id = self._active_qubits.pop(q)
+        if id is None:
+            self._unresolved_qubits.discard(q)
+        else:
+            self._unuse_qubit_id(id)
+
+    def change_qubit_id(self, q: Qubit) -> None:
+        """Update the used qubit IDs after the ID of an active qubit changed."""
+        if q in self._active_qubits:
+            self.deactivate_qubit(q)
+            self._record_qubit_id(q)
+
+    def _record_qubit_id(self, q: Qubit) -> None:
+        """Record the ID of an active qubit, if it has a value."""
+        id = _get_qubit_id_value(q)
+        self._active_qubits[q] = id
+        if id is None:
+            self._unresolved_qubits.add(q)
+        else:
+            self._unresolved_qubits.discard(q)
+            self._use_qubit_id(id)
+
+    def resolve_qubit_ids(self) -> None:
+        """Record the IDs of active FutureQubits of which the ID got a value.
+
+        Should be called when the values of futures arrive, i.e. when a flushed
+        subroutine finished.
+        """
+        for q in list(self._unresolved_qubits):
+            self._record_qubit_id(q)
+
+    def _check_qubit_ids_resolved(self) -> None:
+        """Raise an error if the ID of an active qubit is not known."""
+        for q in self._unresolved_qubits:
+            id = q.qubit_id
+            assert isinstance(id, Future)
+            # Raises a NonConstantIndexError if the index is in a register
+            if id.value is None:
+                raise NoValueError(
+                    f"The ID '{id!r}' of an active qubit has no value yet, "
+                    "consider flushing the current subroutine"
+                )
+
+    def _use_qubit_id(self, id: int) -> None:
+        self._qubit_id_counts[id] = self._qubit_id_counts.get(id, 0) + 1
+        self._used_qubit_ids |= 1 << id
+
+    def _unuse_qubit_id(self, id: int) -> None:
+        num = self._qubit_id_counts.pop(id) - 1
+        if num > 0:
+            self._qubit_id_counts[id] = num
+        else:
+            self._used_qubit_ids &= ~(1 << id)
 
     def get_new_qubit_address(self) -> int:
-        """Get an unused qubit location."""
-        qubit_addresses_in_use = [q.qubit_id for q in self._active_qubits]
-        for address in count(0):
-            if address not in qubit_addresses_in_use:
-                return address
-        raise RuntimeError("Could not get new qubit address")
+        """Get an unused qubit location.
+
+        :raises NoValueError: if the ID of an active FutureQubit has no value yet
+        :raises NonConstantIndexError: if the ID of an active FutureQubit is stored at
+            an index only known while executing
+        """
+        self._check_qubit_ids_resolved()
+        return _lowest_unset_bit(self._used_qubit_ids)
 
     def is_register_active(self, reg: operand.Register) -> bool:
         """Check if a register is in use."""
@@ -82,33 +179,35 @@ class MemoryManager:
         if reg in self._active_registers:
             raise ValueError(f"Register {reg} is already active")
         self._active_registers.add(reg)
+        if reg.name == RegisterName.R:
+            self._active_r_registers |= 1 << reg.index
 
     def remove_active_register(self, reg: operand.Register) -> None:
         """Mark a register as 'not in use'."""
         self._active_registers.remove(reg)
+        if reg.name == RegisterName.R:
+            self._active_r_registers &= ~(1 << reg.index)
 
     def meas_register_set_used(self, reg: operand.Register) -> None:
         """Mark a measurement register as 'in use'."""
-        self._used_meas_registers[reg] = True
+        self._used_meas_registers |= 1 << reg.index
 
     def meas_register_set_unused(self, reg: operand.Register) -> None:
         """Mark a measurement register as 'not in use'."""
-        self._used_meas_registers[reg] = False
+        self._used_meas_registers &= ~(1 << reg.index)
 
     def get_new_meas_outcome_register(self) -> operand.Register:
         """Get an un-used measurement register."""
         # Find the next unused M-register.
-        for reg, used in self._used_meas_registers.items():
-            if not used:
-                self._used_meas_registers[reg] = True
-                return reg
-        raise RuntimeError("Ran out of M-registers")
+        index = _lowest_unset_bit(self._used_meas_registers)
+        if index >= len(_M_REGISTERS):
+            raise RuntimeError("Ran out of M-registers")
+        self._used_meas_registers |= 1 << index
+        return _M_REGISTERS[index]
 
     def reset_used_meas_registers(self) -> None:
         """Mark all measurement registers as 'not in use'."""
-        self._used_meas_registers = {
-            operand.Register(RegisterName.M, i): False for i in range(16)
-        }
+        self._used_meas_registers = 0
 
     def add_register_to_return(self, reg: operand.Register) -> None:
         """Let a register be returned at the end of the subroutine."""
@@ -124,13 +223,13 @@ class MemoryManager:
 
     def get_inactive_register(self, activate: bool = False) -> operand.Register:
         """Get an un-used register."""
-        for i in range(2**REG_INDEX_BITS):
-            register = parse_register(f"R{i}")
-            if not self.is_register_active(register):
-                if activate:
-                    self.add_active_register(register)
-                return register
-        raise RuntimeError("could not find an available loop register")
+        index = _lowest_unset_bit(self._active_r_registers)
+        if index >= len(_R_REGISTERS):
+            raise RuntimeError("could not find an available loop register")
+        register = _R_REGISTERS[index]
+        if activate:
+            self.add_active_register(register)
+        return register
 
     def get_new_array_address(self) -> int:
         """Get an un-used array address."""
@@ -108,6 +108,8 @@ class Qubit:
     def qubit_id(self, qubit_id: int) -> None:
         assert isinstance(qubit_id, int), "qubit_id should be an int"
         self._qubit_id = qubit_id
+        if self._active:
+            self.builder._mem_mgr.change_qubit_id(self)
 
     @property
     def active(self) -> bool:
@@ -402,7 +404,7 @@ class FutureQubit(Qubit):
         """
         self._conn: sdkconn.BaseNetQASMConnection = conn
 
-        self.qubit_id: Future = future_id
+        self._qubit_id: Future = future_id  # type: ignore
 
         self._activate()
 
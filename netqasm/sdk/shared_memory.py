@@ -4,7 +4,10 @@ the quantum node controller.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+import array as pyarray
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+import numpy as np
 
 from netqasm.lang import operand
 from netqasm.lang.encoding import ADDRESS_BITS, REG_INDEX_BITS, RegisterName
@@ -23,6 +26,36 @@ def _assert_within_width(value: int, width: int) -> None:
         raise OverflowError(f"value {value} does not fit into {width} bits")
 
 
+def _assert_all_within_width(values: pyarray.array, width: int) -> None:
+    """Vectorized version of `_assert_within_width` for a typed array of values."""
+    if not get_is_using_hardware() or len(values) == 0:
+        return
+    view = np.frombuffer(values, dtype=np.int64)
+    _assert_within_width(int(view.min()), width)
+    _assert_within_width(int(view.max()), width)
+
+
+# Type code of the typed buffers used by the compact memory backend.
+# Values are checked to fit `ADDRESS_BITS` (32) bits when using hardware, but
+# simulators may store wider values, so a 64-bit buffer is used.
+_COMPACT_TYPECODE = "q"
+
+# Types of values that can be stored in the typed buffers
+_INTEGER_TYPES = (int, np.integer)
+
+
+def _get_num_record_fields(length: int, dtype: np.dtype) -> int:
+    """Get the number of fields of records of type `dtype`, which should fit an
+    array of `length` entries exactly."""
+    num_fields = len(dtype.names)
+    if length % num_fields != 0:
+        raise ValueError(
+            f"Array of length {length} does not consist of records of {num_fields} "
+            "fields"
+        )
+    return num_fields
+
+
 class RegisterGroup:
     """A register group (like "R", or "Q") in shared memory."""
 
@@ -57,8 +90,46 @@ class RegisterGroup:
         ]
 
 
-def setup_registers() -> Dict[RegisterName, RegisterGroup]:
-    return {reg_name: RegisterGroup() for reg_name in RegisterName}
+class CompactRegisterGroup(RegisterGroup):
+    """A register group backed by a fixed-size typed array and a validity bitmask."""
+
+    def __init__(self):
+        self._size: int = 2**REG_INDEX_BITS
+        self._values: pyarray.array = pyarray.array(
+            _COMPACT_TYPECODE, bytes(8 * self._size)
+        )
+        self._defined: int = 0
+
+    def __str__(self) -> str:
+        return str(dict(self._get_active_values()))
+
+    def __setitem__(self, index: int, value: Optional[int]) -> None:
+        self._assert_within_length(index)
+        if value is None:
+            self._defined &= ~(1 << index)
+            return
+        _assert_within_width(value, ADDRESS_BITS)
+        self._values[index] = value
+        self._defined |= 1 << index
+
+    def __getitem__(self, index: int) -> Optional[int]:
+        self._assert_within_length(index)
+        if (self._defined >> index) & 1:
+            return self._values[index]
+        return None
+
+    def _get_active_values(self) -> List[Tuple[int, int]]:
+        return [
+            (index, value)
+            for index, value in enumerate(self._values)
+            if (self._defined >> index) & 1
+        ]
+
+
+def setup_registers(
+    register_group_class: Type[RegisterGroup] = RegisterGroup,
+) -> Dict[RegisterName, RegisterGroup]:
+    return {reg_name: register_group_class() for reg_name in RegisterName}
 
 
 class Arrays:
@@ -90,7 +161,7 @@ class Arrays:
     def __setitem__(
         self,
         key: Tuple[int, Union[int, slice]],
-        value: Union[None, int, List[Optional[int]]],
+        value: Union[None, int, List[Optional[int]], CompactArray],
     ) -> None:
         address, index = self._extract_key(key)
         if isinstance(index, int):
@@ -98,7 +169,11 @@ class Arrays:
                 _assert_within_width(value, ADDRESS_BITS)
                 _assert_within_width(index, ADDRESS_BITS)
         elif isinstance(index, slice):
-            self._assert_list(value)
+            if isinstance(value, CompactArray):
+                _assert_all_within_width(value.values, ADDRESS_BITS)
+                value = value.to_list()
+            else:
+                self._assert_list(value)
             if index.start is not None:
                 _assert_within_width(index.start, ADDRESS_BITS)
             if index.stop is not None:
@@ -138,12 +213,59 @@ class Arrays:
             raise IndexError(f"No array with address {address}")
         return self._arrays[address]
 
-    def _set_array(self, address: int, array: List[Optional[int]]) -> None:
+    def _set_array(
+        self, address: int, array: Union[List[Optional[int]], CompactArray]
+    ) -> None:
         if address not in self._arrays:
             raise IndexError(f"No array with address {address}")
+        if isinstance(array, CompactArray):
+            array = array.to_list()
         self._assert_list(array)
         self._arrays[address] = array
 
+    def _get_array_storage(
+        self, address: int
+    ) -> Union[List[Optional[int]], CompactArray]:
+        """Get the object in which the array at `address` is stored.
+
+        This object can be passed as is to `_set_array` of another `Arrays`.
+        """
+        return self._get_array(address)
+
+    def _get_array_numpy(
+        self, address: int, index: slice = slice(None)
+    ) -> np.ma.MaskedArray:
+        """Get (part of) the array at `address` as a masked NumPy array.
+
+        Undefined (`None`) entries are masked. The result is a copy.
+        """
+        part = self._get_array(address)[index]
+        values = np.fromiter(
+            (0 if value is None else value for value in part),
+            dtype=np.int64,
+            count=len(part),
+        )
+        undefined = np.fromiter(
+            (value is None for value in part), dtype=np.bool_, count=len(part)
+        )
+        return np.ma.masked_array(values, mask=undefined)
+
+    def _get_array_records(self, address: int, dtype: np.dtype) -> np.ndarray:
+        """Get the array at `address` as a NumPy array of records of type `dtype`.
+
+        `dtype` should be a structured type of numeric fields, e.g. a float field
+        for a real-valued goodness. Undefined (`None`) entries read as 0.
+        The result is a copy.
+        """
+        part = self._get_array(address)
+        num_fields = _get_num_record_fields(len(part), dtype)
+        records = np.zeros(len(part) // num_fields, dtype=dtype)
+        for i, name in enumerate(dtype.names):
+            records[name] = [
+                0 if value is None else value for value in part[i::num_fields]
+            ]
+        return records
+
     def has_array(self, address: int) -> bool:
         return address in self._arrays
 
@@ -175,6 +297,269 @@ class Arrays:
         self._arrays[address] = [None] * length
 
 
+class CompactArray:
+    """Fixed-length array of optional integers.
+
+    Values are stored in a typed buffer, together with a mask that says which
+    entries are defined (not `None`). Copying, slicing and width checks are done on
+    the buffers as a whole instead of per element.
+
+    Entries that are not integers (e.g. a real-valued goodness of an EPR result)
+    cannot be stored in the typed buffer. They are kept by index in `others`
+    instead, and read as 0 from the buffer.
+    """
+
+    __slots__ = ("values", "defined", "others")
+
+    def __init__(self, length: int = 0):
+        self.values: pyarray.array = pyarray.array(_COMPACT_TYPECODE, bytes(8 * length))
+        self.defined: bytearray = bytearray(length)
+        self.others: Optional[Dict[int, Any]] = None
+
+    @classmethod
+    def from_list(cls, values: List[Optional[int]]) -> CompactArray:
+        compact = cls()
+        try:
+            compact.values = pyarray.array(
+                _COMPACT_TYPECODE, [0 if value is None else value for value in values]
+            )
+        except TypeError:
+            compact._set_values_with_others(values)
+        compact.defined = bytearray(value is not None for value in values)
+        return compact
+
+    @classmethod
+    def from_values(cls, values: Iterable[int]) -> CompactArray:
+        """Create an array in which all entries are defined."""
+        compact = cls()
+        values = list(values)
+        try:
+            compact.values = pyarray.array(_COMPACT_TYPECODE, values)
+        except TypeError:
+            compact._set_values_with_others(values)
+        compact.defined = bytearray(b"\x01") * len(compact.values)
+        return compact
+
+    def _set_values_with_others(self, values: List[Any]) -> None:
+        others = {
+            index: value
+            for index, value in enumerate(values)
+            if value is not None and not isinstance(value, _INTEGER_TYPES)
+        }
+        self.values = pyarray.array(
+            _COMPACT_TYPECODE,
+            [
+                0 if value is None or index in others else value
+                for index, value in enumerate(values)
+            ],
+        )
+        self.others = others or None
+
+    def to_list(self) -> List[Optional[int]]:
+        if self.defined.count(0) == 0:
+            values = self.values.tolist()
+        else:
+            values = [
+                value if defined else None
+                for value, defined in zip(self.values, self.defined)
+            ]
+        if self.others is not None:
+            for index, value in self.others.items():
+                values[index] = value
+        return values
+
+    def copy(self) -> CompactArray:
+        compact = CompactArray()
+        compact.values = pyarray.array(_COMPACT_TYPECODE, self.values)
+        compact.defined = bytearray(self.defined)
+        if self.others is not None:
+            compact.others = dict(self.others)
+        return compact
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Optional[int]]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompactArray):
+            other = other.to_list()
+        return self.to_list() == other
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[None, int, List[Optional[int]]]:
+        if isinstance(index, slice):
+            if self.others is not None:
+                return self.to_list()[index]
+            part = CompactArray()
+            part.values = self.values[index]
+            part.defined = self.defined[index]
+            return part.to_list()
+        if self.defined[index]:
+            if self.others is not None:
+                value = self.others.get(index % len(self.values))
+                if value is not None:
+                    return value
+            return self.values[index]
+        return None
+
+    def __setitem__(
+        self,
+        index: Union[int, slice],
+        value: Union[None, int, List[Optional[int]], CompactArray],
+    ) -> None:
+        if isinstance(index, slice):
+            if not isinstance(value, CompactArray):
+                Arrays._assert_list(value)
+                value = CompactArray.from_list(value)  # type: ignore
+            else:
+                _assert_all_within_width(value.values, ADDRESS_BITS)
+            assert len(self.defined[index]) == len(value), "value not of correct length"
+            self.values[index] = value.values
+            self.defined[index] = value.defined
+            if self.others is not None or value.others is not None:
+                self._set_others(range(len(self.values))[index], value.others)
+        elif value is None:
+            self.defined[index] = 0
+            self._pop_other(index)
+        elif isinstance(value, _INTEGER_TYPES):
+            self.values[index] = value  # type: ignore
+            self.defined[index] = 1
+            self._pop_other(index)
+        else:
+            self.values[index] = 0
+            self.defined[index] = 1
+            if self.others is None:
+                self.others = {}
+            self.others[range(len(self.values))[index]] = value
+
+    def _pop_other(self, index: int) -> None:
+        if self.others is not None:
+            self.others.pop(range(len(self.values))[index], None)
+            if not self.others:
+                self.others = None
+
+    def _set_others(self, indices: range, others: Optional[Dict[int, Any]]) -> None:
+        """Replace the non-integer entries at `indices` by `others`, which are
+        indexed relative to the first of `indices`."""
+        if self.others is not None:
+            for index in indices:
+                self.others.pop(index, None)
+        if others is not None:
+            if self.others is None:
+                self.others = {}
+            for offset, value in others.items():
+                self.others[indices[offset]] = value
+        if not self.others:
+            self.others = None
+
+
+class CompactArrays(Arrays):
+    """Arrays backed by `CompactArray` s instead of lists."""
+
+    def __init__(self):
+        self._arrays: Dict[int, CompactArray] = {}  # type: ignore
+
+    def __setitem__(
+        self,
+        key: Tuple[int, Union[int, slice]],
+        value: Union[None, int, List[Optional[int]], CompactArray],
+    ) -> None:
+        address, index = self._extract_key(key)
+        if isinstance(index, int):
+            if isinstance(value, int):
+                _assert_within_width(value, ADDRESS_BITS)
+                _assert_within_width(index, ADDRESS_BITS)
+        elif isinstance(index, slice):
+            if index.start is not None:
+                _assert_within_width(index.start, ADDRESS_BITS)
+            if index.stop is not None:
+                _assert_within_width(index.stop, ADDRESS_BITS)
+        else:
+            raise TypeError(f"Cannot use {key} of type {type(key)} as an index")
+        compact = self._get_compact_array(address)
+        try:
+            compact[index] = value
+        except IndexError:
+            raise IndexError(
+                f"index {index} is out of range for array with address {address}"
+            )
+
+    def __getitem__(
+        self, key: Tuple[int, Union[int, slice]]
+    ) -> Union[None, int, List[Optional[int]]]:
+        address, index = self._extract_key(key)
+        compact = self._arrays.get(address)
+        if compact is None:
+            return None
+        try:
+            return compact[index]
+        except IndexError:
+            raise IndexError(
+                f"index {index} is out of range for array with address {address}"
+            )
+
+    def _get_compact_array(self, address: int) -> CompactArray:
+        if address not in self._arrays:
+            raise IndexError(f"No array with address {address}")
+        return self._arrays[address]
+
+    def _get_array(self, address: int) -> List[Optional[int]]:
+        return self._get_compact_array(address).to_list()
+
+    def _set_array(
+        self, address: int, array: Union[List[Optional[int]], CompactArray]
+    ) -> None:
+        if address not in self._arrays:
+            raise IndexError(f"No array with address {address}")
+        if isinstance(array, CompactArray):
+            _assert_all_within_width(array.values, ADDRESS_BITS)
+            _assert_within_width(len(array), ADDRESS_BITS)
+            self._arrays[address] = array
+        else:
+            self._assert_list(array)
+            self._arrays[address] = CompactArray.from_list(array)
+
+    def _get_array_storage(self, address: int) -> CompactArray:
+        return self._get_compact_array(address)
+
+    def _get_array_numpy(
+        self, address: int, index: slice = slice(None)
+    ) -> np.ma.MaskedArray:
+        compact = self._get_compact_array(address)
+        values = np.frombuffer(compact.values, dtype=np.int64)[index]
+        defined = np.frombuffer(compact.defined, dtype=np.bool_)[index]
+        return np.ma.masked_array(values.copy(), mask=~defined)
+
+    def _get_array_records(self, address: int, dtype: np.dtype) -> np.ndarray:
+        """Get the array at `address` as a NumPy array of records of type `dtype`,
+        copied per field from its typed buffer.
+
+        Undefined entries have an unspecified value. The result is a copy, since a
+        view would change with later writes and prevent resizing the buffer.
+        """
+        compact = self._get_compact_array(address)
+        num_fields = _get_num_record_fields(len(compact), dtype)
+        columns = np.frombuffer(compact.values, dtype=np.int64).reshape(-1, num_fields)
+        records = np.empty(len(columns), dtype=dtype)
+        for i, name in enumerate(dtype.names):
+            records[name] = columns[:, i]
+        if compact.others is not None:
+            for index, value in compact.others.items():
+                row, field = divmod(index, num_fields)
+                records[dtype.names[field]][row] = value
+        return records
+
+    def init_new_array(self, address: int, length: int) -> None:
+        _assert_within_width(address, ADDRESS_BITS)
+        self._arrays[address] = CompactArray(length)
+
+
 class SharedMemory:
     """Representation of the classical memory that is shared between the Host
     and the quantum node controller.
@@ -202,9 +587,15 @@ class SharedMemory:
     controller in the same process might e.g. use a global shared object.
     """
 
+    # Classes used for the registers and arrays. May be different for subclasses.
+    register_group_class: Type[RegisterGroup] = RegisterGroup
+    arrays_class: Type[Arrays] = Arrays
+
     def __init__(self):
-        self._registers: Dict[RegisterName, RegisterGroup] = setup_registers()
-        self._arrays: Arrays = Arrays()
+        self._registers: Dict[RegisterName, RegisterGroup] = setup_registers(
+            self.register_group_class
+        )
+        self._arrays: Arrays = self.arrays_class()
 
     def __getitem__(
         self, key: Union[operand.Register, Tuple[int, Union[int, slice]], int]
@@ -247,11 +638,35 @@ class SharedMemory:
     def _get_array(self, address: int) -> List[Optional[int]]:
         return self._arrays._get_array(address)
 
+    def has_array(self, address: int) -> bool:
+        return self._arrays.has_array(address)
+
+    def get_array_numpy(
+        self, address: int, index: slice = slice(None)
+    ) -> np.ma.MaskedArray:
+        """Get (part of) an array as a NumPy integer array, in a single call.
+
+        :param address: address of the array
+        :param index: slice of the array to get, defaults to the full array
+        :return: masked array (copy) in which undefined entries are masked
+        """
+        return self._arrays._get_array_numpy(address, index)
+
+    def get_array_records(self, address: int, dtype: np.dtype) -> np.ndarray:
+        """Get an array as a NumPy array of records, e.g. one record per EPR result.
+
+        :param address: address of the array
+        :param dtype: structured type with numeric fields, the length of the array
+            should be a multiple of the number of fields
+        :return: array of records, which is a copy
+        """
+        return self._arrays._get_array_records(address, dtype)
+
     def init_new_array(
         self,
         address: int,
         length: int = 1,
-        new_array: Optional[List[Optional[int]]] = None,
+        new_array: Union[None, List[Optional[int]], CompactArray] = None,
     ) -> None:
         if new_array is not None:
             length = len(new_array)
@@ -276,6 +691,13 @@ class SharedMemory:
         return all_values
 
 
+class CompactSharedMemory(SharedMemory):
+    """Shared memory using the compact (typed buffer) registers and arrays."""
+
+    register_group_class = CompactRegisterGroup
+    arrays_class = CompactArrays
+
+
 class SharedMemoryManager:
     """Global object that manages shared memories. Typically used by simulators.
 
@@ -289,14 +711,17 @@ class SharedMemoryManager:
 
     @classmethod
     def create_shared_memory(
-        cls, node_name: str, key: Optional[int] = None
+        cls,
+        node_name: str,
+        key: Optional[int] = None,
+        memory_class: Type[SharedMemory] = SharedMemory,
     ) -> SharedMemory:
         absolute_key = (node_name, key)
         if cls._MEMORIES.get(absolute_key) is not None:
             raise RuntimeError(
                 f"Shared memory for (node, key): ({node_name}, {key}) already exists."
             )
-        memory = SharedMemory()
+        memory = memory_class()
         cls._MEMORIES[absolute_key] = memory
         return memory
 
@@ -1,6 +1,7 @@
-import inspect
 import os
-from typing import Optional
+import sys
+from types import CodeType
+from typing import Dict, Optional, Tuple
 
 
 class HostLine:
@@ -32,36 +33,36 @@ class LineTracker:
             lib_dirs = []
         self.lib_dirs = [os.path.abspath(dir) for dir in lib_dirs]
 
+        # Directories of which the lines are tracked, as prefixes of absolute paths
+        self._dirs: Tuple[str, ...] = tuple(self.lib_dirs) + (self.app_dir,)
+
+        # For each code object (`f_code`) seen so far, the absolute path of its
+        # file if it is in one of the tracked directories and None otherwise.
+        # This way `_get_file_from_frame` is only called once per code object.
+        self._tracked_code: Dict[CodeType, Optional[str]] = {}
+
     def _get_file_from_frame(self, frame):
         return os.path.abspath(frame.f_code.co_filename)
 
+    def _get_tracked_file(self, frame) -> Optional[str]:
+        abs_filename = self._get_file_from_frame(frame)
+        tracked = abs_filename if abs_filename.startswith(self._dirs) else None
+        self._tracked_code[frame.f_code] = tracked
+        return tracked
+
     def get_line(self) -> Optional[HostLine]:
         if not self._track_lines:
             return None
 
-        frame = inspect.currentframe()
-        assert frame is not None
-
-        frame_found = False
-        while not frame_found:
-            frame_file = self._get_file_from_frame(frame)
-
-            # first check if it's coming from one of the lib directories
-            for lib_dir in self.lib_dirs:
-                if frame_file.startswith(lib_dir):
-                    frame_found = True
-                    break
-
-            # check in app directory itself
-            if frame_file.startswith(self.app_dir):
-                frame_found = True
-
-            if frame_found:
-                break
-
-            frame = frame.f_back
-            if frame is None:
-                raise RuntimeError(f"No frame found in directory {self.app_dir}")
-
-        filename = os.path.abspath(frame.f_code.co_filename)
-        return HostLine(filename, frame.f_lineno)
+        tracked_code = self._tracked_code
+        frame = sys._getframe()
+        while frame is not None:
+            try:
+                tracked = tracked_code[frame.f_code]
+            except KeyError:
+                tracked = self._get_tracked_file(frame)
+            if tracked is not None:
+                return HostLine(tracked, frame.f_lineno)
+            frame = frame.f_back  # type: ignore
+
+        raise RuntimeError(f"No frame found in directory {self.app_dir}")
@@ -1,5 +1,7 @@
+from functools import lru_cache
+from typing import Sequence, Tuple
+
 import numpy as np
-from scipy import linalg
 
 from netqasm.lang.ir import GenericInstr
 
@@ -31,14 +33,26 @@ STATIC_QUBIT_GATE_TO_MATRIX = {
 }
 
 
+# Maximum number of matrices kept by `get_rotation_matrix_from_fraction` and
+# `get_controlled_rotation_matrix_from_fraction` (each)
+ROTATION_MATRIX_CACHE_SIZE = 1024
+
+
 def get_rotation_matrix(axis, angle) -> np.ndarray:
     """Returns a single-qubit rotation matrix given an axis and an angle"""
-    norm = linalg.norm(axis)
+    norm = np.linalg.norm(axis)
     if norm == 0:
         raise ValueError("Axis need to have non-negative norm")
-    axis = axis / norm
-    rot_mat = linalg.expm(-1j * angle / 2 * sum(a * P for a, P in zip(axis, PAULIS)))
-    return rot_mat  # type: ignore
+    nx, ny, nz = np.asarray(axis, dtype=float) / norm
+    # exp(-i angle/2 (axis . paulis)) = cos(angle/2) I - i sin(angle/2) (axis . paulis)
+    c = np.cos(angle / 2)
+    s = np.sin(angle / 2)
+    return np.array(
+        [
+            [c - 1j * s * nz, -1j * s * nx - s * ny],
+            [-1j * s * nx + s * ny, c + 1j * s * nz],
+        ]
+    )
 
 
 def get_controlled_rotation_matrix(axis, angle) -> np.ndarray:
@@ -54,6 +68,46 @@ def get_controlled_rotation_matrix(axis, angle) -> np.ndarray:
     return inv_controlled_gate @ controlled_gate
 
 
+def get_rotation_matrix_from_fraction(
+    axis: Sequence[float], n: int, d: int
+) -> np.ndarray:
+    """Returns a single-qubit rotation matrix given an axis and an angle `n * pi / 2^d`.
+
+    Matrices are cached per `(axis, n, d)`, the returned array is a copy of the
+    cached one.
+    """
+    return _get_rotation_matrix_from_fraction(tuple(axis), n, d).copy()
+
+
+def get_controlled_rotation_matrix_from_fraction(
+    axis: Sequence[float], n: int, d: int
+) -> np.ndarray:
+    """Returns a controlled rotation matrix given an axis and an angle `n * pi / 2^d`.
+
+    Matrices are cached per `(axis, n, d)`, the returned array is a copy of the
+    cached one.
+    """
+    return _get_controlled_rotation_matrix_from_fraction(tuple(axis), n, d).copy()
+
+
+@lru_cache(maxsize=ROTATION_MATRIX_CACHE_SIZE)
+def _get_rotation_matrix_from_fraction(
+    axis: Tuple[float, ...], n: int, d: int
+) -> np.ndarray:
+    matrix = get_rotation_matrix(axis, n * np.pi / 2**d)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=ROTATION_MATRIX_CACHE_SIZE)
+def _get_controlled_rotation_matrix_from_fraction(
+    axis: Tuple[float, ...], n: int, d: int
+) -> np.ndarray:
+    matrix = get_controlled_rotation_matrix(axis, n * np.pi / 2**d)
+    matrix.setflags(write=False)
+    return matrix
+
+
 def gate_to_matrix(instr, angle=None):
     """Returns the matrix representation of a quantum gate"""
     if instr in STATIC_QUBIT_GATE_TO_MATRIX:
@@ -64,13 +118,13 @@ def gate_to_matrix(instr, angle=None):
                 "To get the matrix of a rotation an angle needs to be specified"
             )
         axis = {
-            GenericInstr.ROT_X: [1, 0, 0],
-            GenericInstr.ROT_Y: [0, 1, 0],
-            GenericInstr.ROT_Z: [0, 0, 1],
+            GenericInstr.ROT_X: (1, 0, 0),
+            GenericInstr.ROT_Y: (0, 1, 0),
+            GenericInstr.ROT_Z: (0, 0, 1),
         }[instr]
         if isinstance(angle, tuple):
             n, d = angle
-            angle = n * np.pi / 2**d
+            return get_rotation_matrix_from_fraction(axis=axis, n=n, d=d)
         return get_rotation_matrix(axis=axis, angle=angle)
     else:
         raise ValueError(f"{instr} is not a quantum gate")
@@ -2,12 +2,16 @@ import logging
 
 import pytest
 
-from netqasm.backend.executor import Executor
+from netqasm.backend.executor import EprCmdData, Executor
+from netqasm.backend.network_stack import OK_FIELDS_K, OK_FIELDS_M
 from netqasm.lang.encoding import RegisterName
+from netqasm.lang.instr.core import AddInstruction, JmpInstruction, SetInstruction
 from netqasm.lang.operand import Register
 from netqasm.lang.parsing import parse_text_subroutine
 from netqasm.logging.glob import set_log_level
-from netqasm.sdk.shared_memory import SharedMemoryManager
+from netqasm.qlink_compat import LinkLayerOKTypeK, LinkLayerOKTypeM
+from netqasm.sdk.build_epr import RESPONSE_MEASURE_DTYPE
+from netqasm.sdk.shared_memory import CompactArrays, SharedMemoryManager
 
 
 @pytest.mark.parametrize(
@@ -115,6 +119,236 @@ def test_failing_executor(subroutine_str, error_type, error_line):
     assert str(exc.value).startswith(f"At line {error_line}")
 
 
+def test_instr_handler_table():
+    subroutine = parse_text_subroutine(
+        """
+        # NETQASM 1.0
+        # APPID 0
+        set R0 0
+        LOOP:
+        beq R0 10 EXIT
+        add R0 R0 1
+        jmp LOOP
+        EXIT:
+        """
+    )
+
+    SharedMemoryManager.reset_memories()
+
+    executor = Executor()
+    executor.init_new_application(app_id=0, max_qubits=1)
+    executor.consume_execute_subroutine(subroutine=subroutine)
+
+    table = executor._instr_handler_table
+    assert set(table.keys()) == {type(instr) for instr in subroutine.instructions}
+    assert table[SetInstruction] == executor._instruction_handlers["set"]
+    assert table[AddInstruction] == executor._handle_binary_classical_instr
+    assert table[JmpInstruction] == executor._handle_branch_instr
+
+    with pytest.raises(TypeError):
+        executor._resolve_instr_handler(int)
+
+
+class _NodeExecutor(Executor):
+    @property
+    def node_id(self) -> int:
+        return 0
+
+
+def _new_node_executor(executor_class=_NodeExecutor):
+    """Get an executor with app 0 and a subroutine with ID 0 for handling EPR
+    responses."""
+    SharedMemoryManager.reset_memories()
+    executor = executor_class()
+    executor.init_new_application(app_id=0, max_qubits=1)
+    executor._subroutines[0] = parse_text_subroutine(
+        """
+        # NETQASM 1.0
+        # APPID 0
+        set R0 0
+        """
+    )
+    return executor
+
+
+def test_many_epr_responses():
+    executor = _new_node_executor()
+
+    num_pairs = 2000
+    executor._app_arrays[0].init_new_array(0, num_pairs * OK_FIELDS_M)
+
+    # Responses arriving before the request are kept pending
+    remote_node_id, purpose_id = 1, 0
+    for i in range(num_pairs):
+        executor._handle_epr_response(
+            LinkLayerOKTypeM(
+                measurement_outcome=i % 2,
+                directionality_flag=1,
+                sequence_number=i,
+                purpose_id=purpose_id,
+                remote_node_id=remote_node_id,
+            )
+        )
+    assert len(executor._pending_epr_responses) == 1
+
+    executor._epr_recv_requests[remote_node_id, purpose_id].append(
+        EprCmdData(
+            subroutine_id=0,
+            ent_results_array_address=0,
+            q_array_address=None,
+            request=None,
+            tot_pairs=num_pairs,
+            pairs_left=num_pairs,
+        )
+    )
+    executor._handle_pending_epr_responses()
+
+    assert len(executor._pending_epr_responses) == 0
+    assert len(executor._epr_recv_requests[remote_node_id, purpose_id]) == 0
+    ent_info = executor._app_arrays[0][0, :]
+    sequence_numbers = ent_info[5::OK_FIELDS_M]
+    assert sequence_numbers == list(range(num_pairs))
+
+
+class _StoringExecutor(_NodeExecutor):
+    """Executor that overrides how the results of pairs are stored."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stored_pairs = []
+
+    def _store_ent_infos(self, epr_cmd_data, responses, first_pair_index):
+        self.stored_pairs.append((first_pair_index, len(responses)))
+        super()._store_ent_infos(epr_cmd_data, responses, first_pair_index)
+
+
+@pytest.mark.parametrize("executor_class", [_NodeExecutor, _StoringExecutor])
+def test_handle_epr_responses_batch(executor_class):
+    executor = _new_node_executor(executor_class)
+
+    # Two requests for 3 and 5 pairs, with results in the arrays at 0 and 1
+    remote_node_id, purpose_id = 1, 0
+    num_pairs = [3, 5]
+    epr_cmd_datas = []
+    for address, tot_pairs in enumerate(num_pairs):
+        executor._app_arrays[0].init_new_array(address, tot_pairs * OK_FIELDS_M)
+        epr_cmd_data = EprCmdData(
+            subroutine_id=0,
+            ent_results_array_address=address,
+            q_array_address=None,
+            request=None,
+            tot_pairs=tot_pairs,
+            pairs_left=tot_pairs,
+        )
+        executor._epr_recv_requests[remote_node_id, purpose_id].append(epr_cmd_data)
+        epr_cmd_datas.append(epr_cmd_data)
+
+    responses = [
+        LinkLayerOKTypeM(
+            directionality_flag=1,
+            sequence_number=i,
+            purpose_id=purpose_id,
+            remote_node_id=remote_node_id,
+        )
+        for i in range(sum(num_pairs) - 1)
+    ]
+    executor.handle_epr_responses(responses)
+
+    assert [data.pairs_left for data in epr_cmd_datas] == [0, 1]
+    assert len(executor._epr_recv_requests[remote_node_id, purpose_id]) == 1
+    assert executor._app_arrays[0][0, 5::OK_FIELDS_M] == [0, 1, 2]
+    assert executor._app_arrays[0][1, 5::OK_FIELDS_M] == [3, 4, 5, 6, None]
+    if executor_class is _StoringExecutor:
+        assert executor.stored_pairs == [(0, 3), (0, 4)]
+
+    # The deprecated method for a single pair stores it the same way
+    executor._store_ent_info(epr_cmd_datas[1], responses[0], pair_index=4)
+    assert executor._app_arrays[0][1, 5::OK_FIELDS_M] == [3, 4, 5, 6, 0]
+
+
+def test_epr_response_waits_for_qfree():
+    executor = _new_node_executor()
+
+    # Results at array 0, the pair goes to virtual address 0 (listed in array 1)
+    executor._app_arrays[0].init_new_array(0, OK_FIELDS_K)
+    executor._app_arrays[0].init_new_array(1, 1)
+    executor._app_arrays[0][1, 0] = 0
+    executor._allocate_physical_qubit(subroutine_id=0, virtual_address=0)
+
+    remote_node_id, purpose_id = 1, 0
+    executor._epr_recv_requests[remote_node_id, purpose_id].append(
+        EprCmdData(
+            subroutine_id=0,
+            ent_results_array_address=0,
+            q_array_address=1,
+            request=None,
+            tot_pairs=1,
+            pairs_left=1,
+        )
+    )
+
+    # The virtual address is in use, so the response has to wait
+    executor.handle_epr_responses(
+        [
+            LinkLayerOKTypeK(
+                directionality_flag=1,
+                sequence_number=0,
+                purpose_id=purpose_id,
+                remote_node_id=remote_node_id,
+                logical_qubit_id=1,
+            )
+        ]
+    )
+    assert len(executor._pending_epr_responses) == 1
+
+    # Freeing the qubit lets the response be handled
+    list(executor._free_physical_qubit(subroutine_id=0, address=0))
+    assert len(executor._pending_epr_responses) == 0
+    assert len(executor._epr_recv_requests[remote_node_id, purpose_id]) == 0
+    assert executor._get_unit_module(0)[0] == 1
+
+
+class _CompactNodeExecutor(_NodeExecutor):
+    arrays_class = CompactArrays
+
+
+@pytest.mark.parametrize("executor_class", [_NodeExecutor, _CompactNodeExecutor])
+def test_epr_response_with_float_goodness(executor_class):
+    executor = _new_node_executor(executor_class)
+    executor._app_arrays[0].init_new_array(0, OK_FIELDS_M)
+
+    remote_node_id, purpose_id = 1, 0
+    executor._epr_recv_requests[remote_node_id, purpose_id].append(
+        EprCmdData(
+            subroutine_id=0,
+            ent_results_array_address=0,
+            q_array_address=None,
+            request=None,
+            tot_pairs=1,
+            pairs_left=1,
+        )
+    )
+    executor.handle_epr_responses(
+        [
+            LinkLayerOKTypeM(
+                directionality_flag=1,
+                sequence_number=3,
+                purpose_id=purpose_id,
+                remote_node_id=remote_node_id,
+                goodness=0.93,
+            )
+        ]
+    )
+
+    ent_info = executor._app_arrays[0][0, :]
+    assert ent_info[LinkLayerOKTypeM._fields.index("goodness")] == 0.93
+    assert ent_info[5] == 3
+
+    records = executor._app_arrays[0]._get_array_records(0, RESPONSE_MEASURE_DTYPE)
+    assert records["goodness"][0] == 0.93
+    assert records["sequence_number"][0] == 3
+
+
 if __name__ == "__main__":
     subroutine_str = """
         # NETQASM 1.0
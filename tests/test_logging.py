@@ -0,0 +1,336 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from netqasm.backend.executor import Executor
+from netqasm.backend.state_vector import StateVectorExecutor
+from netqasm.lang.instr.core import AddInstruction, SetInstruction
+from netqasm.lang.instr.vanilla import GateHInstruction, GateXInstruction
+from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.logging.output import (
+    InstrLogFilter,
+    InstrLogger,
+    NetworkLogger,
+    StreamFormat,
+    load_streamed_log,
+    reset_struct_loggers,
+    save_all_struct_loggers,
+)
+from netqasm.qlink_compat import RequestType
+from netqasm.sdk.config import LogConfig
+from netqasm.sdk.shared_memory import SharedMemoryManager
+from netqasm.util.log import LineTracker
+from netqasm.util.yaml import load_yaml
+
+
+def _log_network_entries(logger, num):
+    for i in range(num):
+        logger.log(
+            sim_time=i,
+            ent_type=RequestType.K,
+            meas_bases=None,
+            meas_outcomes=None,
+            ent_stage="start",
+            nodes=["alice", "bob"],
+            path=None,
+            qubit_ids=[i],
+            qubit_groups=None,
+            msg=f"entry {i}",
+        )
+
+
+def _without_wall_time(entries):
+    return [{k: v for k, v in entry.items() if k != "WCT"} for entry in entries]
+
+
+def test_streaming_network_logger(tmp_path):
+    yaml_logger = NetworkLogger(os.path.join(tmp_path, "yaml_network.yaml"))
+    stream_logger = NetworkLogger(
+        os.path.join(tmp_path, "stream_network.yaml"),
+        stream_format=StreamFormat.JSONL,
+        stream_buffer_size=4,
+    )
+    assert stream_logger.filepath.endswith("stream_network.jsonl")
+
+    _log_network_entries(yaml_logger, 100)
+    _log_network_entries(stream_logger, 100)
+    yaml_logger.save()
+    stream_logger.save()
+    # Entries are not kept in memory when streaming
+    assert len(stream_logger._storage) == 0
+
+    expected = _without_wall_time(load_yaml(yaml_logger.filepath))
+    assert _without_wall_time(load_streamed_log(stream_logger.filepath)) == expected
+
+    # Logging can continue after saving
+    _log_network_entries(stream_logger, 1)
+    stream_logger.close()
+    assert len(load_streamed_log(stream_logger.filepath)) == 101
+
+    reset_struct_loggers()
+
+
+class _InstrLogger(InstrLogger):
+    @classmethod
+    def _get_qubit_groups(cls):
+        return None
+
+    def _get_node_name(self):
+        return "alice"
+
+
+class _InstrLoggingExecutor(StateVectorExecutor):
+    instr_logger_class = _InstrLogger
+
+
+class _StreamingInstrLogger(_InstrLogger):
+    stream_format = StreamFormat.JSONL
+
+
+class _StreamingExecutor(StateVectorExecutor):
+    instr_logger_class = _StreamingInstrLogger
+
+
+SUBROUTINE = """
+# NETQASM 1.0
+# APPID 0
+set Q0 0
+qalloc Q0
+init Q0
+x Q0
+rot_z Q0 3 2
+set R0 0
+add R0 R0 1
+meas Q0 M0
+qfree Q0
+"""
+
+
+def test_streaming_instr_logger(tmp_path):
+    subroutine = parse_text_subroutine(SUBROUTINE)
+
+    SharedMemoryManager.reset_memories()
+
+    executor = _StreamingExecutor(name="alice")
+    executor.set_instr_logger(str(tmp_path))
+    executor.init_new_application(app_id=0, max_qubits=1)
+    executor.consume_execute_subroutine(subroutine=subroutine)
+    executor._instr_logger.save()
+
+    entries = load_streamed_log(os.path.join(tmp_path, "alice_instrs.jsonl"))
+    assert [entry["INS"] for entry in entries] == ["init", "x", "rot_z", "meas"]
+    assert entries[-1]["OUT"] == 1
+
+    reset_struct_loggers()
+
+
+@pytest.mark.parametrize("stream_format", [None, StreamFormat.JSONL])
+def test_deferred_instr_logger(tmp_path, stream_format):
+    subroutine = parse_text_subroutine(SUBROUTINE)
+
+    SharedMemoryManager.reset_memories()
+
+    executor = StateVectorExecutor(name="alice")
+    executor.init_new_application(app_id=0, max_qubits=1)
+    eager_logger = _InstrLogger(os.path.join(tmp_path, "eager.yaml"), executor)
+    deferred_logger = _InstrLogger(
+        os.path.join(tmp_path, "deferred.yaml"),
+        executor,
+        stream_format=stream_format,
+        deferred=True,
+    )
+
+    executor._instr_logger = eager_logger
+    executor.consume_execute_subroutine(subroutine=subroutine)
+    executor._instr_logger = deferred_logger
+    executor.consume_execute_subroutine(subroutine=subroutine)
+
+    # Entries are only recorded, not constructed, while logging
+    if stream_format is None:
+        assert all(isinstance(entry, tuple) for entry in deferred_logger._storage)
+    deferred_logger.save()
+    if stream_format is None:
+        deferred_entries = load_yaml(deferred_logger.filepath)
+    else:
+        deferred_entries = load_streamed_log(deferred_logger.filepath)
+
+    eager_entries = eager_logger.get_entries()
+    assert len(eager_entries) == 4
+    for eager_entry, deferred_entry in zip(eager_entries, deferred_entries):
+        eager_entry.pop("WCT")
+        deferred_entry.pop("WCT")
+        eager_entry.pop("SID")
+        deferred_entry.pop("SID")
+        assert eager_entry == deferred_entry
+
+    reset_struct_loggers()
+
+
+@pytest.mark.parametrize(
+    "log_config, expected",
+    [
+        (LogConfig(), [(0, "init"), (0, "x"), (0, "rot_z"), (0, "meas")] * 3),
+        (
+            LogConfig(instr_log_subroutine_interval=2),
+            [(0, "init"), (0, "x"), (0, "rot_z"), (0, "meas")] * 2,
+        ),
+        (LogConfig(instr_log_app_ids=[1]), []),
+        (LogConfig(instr_log_mnemonics=["x", "add"]), [(0, "x")] * 3),
+    ],
+)
+def test_instr_log_filter(tmp_path, log_config, expected):
+    subroutine = parse_text_subroutine(SUBROUTINE)
+
+    SharedMemoryManager.reset_memories()
+
+    executor = _InstrLoggingExecutor(name="alice", log_config=log_config)
+    executor.set_instr_logger(str(tmp_path))
+    executor.init_new_application(app_id=0, max_qubits=1)
+    for _ in range(3):
+        executor.consume_execute_subroutine(subroutine=subroutine)
+
+    entries = executor._instr_logger.get_entries()
+    assert [(entry["AID"], entry["INS"]) for entry in entries] == expected
+
+    reset_struct_loggers()
+
+
+def test_instr_log_filter_quantum_only(tmp_path):
+    # Classical instructions with qubit registers as operands are logged too,
+    # unless only quantum instructions are logged
+    subroutine = parse_text_subroutine(
+        """
+# NETQASM 1.0
+# APPID 0
+set Q0 0
+qalloc Q0
+init Q0
+add Q1 Q0 0
+x Q1
+qfree Q0
+"""
+    )
+
+    for quantum_only, expected in [
+        (False, ["init", "add", "x"]),
+        (True, ["init", "x"]),
+    ]:
+        SharedMemoryManager.reset_memories()
+        executor = _InstrLoggingExecutor(
+            name="alice", log_config=LogConfig(instr_log_quantum_only=quantum_only)
+        )
+        executor.set_instr_logger(str(tmp_path))
+        executor.init_new_application(app_id=0, max_qubits=1)
+        executor.consume_execute_subroutine(subroutine=subroutine)
+
+        entries = executor._instr_logger.get_entries()
+        assert [entry["INS"] for entry in entries] == expected
+
+        reset_struct_loggers()
+
+
+def test_close_streaming_logger(tmp_path):
+    logger = NetworkLogger(
+        os.path.join(tmp_path, "network.yaml"), stream_format=StreamFormat.JSONL
+    )
+    _log_network_entries(logger, 3)
+    logger.close()
+    assert logger.closed
+    with pytest.raises(RuntimeError):
+        _log_network_entries(logger, 1)
+
+    # Saving all loggers (e.g. at shutdown) does not overwrite the streamed log
+    save_all_struct_loggers()
+    logger.save()
+    assert len(load_streamed_log(logger.filepath)) == 3
+
+
+def test_streaming_logger_at_exit(tmp_path):
+    filepath = os.path.join(tmp_path, "network.jsonl")
+    # Log without closing the logger, which should then be closed at exit
+    code = f"""
+from netqasm.logging.output import NetworkLogger, StreamFormat
+from netqasm.qlink_compat import RequestType
+
+logger = NetworkLogger({filepath!r}, stream_format=StreamFormat.JSONL)
+for i in range(100):
+    logger.log(
+        sim_time=i, ent_type=RequestType.K, meas_bases=None, meas_outcomes=None,
+        ent_stage="start", nodes=["alice", "bob"], path=None, qubit_ids=[i],
+        qubit_groups=None, msg=f"entry {{i}}",
+    )
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert len(load_streamed_log(filepath)) == 100
+
+
+def test_instr_log_filter_per_executor(tmp_path):
+    subroutine = parse_text_subroutine(SUBROUTINE)
+
+    SharedMemoryManager.reset_memories()
+
+    executor = _InstrLoggingExecutor(
+        name="shared",
+        instr_log_dir=str(tmp_path),
+        log_config=LogConfig(instr_log_mnemonics=["x"]),
+    )
+    # Another executor of the same node shares the logger, but not the filter
+    other_executor = _InstrLoggingExecutor(
+        name="shared",
+        instr_log_dir=str(tmp_path),
+        log_config=LogConfig(instr_log_mnemonics=["meas"]),
+    )
+    assert other_executor._instr_logger is executor._instr_logger
+    executor.init_new_application(app_id=0, max_qubits=1)
+    executor.consume_execute_subroutine(subroutine=subroutine)
+
+    entries = executor._instr_logger.get_entries()
+    assert [entry["INS"] for entry in entries] == ["x"]
+
+    del Executor._INSTR_LOGGERS["shared"]
+    reset_struct_loggers()
+
+
+def test_instr_log_filter_classes():
+    log_filter = InstrLogFilter(quantum_only=True, mnemonics=["add", "h", "set"])
+    assert log_filter.should_log(0, 0, GateHInstruction())
+    assert not log_filter.should_log(0, 0, GateXInstruction())
+    assert not log_filter.should_log(0, 0, AddInstruction())
+    assert not log_filter.should_log(0, 0, SetInstruction())
+
+    with pytest.raises(ValueError):
+        InstrLogFilter(subroutine_interval=0)
+
+
+def test_line_tracker(tmp_path):
+    assert LineTracker(LogConfig()).get_line() is None
+
+    tracker = LineTracker(
+        LogConfig(track_lines=True, app_dir=os.path.dirname(__file__))
+    )
+    for _ in range(2):
+        lineno = sys._getframe().f_lineno + 1
+        line = tracker.get_line()
+        assert line.filename == os.path.abspath(__file__)
+        assert line.lineno == lineno
+    code = sys._getframe().f_code
+    assert tracker._tracked_code[code] == os.path.abspath(__file__)
+
+    tracker = LineTracker(LogConfig(track_lines=True, app_dir=str(tmp_path)))
+    with pytest.raises(RuntimeError):
+        tracker.get_line()
+
+
+class _MovedLineTracker(LineTracker):
+    """Line tracker for source files that were moved to the app directory."""
+
+    def _get_file_from_frame(self, frame):
+        return os.path.join(self.app_dir, os.path.basename(frame.f_code.co_filename))
+
+
+def test_line_tracker_file_from_frame(tmp_path):
+    tracker = _MovedLineTracker(LogConfig(track_lines=True, app_dir=str(tmp_path)))
+    line = tracker.get_line()
+    assert os.path.dirname(line.filename) == str(tmp_path)
@@ -0,0 +1,61 @@
+import copy
+import pickle
+
+import pytest
+
+from netqasm.lang.encoding import RegisterName
+from netqasm.lang.operand import (
+    Address,
+    ArrayEntry,
+    ArraySlice,
+    Immediate,
+    Label,
+    Register,
+    Template,
+)
+from netqasm.lang.parsing import parse_register
+
+
+def test_interned_registers():
+    register = Register(RegisterName.R, 3)
+    assert Register(name=RegisterName.R, index=3) is register
+    assert parse_register("R3") is register
+    assert Register.from_str("R3") is register
+    assert Register.from_raw(register.cstruct) is register
+    assert register is not Register(RegisterName.Q, 3)
+
+    # Registers that cannot be encoded are not interned, but can still be created
+    register = parse_register("R16")
+    assert register == Register(RegisterName.R, 16)
+    assert register is not Register(RegisterName.R, 16)
+    with pytest.raises(KeyError):
+        Register.from_str("R16")
+
+
+def test_interned_immediates():
+    assert Immediate(0) is Immediate(value=0)
+    assert Immediate(-1) is Immediate(-1)
+    assert Immediate(1000) == Immediate(1000)
+    assert Immediate(1000) is not Immediate(1000)
+    assert Immediate(True).value is True
+
+
+@pytest.mark.parametrize(
+    "operand",
+    [
+        Immediate(1),
+        Immediate(1000),
+        Register(RegisterName.M, 15),
+        Address(2),
+        ArrayEntry(2, Register(RegisterName.R, 0)),
+        ArraySlice(2, Register(RegisterName.R, 0), Register(RegisterName.R, 1)),
+        Label("LOOP"),
+        Template("value"),
+    ],
+)
+def test_copy_operand(operand):
+    assert not hasattr(operand, "__dict__")
+    for copied in [pickle.loads(pickle.dumps(operand)), copy.deepcopy(operand)]:
+        assert copied == operand
+        if isinstance(operand, Register):
+            assert copied is operand
@@ -1,5 +1,14 @@
-from netqasm.lang.instr.vanilla import CphaseInstruction
+import random
+
+import pytest
+
+from netqasm.lang.encoding import COMMAND_BYTES
+from netqasm.lang.instr import DebugInstruction, NetQASMInstruction
+from netqasm.lang.instr.flavour import NVFlavour, VanillaFlavour
+from netqasm.lang.instr.vanilla import CphaseInstruction, GateXInstruction
+from netqasm.lang.operand import Register, RegisterName
 from netqasm.lang.parsing import deserialize, parse_text_subroutine
+from netqasm.lang.subroutine import Subroutine
 
 
 def test():
@@ -99,6 +108,116 @@ def test_deserialize_subroutine():
     print(subroutine2)
 
 
+def test_deserialize_buffer_types():
+    subroutine = """
+# NETQASM 0.0
+# APPID 3
+# DEFINE ms @0
+
+set Q0 0
+array 10 $ms
+set R0 0
+LOOP:
+beq R0 10 EXIT
+qalloc Q0
+init Q0
+rot_x Q0 1 4
+meas Q0 M0
+store M0 $ms[R0]
+qfree Q0
+add R0 R0 1
+jmp LOOP
+EXIT:
+ret_arr $ms
+"""
+
+    subroutine = parse_text_subroutine(subroutine)
+    data = bytes(subroutine)
+
+    for raw in [data, bytearray(data), memoryview(data)]:
+        parsed_subroutine = deserialize(raw)
+        assert parsed_subroutine.app_id == 3
+        assert parsed_subroutine.netqasm_version == subroutine.netqasm_version
+        assert parsed_subroutine.instructions == subroutine.instructions
+
+
+def test_deserialize_invalid_length():
+    metadata = b"\x00\x00\x00\x00"
+    with pytest.raises(ValueError):
+        deserialize(metadata + b"\x1F\x00\x00")
+
+
+@pytest.mark.parametrize("flavour", [VanillaFlavour(), NVFlavour()])
+def test_pack_into(flavour):
+    rng = random.Random(0)
+    instructions = []
+    for instr_cls in flavour.id_map.values():
+        for _ in range(10):
+            raw = bytes([instr_cls.id]) + bytes(
+                rng.randrange(256) for _ in range(COMMAND_BYTES - 1)
+            )
+            instr = instr_cls.deserialize_from(raw)
+            buffer = bytearray(COMMAND_BYTES)
+            assert instr.pack_into(buffer, 0) == COMMAND_BYTES
+            assert buffer == instr.serialize()
+            instructions.append(instr)
+    instructions.append(DebugInstruction(text="not serialized"))
+
+    subroutine = Subroutine(instructions=instructions, app_id=5)
+    data = bytes(subroutine)
+    assert data == b"".join(bytes(cstruct) for cstruct in subroutine.cstructs)
+
+    parsed_subroutine = deserialize(data, flavour=flavour)
+    assert parsed_subroutine.app_id == 5
+    assert parsed_subroutine.instructions == instructions[:-1]
+    assert bytes(parsed_subroutine) == data
+
+
+def test_pack_out_of_range():
+    subroutine = """
+# NETQASM 0.0
+# APPID 0
+set R0 -5
+set R1 2147483648
+rot_x Q0 300 -1
+array 10 @-2
+store R0 @4294967297[R1]
+"""
+
+    subroutine = parse_text_subroutine(subroutine)
+    data = bytes(subroutine)
+    assert data == b"".join(bytes(cstruct) for cstruct in subroutine.cstructs)
+
+
+def _get_instruction_classes(cls=NetQASMInstruction):
+    for subcls in cls.__subclasses__():
+        yield subcls
+        yield from _get_instruction_classes(subcls)
+
+
+def test_pack_into_overridden_with_serialize():
+    # A class overriding `serialize` should not inherit a `pack_into` packing
+    # the encoding of its parent
+    for instr_cls in _get_instruction_classes():
+        if "serialize" in instr_cls.__dict__ and "pack_into" not in instr_cls.__dict__:
+            assert instr_cls.pack_into is NetQASMInstruction.pack_into, instr_cls
+
+
+class _ReversedXInstruction(GateXInstruction):
+    """Out-of-tree instruction only overriding `serialize`."""
+
+    def serialize(self) -> bytes:
+        return super().serialize()[::-1]
+
+
+def test_pack_into_custom_serialize():
+    instr = _ReversedXInstruction(reg=Register(RegisterName.Q, 1))
+    subroutine = Subroutine(instructions=[instr], app_id=0)
+    assert _ReversedXInstruction.pack_into is NetQASMInstruction.pack_into
+    assert bytes(subroutine).endswith(instr.serialize())
+    assert instr.serialize() != GateXInstruction(reg=instr.reg).serialize()
+
+
 if __name__ == "__main__":
     test()
     test_rotations()
@@ -4,6 +4,7 @@ from netqasm.lang import instr as instructions
 from netqasm.lang.encoding import RegisterName
 from netqasm.lang.operand import Address, ArrayEntry, Immediate, Register
 from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.lang.parsing.text import _parse_operand, _parse_operand_token
 from netqasm.lang.subroutine import Subroutine
 from netqasm.lang.version import NETQASM_VERSION
 from netqasm.util.error import NetQASMInstrError, NetQASMSyntaxError
@@ -286,6 +287,60 @@ qfree Q0
     print(repr(expected))
 
 
+def test_branch_labels():
+    num_labels = 100
+    body = "".join(
+        f"L{i}:\nadd R0 R0 R2\nbeq R0 {i} L{num_labels - 1 - i}\n"
+        for i in range(num_labels)
+    )
+    subroutine = parse_text_subroutine(f"set R0 0\n{body}")
+
+    # Each block is an add, a set of the constant into a temporary register and a beq
+    instrs = subroutine.instructions
+    assert len(instrs) == 1 + 3 * num_labels
+    for i in range(num_labels):
+        set_instr, beq_instr = instrs[3 * i + 2 : 3 * i + 4]
+        assert set_instr.imm == Immediate(i)
+        assert beq_instr.reg1 == set_instr.reg == Register(RegisterName.R, 1)
+        assert beq_instr.imm == Immediate(1 + 3 * (num_labels - 1 - i))
+
+    with pytest.raises(NetQASMSyntaxError):
+        parse_text_subroutine("L0:\nset R0 0\nL0:\nset R0 1")
+
+
+@pytest.mark.parametrize(
+    "word",
+    [
+        "0",
+        "-3",
+        "R0",
+        "C10",
+        "LOOP",
+        "R",
+        "Rx_1",
+        "{name}",
+        "@0",
+        "@3[R0]",
+        "@3[-1]",
+        "@3[0:R2]",
+        "@1[R0:4]",
+        "@1[ R0 ]",
+        "@R0",
+        "$ms",
+        "1.5",
+    ],
+)
+def test_operand_token(word):
+    # The tokenizer should give the same result as the general operand parser
+    try:
+        expected = _parse_operand(word)
+    except Exception as err:
+        with pytest.raises(type(err)):
+            _parse_operand_token(word)
+    else:
+        assert _parse_operand_token(word) == expected
+
+
 if __name__ == "__main__":
     test_simple()
     test_loop()
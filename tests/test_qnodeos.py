@@ -0,0 +1,115 @@
+from typing import List, Optional, Type
+
+from netqasm.backend.executor import Executor
+from netqasm.backend.messages import Message, SubroutineMessage
+from netqasm.backend.qnodeos import QNodeController, SubroutineCache
+from netqasm.lang.instr import Flavour
+from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.lang.subroutine import Subroutine
+from netqasm.sdk.config import LogConfig
+
+SUBROUTINE = """
+# NETQASM 1.0
+# APPID {app_id}
+set R0 0
+LOOP:
+beq R0 {iterations} EXIT
+add R0 R0 1
+jmp LOOP
+EXIT:
+ret_reg R0
+"""
+
+
+def _get_raw_subroutine(app_id: int, iterations: int = 10) -> bytes:
+    text = SUBROUTINE.format(app_id=app_id, iterations=iterations)
+    return bytes(parse_text_subroutine(text))
+
+
+class _RecordingQNodeController(QNodeController):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executed: List[Subroutine] = []
+
+    @classmethod
+    def _get_executor_class(cls, flavour: Optional[Flavour] = None) -> Type[Executor]:
+        return Executor
+
+    def stop(self) -> None:
+        pass
+
+    def _mark_message_finished(self, msg_id: int, msg: Message) -> None:
+        pass
+
+    def _execute_subroutine(self, subroutine: Subroutine):
+        self.executed.append(subroutine)
+        yield from []
+
+
+def test_subroutine_cache_key_ignores_app_id():
+    assert SubroutineCache.get_key(_get_raw_subroutine(0)) == SubroutineCache.get_key(
+        _get_raw_subroutine(7)
+    )
+    assert SubroutineCache.get_key(_get_raw_subroutine(0)) != SubroutineCache.get_key(
+        _get_raw_subroutine(0, iterations=11)
+    )
+
+
+def test_subroutine_cache():
+    cache = SubroutineCache(maxsize=1)
+
+    first = cache.deserialize(_get_raw_subroutine(app_id=1))
+    second = cache.deserialize(_get_raw_subroutine(app_id=2))
+    assert first.app_id == 1
+    assert second.app_id == 2
+    assert second.instructions == first.instructions
+    assert cache.info == (1, 1, 1, 1)
+
+    # Evicts the previous subroutine
+    cache.deserialize(_get_raw_subroutine(app_id=1, iterations=5))
+    cache.deserialize(_get_raw_subroutine(app_id=1))
+    assert cache.info == (1, 3, 1, 1)
+
+    cache.clear()
+    assert cache.info == (0, 0, 1, 0)
+
+
+def test_subroutine_cache_returns_copies():
+    cache = SubroutineCache()
+    first = cache.deserialize(_get_raw_subroutine(app_id=1))
+    num_instrs = len(first.instructions)
+    first.instructions.pop()
+
+    second = cache.deserialize(_get_raw_subroutine(app_id=2))
+    assert second.instructions is not first.instructions
+    second.instructions.pop()
+    second.app_id = 5
+
+    third = cache.deserialize(_get_raw_subroutine(app_id=3))
+    assert len(third.instructions) == num_instrs
+    assert third.app_id == 3
+    assert cache.info.hits == 2
+
+
+def test_subroutine_cache_disabled():
+    cache = SubroutineCache(maxsize=0)
+    for _ in range(3):
+        cache.deserialize(_get_raw_subroutine(app_id=0))
+    assert cache.info == (0, 3, 0, 0)
+
+
+def test_qnodeos_subroutine_cache():
+    qnodeos = _RecordingQNodeController(name="alice")
+    for app_id in [0, 1, 0]:
+        msg = SubroutineMessage(_get_raw_subroutine(app_id=app_id))
+        list(qnodeos.handle_netqasm_message(msg_id=0, msg=msg))
+
+    assert [subrt.app_id for subrt in qnodeos.executed] == [0, 1, 0]
+    assert qnodeos.subroutine_cache_info.hits == 2
+    assert qnodeos.subroutine_cache_info.misses == 1
+
+
+def test_qnodeos_log_config():
+    log_config = LogConfig(instr_log_mnemonics=["x"])
+    qnodeos = _RecordingQNodeController(name="alice", log_config=log_config)
+    assert qnodeos._executor._instr_log_filter._mnemonics == {"x"}
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from scipy import linalg
+
+from netqasm.lang.instr import vanilla
+from netqasm.lang.ir import GenericInstr
+from netqasm.lang.operand import Immediate, Register, RegisterName
+from netqasm.util.quantum_gates import (
+    PAULIS,
+    _get_rotation_matrix_from_fraction,
+    gate_to_matrix,
+    get_controlled_rotation_matrix,
+    get_controlled_rotation_matrix_from_fraction,
+    get_rotation_matrix,
+    get_rotation_matrix_from_fraction,
+)
+
+
+def _expm_rotation_matrix(axis, angle):
+    axis = np.array(axis) / linalg.norm(axis)
+    return linalg.expm(-1j * angle / 2 * sum(a * P for a, P in zip(axis, PAULIS)))
+
+
+@pytest.mark.parametrize("axis", [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 2, -3)])
+@pytest.mark.parametrize("angle", [0, np.pi / 4, np.pi / 2, np.pi, -3.2, 7])
+def test_rotation_matrix(axis, angle):
+    assert np.allclose(
+        get_rotation_matrix(axis, angle), _expm_rotation_matrix(axis, angle)
+    )
+
+
+def test_rotation_matrix_zero_axis():
+    with pytest.raises(ValueError):
+        get_rotation_matrix([0, 0, 0], 1)
+
+
+@pytest.mark.parametrize("n, d", [(0, 0), (1, 0), (3, 1), (-1, 2), (5, 4)])
+def test_rotation_matrix_from_fraction(n, d):
+    axis = [0, 1, 0]
+    angle = n * np.pi / 2**d
+    matrix = get_rotation_matrix_from_fraction(axis, n, d)
+    assert np.allclose(matrix, get_rotation_matrix(axis, angle))
+
+    # Changing the returned matrix does not affect the cached one
+    matrix[0, 0] = 2
+    assert np.allclose(
+        get_rotation_matrix_from_fraction(axis, n, d), get_rotation_matrix(axis, angle)
+    )
+
+    controlled = get_controlled_rotation_matrix_from_fraction(axis, n, d)
+    assert np.allclose(controlled, get_controlled_rotation_matrix(axis, angle))
+    controlled[0, 0] = 2
+    assert np.allclose(
+        get_controlled_rotation_matrix_from_fraction(axis, n, d),
+        get_controlled_rotation_matrix(axis, angle),
+    )
+
+    assert np.allclose(
+        gate_to_matrix(GenericInstr.ROT_Y, angle=(n, d)),
+        gate_to_matrix(GenericInstr.ROT_Y, angle=angle),
+    )
+
+
+def test_rotation_instruction_matrix_is_writable():
+    instr = vanilla.RotXInstruction(
+        reg=Register(RegisterName.Q, 0), imm0=Immediate(1), imm1=Immediate(2)
+    )
+    matrix = instr.to_matrix()
+    matrix *= 1j
+    assert np.allclose(instr.to_matrix(), get_rotation_matrix((1, 0, 0), np.pi / 4))
+
+
+def test_rotation_matrix_cache():
+    _get_rotation_matrix_from_fraction.cache_clear()
+    for _ in range(3):
+        gate_to_matrix(GenericInstr.ROT_X, angle=(1, 2))
+    info = _get_rotation_matrix_from_fraction.cache_info()
+    assert info.hits == 2
+    assert info.misses == 1
+    assert info.maxsize is not None
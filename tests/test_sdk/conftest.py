@@ -0,0 +1,33 @@
+import pytest
+
+from netqasm.sdk.connection import DebugConnection
+from netqasm.sdk.shared_memory import SharedMemory
+
+
+class SharedMemoryConnection(DebugConnection):
+    """DebugConnection that keeps its shared memory, to be able to set results, and
+    the callbacks of non-blocking commits, to be able to let results arrive."""
+
+    def __init__(self, *args, **kwargs):
+        self._memory = SharedMemory()
+        self.callbacks = []
+        super().__init__(*args, **kwargs)
+
+    @property
+    def shared_memory(self) -> SharedMemory:
+        return self._memory
+
+    def _commit_serialized_message(self, raw_msg, block=True, callback=None):
+        super()._commit_serialized_message(raw_msg, block, callback)
+        if callback is not None:
+            self.callbacks.append(callback)
+
+
+@pytest.fixture
+def shared_memory_connection(monkeypatch):
+    """Connection for node "Alice" of which the results can be set by the test."""
+    monkeypatch.setattr(
+        DebugConnection, "node_ids", {**DebugConnection.node_ids, "Alice": 0}
+    )
+    with SharedMemoryConnection("Alice") as alice:
+        yield alice
@@ -6,6 +6,8 @@ import pytest
 
 from netqasm.logging.glob import set_log_level
 from netqasm.sdk import ThreadSocket
+from netqasm.sdk.classical_communication.message import StructuredMessage
+from netqasm.sdk.classical_communication.thread_socket.socket_hub import _SocketHub
 
 
 def execute_functions(functions):
@@ -147,6 +149,67 @@ def test_recv_block():
     execute_functions([alice, bob])
 
 
+def test_recv_wakeup(monkeypatch):
+    # Receiving should not depend on the re-check interval of the socket hub
+    monkeypatch.setattr(_SocketHub, "_CONNECT_SLEEP_TIME", 10)
+    monkeypatch.setattr(_SocketHub, "_RECV_SLEEP_TIME", 10)
+    num_messages = 20
+
+    def alice():
+        socket = ThreadSocket("alice", "bob", timeout=1)
+        for i in range(num_messages):
+            socket.send(str(i))
+            assert socket.recv(timeout=1) == str(i)
+
+    def bob():
+        socket = ThreadSocket("bob", "alice", timeout=1)
+        for _ in range(num_messages):
+            socket.send(socket.recv(timeout=1))
+
+    t_start = timer()
+    execute_functions([alice, bob])
+    assert timer() - t_start < 1
+
+
+def test_send_recv_many():
+    msgs = [str(i) for i in range(1000)]
+
+    def alice():
+        socket = ThreadSocket("alice", "bob")
+        socket.send("first")
+        socket.send_many(msgs)
+        socket.send_structured_many([StructuredMessage("header", i) for i in range(3)])
+
+    def bob():
+        socket = ThreadSocket("bob", "alice")
+        assert socket.recv(timeout=1) == "first"
+        assert socket.recv_many(10, timeout=1) == msgs[:10]
+        assert socket.recv_many(len(msgs) - 10, timeout=1) == msgs[10:]
+        assert socket.recv_many(0, block=False) == []
+        msgs_recv = socket.recv_structured_many(3, timeout=1)
+        assert [msg.payload for msg in msgs_recv] == [0, 1, 2]
+
+    execute_functions([alice, bob])
+
+
+def test_recv_many_block():
+    def alice():
+        socket = ThreadSocket("alice", "bob")
+        socket.send("hello")
+        socket.wait()
+
+    def bob():
+        socket = ThreadSocket("bob", "alice")
+        with pytest.raises(TimeoutError):
+            socket.recv_many(2, timeout=0.2)
+        with pytest.raises(RuntimeError):
+            socket.recv_many(2, block=False)
+        # No messages should have been consumed
+        assert socket.recv_many(1, timeout=1) == ["hello"]
+
+    execute_functions([alice, bob])
+
+
 def test_ping_pong_counter():
     max_value = 10
 
@@ -1,11 +1,20 @@
 import logging
 
+import pytest
+
 from netqasm.backend.messages import deserialize_host_msg as deserialize_message
 from netqasm.backend.network_stack import CREATE_FIELDS
 from netqasm.backend.network_stack import OK_FIELDS_K as OK_FIELDS
 from netqasm.lang import instr as instructions
 from netqasm.lang.encoding import RegisterName
-from netqasm.lang.operand import Address, ArrayEntry, ArraySlice, Immediate, Register
+from netqasm.lang.operand import (
+    Address,
+    ArrayEntry,
+    ArraySlice,
+    Immediate,
+    Register,
+    Template,
+)
 from netqasm.lang.parsing import deserialize as deserialize_subroutine
 from netqasm.lang.parsing.text import parse_text_subroutine
 from netqasm.lang.subroutine import Subroutine
@@ -157,6 +166,212 @@ def test_rotations():
     print(expected)
 
 
+def test_compiled_template():
+    with DebugConnection("Alice") as alice:
+        q = Qubit(alice)
+        q.rot_Z(n=Template("num"), d=4)
+        q.measure(store_array=False)
+        template = alice.compile_template()
+        assert template.arguments == ["num"]
+
+        for num in range(3):
+            alice.commit_compiled_template(template, arguments={"num": num})
+
+    # init, 3 subroutines, final flush, stop app and stop backend
+    assert len(alice.storage) == 7
+    for num, raw_message in enumerate(alice.storage[1:4]):
+        raw_subroutine = deserialize_message(raw=raw_message).subroutine
+        subroutine = deserialize_subroutine(raw_subroutine)
+        assert subroutine.app_id == alice.app_id
+        (rotation,) = [
+            instr
+            for instr in subroutine.instructions
+            if isinstance(instr, instructions.vanilla.RotZInstruction)
+        ]
+        assert rotation.imm0 == Immediate(num)
+        assert rotation.imm1 == Immediate(4)
+
+
+def test_cache_subroutines():
+    with DebugConnection("Alice", cache_subroutines=True) as alice:
+        for _ in range(5):
+            q = Qubit(alice)
+            q.H()
+            q.measure(store_array=False)
+            alice.flush()
+
+        stats = alice.compile_cache_stats
+        assert (stats.hits, stats.misses) == (4, 1)
+        assert stats.hit_rate == 0.8
+
+        # Allocates arrays with new addresses. Their locations in the subroutine are
+        # found from the first two compilations, and replaced after that.
+        for _ in range(3):
+            q = Qubit(alice)
+            q.measure()
+            alice.flush()
+        assert (stats.hits, stats.misses) == (5, 3)
+
+    # init, 8 subroutines, stop app and stop backend
+    assert len(alice.storage) == 11
+    raw_subroutines = alice.storage[1:6]
+    assert all(raw == raw_subroutines[0] for raw in raw_subroutines)
+    assert alice.storage[6] != raw_subroutines[0]
+    assert len(set(alice.storage[6:9])) == 3
+
+
+def test_cache_subroutines_copies():
+    with DebugConnection("Alice", cache_subroutines=True) as alice:
+        q = Qubit(alice)
+        alice.flush()
+        subroutines = []
+        for _ in range(2):
+            q.H()
+            subroutines.append(alice.compile())
+        assert alice.compile_cache_stats.hits == 1
+
+        # Changing a subroutine does not change the cached one
+        first, second = subroutines
+        assert first is not second
+        assert first.instructions is not second.instructions
+        first.instructions.clear()
+        assert len(second.instructions) > 0
+
+
+def _run_create_keep_rounds(cache_subroutines, num_rounds):
+    epr_socket = EPRSocket(remote_app_name="Bob")
+    with DebugConnection(
+        "Alice", epr_sockets=[epr_socket], cache_subroutines=cache_subroutines
+    ) as alice:
+        for _ in range(num_rounds):
+            q = epr_socket.create_keep()[0]
+            q.H()
+            q.measure()
+            alice.flush()
+    return alice
+
+
+def test_cache_subroutines_create_keep():
+    num_rounds = 4
+    alice = _run_create_keep_rounds(cache_subroutines=True, num_rounds=num_rounds)
+    stats = alice.compile_cache_stats
+    assert (stats.hits, stats.misses) == (num_rounds - 2, 2)
+
+    # The same subroutines as without caching, each with new array addresses
+    expected = _run_create_keep_rounds(cache_subroutines=False, num_rounds=num_rounds)
+    assert alice.storage == expected.storage
+    assert len(set(alice.storage[2 : 2 + num_rounds])) == num_rounds
+
+
+def test_record_replay():
+    with DebugConnection("Alice") as alice:
+        with pytest.raises(RuntimeError):
+            alice.replay()
+
+        with alice.record() as recording:
+            q = Qubit(alice)
+            q.rot_Z(n=Template("num"), d=4)
+            q.measure(store_array=False)
+            alice.flush()
+            q = Qubit(alice)
+            q.H()
+            q.free()
+        assert len(recording) == 2
+        assert recording.arguments == ["num"]
+
+        # Nothing is sent while recording
+        assert len(alice.storage) == 1
+
+        alice.replay(3, arguments=[{"num": num} for num in range(3)])
+        with pytest.raises(ValueError):
+            alice.replay(2, arguments=[{"num": 0}])
+
+    # init, 3 times 2 subroutines, stop app and stop backend
+    assert len(alice.storage) == 9
+    raw_messages = alice.storage[1:7]
+    assert raw_messages[1] == raw_messages[3] == raw_messages[5]
+    for num, raw_message in enumerate(raw_messages[::2]):
+        raw_subroutine = deserialize_message(raw=raw_message).subroutine
+        subroutine = deserialize_subroutine(raw_subroutine)
+        assert subroutine.app_id == alice.app_id
+        (rotation,) = [
+            instr
+            for instr in subroutine.instructions
+            if isinstance(instr, instructions.vanilla.RotZInstruction)
+        ]
+        assert rotation.imm0 == Immediate(num)
+
+
+def test_record_error():
+    with DebugConnection("Alice") as alice:
+        with pytest.raises(ValueError):
+            with alice.record():
+                q = Qubit(alice)
+                q.H()
+                raise ValueError("error while recording")
+
+        # The connection does not record anymore and the partial code is discarded
+        with pytest.raises(RuntimeError):
+            alice.replay()
+        num_messages = len(alice.storage)
+        alice.flush()
+        assert len(alice.storage) == num_messages
+
+        q = Qubit(alice)
+        q.H()
+        alice.flush()
+        assert len(alice.storage) == num_messages + 1
+
+
+def test_record_active_qubits():
+    with DebugConnection("Alice") as alice:
+        with alice.record() as recording:
+            q = Qubit(alice)
+            q.H()
+        # The qubit is not freed by the recording, so each replay allocates it again
+        assert q.active
+        (template,) = recording.templates
+        subroutine = deserialize_subroutine(template.instantiate(alice.app_id))
+        instr_types = [type(instr) for instr in subroutine.instructions]
+        assert instructions.core.QAllocInstruction in instr_types
+        assert instructions.core.QFreeInstruction not in instr_types
+
+        with alice.record() as recording:
+            q = Qubit(alice)
+            q.H()
+            q.free()
+        (template,) = recording.templates
+        subroutine = deserialize_subroutine(template.instantiate(alice.app_id))
+        instr_types = [type(instr) for instr in subroutine.instructions]
+        assert instructions.core.QFreeInstruction in instr_types
+
+
+def test_replay_futures(shared_memory_connection):
+    alice = shared_memory_connection
+    with alice.record() as recording:
+        q = Qubit(alice)
+        m = q.measure(store_array=False)
+    assert any(future is m for future in recording.futures)
+
+    # Replaying gives the future the value of that replay
+    alice.shared_memory.set_register(m.reg, 1)
+    alice.replay()
+    assert m == 1
+    alice.shared_memory.set_register(m.reg, 0)
+    alice.replay()
+    assert m == 0
+
+    # The outcomes as they would be after executing each replay
+    outcomes = [1, 0, 1]
+
+    def get_outcome(i):
+        alice.shared_memory.set_register(m.reg, outcomes[i])
+        return int(m)
+
+    assert alice.replay(3, round_callback=get_outcome) == outcomes
+    assert alice.replay(2) == [None, None]
+
+
 def test_epr_k_create():
 
     set_log_level(logging.DEBUG)
@@ -1,14 +1,27 @@
+import dataclasses
+
+import numpy as np
 import pytest
 
 from netqasm.lang.parsing import parse_register
-from netqasm.sdk.futures import Future, NonConstantIndexError, NoValueError
-from netqasm.sdk.shared_memory import SharedMemory
+from netqasm.qlink_compat import EPRRole, LinkLayerOKTypeM
+from netqasm.sdk.build_epr import (
+    RESPONSE_MEASURE_DTYPE,
+    EntRequestParams,
+    deserialize_epr_measure_results,
+    epr_results_to_numpy,
+)
+from netqasm.sdk.futures import Array, Future, NonConstantIndexError, NoValueError
+from netqasm.sdk.shared_memory import CompactSharedMemory, SharedMemory
 
 
 class MockConnnection:
-    def __init__(self):
+    def __init__(self, shared_memory_class=SharedMemory):
         self._variables = {}
-        self.shared_memory = SharedMemory()
+        self.shared_memory = shared_memory_class()
+
+    def _register_future(self, future):
+        pass
 
 
 def test_non_constant_index():
@@ -38,3 +51,79 @@ def test_with_value():
     print(m)
     print(m * 2)
     assert m * 2 == 8
+
+
+@pytest.mark.parametrize("shared_memory_class", [SharedMemory, CompactSharedMemory])
+def test_array_to_numpy(shared_memory_class):
+    conn = MockConnnection(shared_memory_class)
+    array = Array(conn, length=5, address=1)
+
+    with pytest.raises(NoValueError):
+        array.to_numpy()
+
+    conn.shared_memory.init_new_array(address=1, new_array=[0, 1, None, 1, None])
+    values = array.to_numpy()
+    assert values.dtype == np.int64
+    assert list(np.ma.getmaskarray(values)) == [False, False, True, False, True]
+    assert list(values.filled(-1)) == [0, 1, -1, 1, -1]
+    assert values.sum() == 2
+
+    # The result is a copy
+    conn.shared_memory.set_array_part(address=1, index=2, value=7)
+    assert values[2] is np.ma.masked
+    assert array.to_numpy()[2] == 7
+
+
+@pytest.mark.parametrize("shared_memory_class", [SharedMemory, CompactSharedMemory])
+def test_array_to_records(shared_memory_class):
+    conn = MockConnnection(shared_memory_class)
+    number = 3
+    array = Array(conn, length=number * len(LinkLayerOKTypeM._fields), address=0)
+
+    with pytest.raises(NoValueError):
+        array.to_records(RESPONSE_MEASURE_DTYPE)
+
+    responses = [
+        LinkLayerOKTypeM(
+            measurement_outcome=i % 2, sequence_number=i, bell_state=3, goodness=0.5
+        )
+        for i in range(number)
+    ]
+    conn.shared_memory.init_new_array(
+        address=0,
+        new_array=[
+            entry.value if hasattr(entry, "value") else entry
+            for response in responses
+            for entry in response
+        ],
+    )
+
+    records = array.to_records(RESPONSE_MEASURE_DTYPE)
+    assert records.shape == (number,)
+    assert list(records["measurement_outcome"]) == [0, 1, 0]
+    assert list(records["sequence_number"]) == [0, 1, 2]
+    assert all(records["bell_state"] == 3)
+    assert all(records["goodness"] == 0.5)
+
+    params = EntRequestParams(
+        remote_node_id=1,
+        epr_socket_id=0,
+        number=number,
+        post_routine=None,
+        sequential=False,
+    )
+    results = deserialize_epr_measure_results(params, array, EPRRole.CREATE)
+    assert np.array_equal(epr_results_to_numpy(results), records)
+    assert np.array_equal(epr_results_to_numpy(results[1:]), records[1:])
+
+    # Results at an index in a register cannot be located
+    in_register = dataclasses.replace(
+        results[0], remote_node_id=Future(conn, address=0, index=parse_register("R0"))
+    )
+    with pytest.raises(NonConstantIndexError):
+        epr_results_to_numpy([in_register])
+
+    # The result is a copy
+    conn.shared_memory.set_array_part(address=0, index=2, value=5)
+    assert records["measurement_outcome"][0] == 0
+    assert array.to_records(RESPONSE_MEASURE_DTYPE)["measurement_outcome"][0] == 5
@@ -0,0 +1,135 @@
+import pytest
+
+from netqasm.lang.encoding import RegisterName
+from netqasm.lang.operand import Register
+from netqasm.sdk.connection import DebugConnection
+from netqasm.sdk.futures import NonConstantIndexError, NoValueError
+from netqasm.sdk.memmgr import MemoryManager
+from netqasm.sdk.qubit import FutureQubit, Qubit
+
+
+def test_registers():
+    mem_mgr = MemoryManager()
+    registers = [mem_mgr.get_inactive_register(activate=True) for _ in range(16)]
+    assert registers == [Register(RegisterName.R, i) for i in range(16)]
+    with pytest.raises(RuntimeError):
+        mem_mgr.get_inactive_register()
+
+    mem_mgr.remove_active_register(registers[5])
+    mem_mgr.remove_active_register(registers[2])
+    assert not mem_mgr.is_register_active(registers[2])
+    assert mem_mgr.get_inactive_register() == registers[2]
+    assert mem_mgr.get_inactive_register(activate=True) == registers[2]
+    assert mem_mgr.get_inactive_register() == registers[5]
+    with pytest.raises(ValueError):
+        mem_mgr.add_active_register(registers[2])
+
+    # Non-R registers do not affect the R registers
+    mem_mgr.add_active_register(Register(RegisterName.Q, 5))
+    assert mem_mgr.get_inactive_register() == registers[5]
+
+
+def test_meas_registers():
+    mem_mgr = MemoryManager()
+    registers = [mem_mgr.get_new_meas_outcome_register() for _ in range(16)]
+    assert registers == [Register(RegisterName.M, i) for i in range(16)]
+    with pytest.raises(RuntimeError):
+        mem_mgr.get_new_meas_outcome_register()
+
+    mem_mgr.meas_register_set_unused(registers[3])
+    assert mem_mgr.get_new_meas_outcome_register() == registers[3]
+    mem_mgr.reset_used_meas_registers()
+    assert mem_mgr.get_new_meas_outcome_register() == registers[0]
+
+
+def test_qubit_ids():
+    DebugConnection.node_ids = {"Alice": 0}
+    with DebugConnection("Alice") as alice:
+        mem_mgr = alice.builder._mem_mgr
+        qubits = [Qubit(alice) for _ in range(3)]
+        assert [q.qubit_id for q in qubits] == [0, 1, 2]
+        assert mem_mgr.get_active_qubits() == qubits
+
+        qubits[1].active = False
+        assert not mem_mgr.is_qubit_id_used(1)
+        assert mem_mgr.get_new_qubit_address() == 1
+
+        # Moving an active qubit frees its old ID
+        qubits[0].qubit_id = 4
+        assert not mem_mgr.is_qubit_id_used(0)
+        assert mem_mgr.is_qubit_id_used(4)
+        assert mem_mgr.get_new_qubit_address() == 0
+
+        # Multiple qubits can share an ID
+        shared = Qubit(alice, add_new_command=False, virtual_address=2)
+        shared.active = False
+        assert mem_mgr.is_qubit_id_used(2)
+
+        mem_mgr.inactivate_qubits()
+        assert mem_mgr.get_active_qubits() == []
+        assert not any(q.active for q in qubits)
+        assert mem_mgr.get_new_qubit_address() == 0
+
+
+def test_future_qubit_ids(shared_memory_connection):
+    alice = shared_memory_connection
+    mem_mgr = alice.builder._mem_mgr
+    array = alice.new_array(1)
+    # The array as it would be after executing the subroutine
+    alice.shared_memory.init_new_array(address=array.address, length=1)
+    future_qubit = FutureQubit(alice, array.get_future_index(0))
+
+    # The ID of the qubit is not known yet
+    with pytest.raises(NoValueError):
+        mem_mgr.get_new_qubit_address()
+    with pytest.raises(NoValueError):
+        mem_mgr.is_qubit_id_used(0)
+
+    # The ID is recorded once the subroutine finished
+    alice.shared_memory.set_array_part(address=array.address, index=0, value=0)
+    alice.flush()
+    assert mem_mgr.is_qubit_id_used(0)
+    assert mem_mgr.get_new_qubit_address() == 1
+
+    future_qubit.active = False
+    assert not mem_mgr.is_qubit_id_used(0)
+    assert mem_mgr.get_new_qubit_address() == 0
+
+
+def test_future_qubit_ids_non_blocking(shared_memory_connection):
+    alice = shared_memory_connection
+    mem_mgr = alice.builder._mem_mgr
+    array = alice.new_array(1)
+    alice.shared_memory.init_new_array(address=array.address, length=1)
+    FutureQubit(alice, array.get_future_index(0))
+    results = []
+    alice.flush(block=False, callback=lambda: results.append(True))
+    with pytest.raises(NoValueError):
+        mem_mgr.get_new_qubit_address()
+
+    # The results arrive
+    alice.shared_memory.set_array_part(address=array.address, index=0, value=1)
+    assert len(alice.callbacks) == 1
+    alice.callbacks[0]()
+    assert results == [True]
+    assert mem_mgr.is_qubit_id_used(1)
+    assert mem_mgr.get_new_qubit_address() == 0
+
+
+def test_future_qubit_ids_in_register(shared_memory_connection):
+    alice = shared_memory_connection
+    mem_mgr = alice.builder._mem_mgr
+    array = alice.new_array(1)
+    alice.shared_memory.init_new_array(address=array.address, length=1)
+    future_qubit = FutureQubit(
+        alice, array.get_future_index(Register(RegisterName.R, 0))
+    )
+
+    with pytest.raises(NonConstantIndexError):
+        mem_mgr.get_new_qubit_address()
+    alice.flush()
+    with pytest.raises(NonConstantIndexError):
+        mem_mgr.is_qubit_id_used(0)
+
+    future_qubit.active = False
+    assert mem_mgr.get_new_qubit_address() == 0
@@ -0,0 +1,148 @@
+import pytest
+
+from netqasm.backend.executor import Executor
+from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.runtime.settings import set_is_using_hardware
+from netqasm.sdk.shared_memory import (
+    Arrays,
+    CompactArray,
+    CompactArrays,
+    CompactRegisterGroup,
+    CompactSharedMemory,
+    RegisterGroup,
+    SharedMemoryManager,
+)
+
+
+@pytest.mark.parametrize("register_group_class", [RegisterGroup, CompactRegisterGroup])
+def test_register_group(register_group_class):
+    group = register_group_class()
+    assert len(group) == 16
+    assert group[3] is None
+
+    group[3] = -5
+    group[15] = 7
+    assert group[3] == -5
+    assert group[15] == 7
+    assert group._get_active_values() == [(3, -5), (15, 7)]
+
+    with pytest.raises(IndexError):
+        group[16] = 0
+    with pytest.raises(IndexError):
+        group[-1]
+
+
+@pytest.mark.parametrize("arrays_class", [Arrays, CompactArrays])
+def test_arrays(arrays_class):
+    arrays = arrays_class()
+    assert arrays[0, 0] is None
+
+    arrays.init_new_array(0, 5)
+    assert arrays.has_array(0)
+    assert arrays[0, :] == [None] * 5
+
+    arrays[0, 1] = 3
+    arrays[0, 2:4] = [None, 4]
+    assert arrays[0, 1] == 3
+    assert arrays[0, 3] == 4
+    assert arrays[0, :] == [None, 3, None, 4, None]
+    assert arrays._get_array(0) == [None, 3, None, 4, None]
+
+    arrays[0, 1] = None
+    assert arrays[0, 1] is None
+
+    with pytest.raises(IndexError):
+        arrays[0, 5] = 1
+    with pytest.raises(IndexError):
+        arrays[0, 5]
+    with pytest.raises(AssertionError):
+        arrays[0, 0:2] = [1, 2, 3]
+    with pytest.raises(TypeError):
+        arrays[0, 0:2] = 1
+
+
+def test_compact_array():
+    values = [1, None, -3, 4]
+    compact = CompactArray.from_list(values)
+    assert len(compact) == 4
+    assert compact.to_list() == values
+    assert list(compact) == values
+    assert compact == values
+    assert compact[1:] == values[1:]
+
+    copy = compact.copy()
+    copy[1] = 2
+    assert compact[1] is None
+    assert copy[1] == 2
+
+    compact[0:2] = copy[1:3]
+    assert compact == [2, -3, -3, 4]
+
+
+@pytest.mark.parametrize("arrays_class", [Arrays, CompactArrays])
+def test_width_checks(arrays_class):
+    arrays = arrays_class()
+    arrays.init_new_array(0, 3)
+    set_is_using_hardware(True)
+    try:
+        with pytest.raises(OverflowError):
+            arrays[0, 0] = 2**31
+        with pytest.raises(OverflowError):
+            arrays[0, 0:3] = [0, -(2**31) - 1, None]
+        arrays[0, 0:3] = [2**31 - 1, -(2**31), None]
+    finally:
+        set_is_using_hardware(False)
+    assert arrays[0, :] == [2**31 - 1, -(2**31), None]
+
+
+@pytest.mark.parametrize("arrays_class", [Arrays, CompactArrays])
+def test_set_compact_slice(arrays_class):
+    arrays = arrays_class()
+    arrays.init_new_array(0, 6)
+    arrays[0, 2:5] = CompactArray.from_values(range(3))
+    assert arrays[0, :] == [None, None, 0, 1, 2, None]
+
+    set_is_using_hardware(True)
+    try:
+        with pytest.raises(OverflowError):
+            arrays[0, 0:2] = CompactArray.from_values([0, 2**31])
+    finally:
+        set_is_using_hardware(False)
+
+
+class _CompactExecutor(Executor):
+    register_group_class = CompactRegisterGroup
+    arrays_class = CompactArrays
+    shared_memory_class = CompactSharedMemory
+
+
+def test_compact_executor():
+    subroutine = parse_text_subroutine(
+        """
+        # NETQASM 1.0
+        # APPID 0
+        # DEFINE ms @0
+        set R0 0
+        array 10 $ms
+        LOOP:
+        beq R0 8 EXIT
+        store R0 $ms[R0]
+        add R0 R0 1
+        jmp LOOP
+        EXIT:
+        ret_reg R0
+        ret_arr $ms
+        """
+    )
+
+    SharedMemoryManager.reset_memories()
+
+    executor = _CompactExecutor(name="alice")
+    executor.init_new_application(app_id=0, max_qubits=1)
+    executor.consume_execute_subroutine(subroutine=subroutine)
+
+    memory = SharedMemoryManager.get_shared_memory("alice", key=0)
+    assert isinstance(memory, CompactSharedMemory)
+    assert memory.get_register("R0") == 8
+    assert memory[0] == list(range(8)) + [None, None]
+    assert memory.get_array_part(address=0, index=slice(7, 10)) == [7, None, None]
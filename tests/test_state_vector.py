@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from netqasm.backend.state_vector import StateVectorExecutor
+from netqasm.lang.encoding import RegisterName
+from netqasm.lang.instr.flavour import NVFlavour
+from netqasm.lang.operand import Register
+from netqasm.lang.parsing import parse_text_subroutine
+from netqasm.sdk.shared_memory import SharedMemoryManager
+
+BELL_SUBROUTINE = """
+# NETQASM 1.0
+# APPID 0
+set Q0 0
+set Q1 1
+qalloc Q0
+qalloc Q1
+init Q0
+init Q1
+h Q0
+cnot Q0 Q1
+meas Q0 M0
+meas Q1 M1
+qfree Q0
+qfree Q1
+"""
+
+
+def _execute(subroutine_str, seed=None, flavour=None, max_qubits=2):
+    subroutine = parse_text_subroutine(subroutine_str, flavour=flavour)
+
+    SharedMemoryManager.reset_memories()
+
+    executor = StateVectorExecutor(seed=seed)
+    executor.init_new_application(app_id=0, max_qubits=max_qubits)
+    executor.consume_execute_subroutine(subroutine=subroutine)
+    return executor
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bell_state(seed):
+    executor = _execute(BELL_SUBROUTINE, seed=seed)
+    m0 = executor._get_register(0, Register(RegisterName.M, 0))
+    m1 = executor._get_register(0, Register(RegisterName.M, 1))
+    assert m0 == m1
+    assert executor.num_qubits == 0
+
+
+def test_density_matrix():
+    executor = _execute(
+        """
+        # NETQASM 1.0
+        # APPID 0
+        set Q0 0
+        set Q1 1
+        qalloc Q0
+        qalloc Q1
+        h Q0
+        cnot Q0 Q1
+        x Q1
+        """
+    )
+    bell = np.array([0, 1, 1, 0]) / np.sqrt(2)
+    assert np.allclose(executor.get_density_matrix([0, 1]), np.outer(bell, bell))
+    assert np.allclose(executor._get_qubit_state(0, 1), np.eye(2) / 2)
+
+
+@pytest.mark.parametrize("flavour", [None, NVFlavour()])
+def test_rotations(flavour):
+    executor = _execute(
+        """
+        # NETQASM 1.0
+        # APPID 0
+        set Q0 0
+        set Q1 1
+        qalloc Q0
+        qalloc Q1
+        rot_x Q0 1 1
+        rot_x Q0 1 1
+        rot_y Q1 1 0
+        meas Q0 M0
+        meas Q1 M1
+        """,
+        flavour=flavour,
+    )
+    assert executor._get_register(0, Register(RegisterName.M, 0)) == 1
+    assert executor._get_register(0, Register(RegisterName.M, 1)) == 1
+
+
+def test_free_qubit_keeps_state():
+    executor = _execute(
+        """
+        # NETQASM 1.0
+        # APPID 0
+        set Q0 0
+        set Q1 1
+        set Q2 2
+        qalloc Q0
+        qalloc Q1
+        qalloc Q2
+        x Q0
+        h Q2
+        qfree Q1
+        """,
+        max_qubits=3,
+    )
+    assert executor.num_qubits == 2
+    assert np.allclose(executor._get_qubit_state(0, 0), [[0, 0], [0, 1]])
+    assert np.allclose(executor._get_qubit_state(0, 2), np.full((2, 2), 0.5))
@@ -1,10 +1,12 @@
+import pytest
+
 from netqasm.lang.encoding import RegisterName
 from netqasm.lang.instr.vanilla import RotXInstruction, RotZInstruction
 from netqasm.lang.ir import GenericInstr, ICmd, ProtoSubroutine
 from netqasm.lang.operand import Register, Template
 from netqasm.lang.parsing import parse_text_subroutine
 from netqasm.lang.parsing.text import parse_text_protosubroutine
-from netqasm.lang.subroutine import Subroutine
+from netqasm.lang.subroutine import CompiledTemplate, Subroutine
 from netqasm.lang.version import NETQASM_VERSION
 
 
@@ -123,9 +125,80 @@ rot_z R0 3 1
     assert template.instructions == expected.instructions
 
 
+def test_instantiate_only_templates():
+    template = f"""
+# NETQASM {NETQASM_VERSION[0]}.{NETQASM_VERSION[1]}
+set Q0 0
+qalloc Q0
+rot_z Q0 {{num}} 4
+h Q0
+rot_x Q0 1 {{denom}}
+"""
+
+    expected_text = f"""
+# NETQASM {NETQASM_VERSION[0]}.{NETQASM_VERSION[1]}
+# APPID 2
+set Q0 0
+qalloc Q0
+rot_z Q0 3 4
+h Q0
+rot_x Q0 1 2
+"""
+
+    template: Subroutine = parse_text_subroutine(template)
+    assert template.arguments == ["num", "denom"]
+    original = list(template.instructions)
+    instructions = template.instructions
+
+    template.instantiate(app_id=2, arguments={"num": 3, "denom": 2})
+    expected: Subroutine = parse_text_subroutine(expected_text)
+    assert template.app_id == 2
+    assert template.instructions == expected.instructions
+    assert bytes(template) == bytes(expected)
+
+    # Instructions without templates are not rebuilt
+    for index in [0, 1, 3]:
+        assert template.instructions[index] is original[index]
+
+    # A list of instructions obtained before is not changed
+    assert instructions == original
+    for index in [2, 4]:
+        assert template.instructions[index] is not original[index]
+
+
+@pytest.mark.parametrize(
+    "app_id, arguments",
+    [
+        (0, {"num": 0, "denom": 0}),
+        (3, {"num": 7, "denom": 2}),
+        (2**16 - 1, {"num": 255, "denom": 300}),
+    ],
+)
+def test_compiled_template(app_id, arguments):
+    text = f"""
+# NETQASM {NETQASM_VERSION[0]}.{NETQASM_VERSION[1]}
+set Q0 0
+qalloc Q0
+rot_z Q0 {{num}} {{denom}}
+h Q0
+rot_x Q0 {{num}} 4
+"""
+
+    template = CompiledTemplate(parse_text_subroutine(text))
+    assert template.arguments == ["num", "denom", "num"]
+    assert len(template.slots["num"]) == 2
+
+    subroutine = parse_text_subroutine(text)
+    subroutine.instantiate(app_id=app_id, arguments=arguments)
+    assert template.instantiate(app_id=app_id, arguments=arguments) == bytes(
+        subroutine
+    )
+
+
 if __name__ == "__main__":
     test_protosubroutine_instantiation()
     test_subroutine_instantiation()
     test_subroutine_parsing()
     test_protosubroutine_parsing()
     test_parse_and_instantiate()
+    test_instantiate_only_templates()